@@ -1,164 +1,340 @@
+import time
+_STARTUP_T0 = time.perf_counter()  # Início do processo, para medir o tempo até a primeira janela
+
 import os
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkinter.font import Font
 import pandas as pd
 from datetime import datetime
-from matplotlib import pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.ticker import FuncFormatter
 import numpy as np
-import webbrowser
-
-# Definição dos meses centralizada
-MESES = {
-    '01': 'Janeiro', '02': 'Fevereiro', '03': 'Março', '04': 'Abril', '05': 'Maio', '06': 'Junho',
-    '07': 'Julho', '08': 'Agosto', '09': 'Setembro', '10': 'Outubro', '11': 'Novembro', '12': 'Dezembro'
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import freeze_support
+import analytics
+import chart_data
+import compute_executor
+import instrumentation
+import reports
+import snapshots
+import status_grid
+import validation
+import views
+from analytics import closure_card_content, closure_metrics
+from chart_labels import ChartLabels
+from completion import CompletionIndex
+from export_service import EXPORT_FORMATS, build_export_path, default_export_dir, excel_writer, export_dataframe, write_excel_sheet
+from ingestion import default_workbook_paths, load_workbooks
+from lifecycle import LIFECYCLE_COLUMNS, ClientLifecycle
+from instrumentation import measure, timed
+from periods import current_period, latest_period_until, period_axis, period_label, spans_multiple_years, years_label
+from schema import display_frame, display_text
+
+# Matplotlib e o backend TkAgg são importados só quando a aba de gráficos é aberta (ou no pré-aquecimento)
+Figure = FigureCanvasTkAgg = NavigationToolbar2Tk = charts = None
+
+# Importa o backend de gráficos em segundo plano, alguns instantes depois da janela aparecer
+PREWARM_CHARTS = True
+PREWARM_DELAY_MS = 1500
+
+# Abas são construídas na primeira ativação; com a fila de pré-construção, as demais são
+# montadas uma a uma nos momentos ociosos depois que a janela aparece
+PREBUILD_TABS = True
+PREBUILD_DELAY_MS = 3000
+PREBUILD_INTERVAL_MS = 300
+
+# Cada carga bem-sucedida é gravada no histórico local (snapshots.py); PROGMEDICAO_SNAPSHOTS=0 desativa
+SAVE_SNAPSHOTS = os.environ.get('PROGMEDICAO_SNAPSHOTS', '1') != '0'
+SNAPSHOT_DELAY_MS = 3000  # Gravação da carga inicial, depois que a janela aparece
+
+# Backend da tabela principal: 'pandas' (dataframe em memória) ou 'sqlite' (sqlite_backend.py,
+# filtros por consultas indexadas e paginadas)
+STORAGE_BACKEND = os.environ.get('PROGMEDICAO_BACKEND', 'pandas')
+STORE_POLL_MS = 200
+
+# Com PROGMEDICAO_DATA_SERVICE=1 os dados vêm do serviço local (data_service.py), que lê a planilha
+# uma vez para todas as instâncias da máquina; novas versões publicadas são verificadas no intervalo
+DATA_SERVICE = os.environ.get('PROGMEDICAO_DATA_SERVICE') == '1'
+DATA_SERVICE_POLL_MS = 5000
+
+# Resoluções oferecidas na exportação dos gráficos (PNGs e PDF) e intervalo de acompanhamento
+CHART_EXPORT_DPIS = ['100', '150', '200', '300']
+CHART_EXPORT_POLL_MS = 200
+
+# Intervalo de acompanhamento da geração dos relatórios de fechamento (reports.py)
+CLOSURE_REPORTS_POLL_MS = 200
+
+# Abas marcadas enquanto seus cálculos rodam em segundo plano (compute_executor.py), por chave do cálculo
+COMPUTE_TABS = {
+    'comparacao': "Comparar Meses",
+    'status': "Acompanhamento de Status",
+    'fechamentos': "Fechamentos",
 }
+BUSY_SUFFIX = " (calculando...)"
+
+# Colunas e larguras das tabelas expandidas dos cards de fechamento
+CLOSURE_TABLE_COLUMNS = [
+    "CLIENTE", "Nº MEDIÇÃO", "FECH. CONT.", "MEDIÇÃO EFETUADA",
+    "APROV CLIENTE", "ENVIO FAT", "FAT MEDIÇÃO", "VALOR FATURADO", "PREVISÃO DE MEDIÇÃO",
+    "RESP MEDIÇÃO", "SITUAÇÃO MED."
+]
+CLOSURE_TABLE_WIDTHS = [500, 80, 80, 70, 70, 70, 70, 90, 90, 90, 90]
+
+# Tempos de inicialização (segundos desde o início do processo); exibidos com PROGMEDICAO_STARTUP_REPORT=1
+STARTUP_TIMINGS = {'imports': None, 'data_load': None, 'first_window': None}
+
+
+def load_chart_backend():
+    """Importa o matplotlib, o backend TkAgg e charts.py na primeira vez que os gráficos são necessários."""
+    global Figure, FigureCanvasTkAgg, NavigationToolbar2Tk, charts
+    if Figure is not None:
+        return
+    import charts as _charts
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as _FigureCanvasTkAgg, NavigationToolbar2Tk as _NavigationToolbar2Tk
+    from matplotlib.figure import Figure as _Figure
+    Figure, FigureCanvasTkAgg, NavigationToolbar2Tk = _Figure, _FigureCanvasTkAgg, _NavigationToolbar2Tk
+    charts = _charts
 
 class AutocompleteCombobox(ttk.Combobox):
-    def __init__(self, *args, **kwargs):
+    """Combobox que completa o texto digitado (por prefixo, ou por trecho com match="contains").
+
+    A busca usa um CompletionIndex e só roda depois de debounce_ms sem novas teclas.
+    """
+
+    # Quantidade máxima de itens exibidos na lista suspensa
+    MAX_LISTED = 1000
+
+    def __init__(self, *args, match="prefix", debounce_ms=120, on_lookup=None, **kwargs):
         super().__init__(*args, **kwargs)
         self._completion_list = []
+        self._index = CompletionIndex()
         self._hits = []
         self._hit_index = 0
+        self._pending = None
+        self.match = match
+        self.debounce_ms = debounce_ms
+        self.on_lookup = on_lookup  # Chamado com o texto digitado depois de cada busca
         self.position = 0
         self.bind('<KeyRelease>', self.handle_keyrelease)
         self['values'] = []
 
     def set_completion_list(self, completion_list):
-        self._completion_list = sorted(str(item) for item in completion_list)
+        self.set_completion_index(CompletionIndex(completion_list))
+
+    def set_completion_index(self, index):
+        """Usa um índice já montado (ex.: guardado em cache) sem reordenar a lista."""
+        self._index = index
+        self._completion_list = index.prefix("", limit=self.MAX_LISTED) if index.ranked else index.items
         self._hits = []
         self._hit_index = 0
         self.position = 0
-        self['values'] = self._completion_list
+        self['values'] = self._completion_list[:self.MAX_LISTED]
+
+    def find(self, text):
+        if self.match == "contains":
+            return self._index.contains(text, limit=self.MAX_LISTED)
+        return self._index.prefix(text, limit=self.MAX_LISTED)
 
     def autocomplete(self, delta=0):
+        self._pending = None
         if delta:
             self.delete(self.position, tk.END)
         else:
             self.position = len(self.get())
 
-        _hits = [item for item in self._completion_list if item.lower().startswith(self.get().lower())]
+        typed = self.get()[:self.position]
+        _hits = self.find(typed)
         self._hits = _hits
+        self['values'] = _hits if typed else self._completion_list[:self.MAX_LISTED]
 
-        if _hits:
+        # No modo "contains" a lista suspensa mostra os resultados sem sobrescrever o texto digitado
+        if _hits and self.match == "prefix":
             self._hit_index = (self._hit_index + delta) % len(_hits)
             self.delete(0, tk.END)
             self.insert(0, self._hits[self._hit_index])
             self.select_range(self.position, tk.END)
 
+        if self.on_lookup is not None:
+            self.on_lookup(typed)
+
+    @property
+    def index(self):
+        return self._index
+
     def handle_keyrelease(self, event):
         if event.keysym in ('BackSpace', 'Left', 'Right', 'Up', 'Down'):
             return
-        self.autocomplete()
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(self.debounce_ms, self.autocomplete)
 
 class DataFrameViewer(tk.Tk):
-    def __init__(self, dataframe):
+    def __init__(self, dataframe, file_paths=(), data_client=None):
         super().__init__()
         self.title("Programa Medição")
         self.state('zoomed')
-        self.dataframe_cleaned = self.clean_dataframe(dataframe)
+        self.data_client = data_client  # data_service.DataServiceClient: dados já validados pelo serviço
+        self.data_issues = pd.DataFrame(columns=validation.ISSUE_COLUMNS)  # Relatório de validation.validate
+        if data_client is not None:
+            self.dataframe_cleaned = dataframe
+            self.data_issues = data_client.issues
+        else:
+            with measure('validate', rows=len(dataframe)):
+                self.dataframe_cleaned, self.data_issues = validation.validate(dataframe)
+        self.data_version = 0  # Incrementada a cada recarga; invalida os resultados de cached()
+        self.data_cache = {}
+        self.cache_version = self.data_version
+        self.periods = period_axis(self.dataframe_cleaned['ABA'])
         self.verification_dataframe = self.create_verification_dataframe()
+        self.store = None
+        self.store_ready = False
+        self.store_thread = None
+        self.store_query = None  # (contains, equals) da consulta exibida na tabela principal
+        self.store_request = None  # Os mesmos filtros, sem os da visão ativa
+        self.store_rows = 0
+        if STORAGE_BACKEND == 'sqlite':
+            from sqlite_backend import SqliteStore
+            self.store = SqliteStore()
+            self.load_store()
+        self.diagnostics_log = instrumentation.configure_log()
+        self.current_view = self.dataframe_cleaned
+        self.views = views.load_views()
+        self.active_view = self.views[0]
+        self.table_sort = None  # Última coluna ordenada na tabela principal (gravada com a visão)
+        self.export_format = tk.StringVar(value='xlsx')
+        self.compute = compute_executor.ComputeExecutor(self, on_busy=self.set_compute_busy)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True)
         self.table_frames = {}
+        self.closure_cards = {}  # Cards do Fechamentos por ABA ("general" para o card geral)
+        self.value_filters = []  # (valor, coluna, contagem) de cada linha de filtro da tabela principal
+        self.suggestion_queue = []
+        self.suggestion_job = None
+        self.graphs = []
+        self.graph_index = 0
         self.create_tabs()
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.bind("<Control-Shift-D>", self.toggle_diagnostics_tab)
+        self.bind("<Control-Shift-d>", self.toggle_diagnostics_tab)
         self.update_last_update()
-        self.graph_index = 0
         self.add_author_label()
-
-    def generate_status_matrix(self):
-        """Gera a matriz de status de clientes por mês (Aberto, Fechado, Inativo, Pendente)."""
-        # Selecionar colunas relevantes
-        df_status = self.dataframe_cleaned[['CLIENTE', 'ABA', 'STATUS', 'Nº MEDIÇÃO']].copy()
-        df_status = df_status.dropna(subset=['CLIENTE', 'ABA', 'STATUS', 'Nº MEDIÇÃO'])
-
-        # Gerar lista de clientes únicos
-        clientes = df_status['CLIENTE'].unique().tolist()
-        meses = [f'24{str(i).zfill(2)}' for i in range(1, 13)]
-
-        # Inicializar a matriz
-        status_matrix = []
-
-        for cliente in clientes:
-            cliente_row = []
-            cliente_data = df_status[df_status['CLIENTE'] == cliente]
-
-            # Obter os 4 primeiros dígitos da primeira ocorrência de 'Nº MEDIÇÃO'
-            n_medicao = cliente_data['Nº MEDIÇÃO'].iloc[0].split('-')[0][:4]
-
-            # Adicionar o código de medição e o nome do cliente
-            cliente_row.append(n_medicao)  # Nova coluna com os 4 primeiros dígitos
-            cliente_row.append(cliente)
-
-            cliente_status = {str(aba): status for aba, status in zip(cliente_data['ABA'], cliente_data['STATUS'])}
-
-            ultimo_status = None
-            primeiro_pendente = False  # Indica se o primeiro P já foi encontrado
-
-            for mes in meses:
-                if mes in cliente_status:
-                    status_atual = cliente_status[mes].strip().upper()
-
-                    if status_atual in ['ATIVO', 'AG. FAT.', 'PARCIAL']:
-                        cliente_row.append('A')  # Aberto (Ativo)
-                        ultimo_status = 'A'
-                    elif status_atual == 'FINALIZADO':
-                        cliente_row.append('F')  # Fechado (Finalizado)
-                        ultimo_status = 'F'
-                    else:
-                        cliente_row.append('O')  # Outros status, mapeados como "O"
-                        ultimo_status = 'O'
-                else:
-                    if ultimo_status == 'A' and not primeiro_pendente:
-                        cliente_row.append('P')  # Pendente
-                        primeiro_pendente = True
-                        ultimo_status = 'P'
-                    elif ultimo_status == 'F':
-                        cliente_row.append('X')  # Inativo após Fechado (Finalizado)
-                    elif primeiro_pendente:
-                        cliente_row.append('')  # Vazio após o primeiro P
-                    else:
-                        cliente_row.append('')  # Nenhum status conhecido antes de P
-
-            status_matrix.append(cliente_row)
-
-        return status_matrix
-    
-    def clean_dataframe(self, df):
-        df_cleaned = df.copy()
-        df_cleaned['ABA'] = df_cleaned['ABA'].astype(str)  # Garantir que a coluna ABA seja string
-        df_cleaned['VALOR FATURADO'] = pd.to_numeric(df_cleaned['VALOR FATURADO'], errors='coerce')
-        df_cleaned['GLOSA - MANUTENÇÃO'] = pd.to_numeric(df_cleaned['GLOSA - MANUTENÇÃO'], errors='coerce').fillna(0)
-        df_cleaned['DESC COMERCIAL'] = pd.to_numeric(df_cleaned['DESC COMERCIAL'], errors='coerce').fillna(0)
-        df_cleaned['KM EXCEDENTE'] = pd.to_numeric(df_cleaned['KM EXCEDENTE'], errors='coerce').fillna(0)
-        df_cleaned['MULTA CONTRATUAL'] = pd.to_numeric(df_cleaned['MULTA CONTRATUAL'], errors='coerce').fillna(0)
-        df_cleaned['AJUSTES / ACRÉCIMOS'] = pd.to_numeric(df_cleaned['AJUSTES / ACRÉCIMOS'], errors='coerce').fillna(0)
-        df_cleaned['QTDE LOCADOS'] = pd.to_numeric(df_cleaned['QTDE LOCADOS'], errors='coerce')
-        df_cleaned['QTDE RESERVA'] = pd.to_numeric(df_cleaned['QTDE RESERVA'], errors='coerce')
-        return df_cleaned
-
+        self.after_idle(self.record_first_window)
+        if data_client is not None:
+            self.after(DATA_SERVICE_POLL_MS, self.poll_data_service)
+        else:
+            self.after(SNAPSHOT_DELAY_MS, lambda: self.save_snapshot(file_paths))
+        if PREWARM_CHARTS:
+            self.after(PREWARM_DELAY_MS, load_chart_backend)
+        if PREBUILD_TABS:
+            self.after(PREBUILD_DELAY_MS, self.prebuild_next_tab)
+
+    def record_first_window(self):
+        """Registra o tempo até a primeira janela desenhada."""
+        STARTUP_TIMINGS['first_window'] = time.perf_counter() - _STARTUP_T0
+        for phase, seconds in STARTUP_TIMINGS.items():
+            if seconds is not None:
+                instrumentation.record(f'inicializacao:{phase}', seconds)
+        if os.environ.get('PROGMEDICAO_STARTUP_REPORT'):
+            report = "  ".join(f"{phase}: {seconds:.2f} s" for phase, seconds in STARTUP_TIMINGS.items() if seconds is not None)
+            print(f"Inicialização -> {report}", file=sys.stderr)
+
+    def on_tab_changed(self, event):
+        self.build_tab(self.notebook.select())
+
+    def cached(self, key, compute):
+        """Resultado de compute() guardado até a próxima recarga dos dados."""
+        if self.cache_version != self.data_version:
+            self.data_cache = {}
+            self.cache_version = self.data_version
+        if key not in self.data_cache:
+            self.data_cache[key] = compute()
+        return self.data_cache[key]
+
+    def aggregate_cube(self):
+        """Cubo de contagens e somas dos gráficos (chart_data.aggregate_cube), montado uma vez por carga."""
+        def compute():
+            with measure('aggregate_cube', rows=len(self.dataframe_cleaned)):
+                return chart_data.aggregate_cube(self.dataframe_cleaned)
+        return self.cached('aggregate_cube', compute)
+
+    def period_slice(self, aba_value, table_type="month"):
+        """Linhas de um mês (table_type="open": só as não finalizadas), do cache por ABA."""
+        def compute():
+            positions = self.cached('aba_positions', lambda: self.dataframe_cleaned.groupby('ABA').indices)
+            rows = positions.get(aba_value, np.array([], dtype=np.intp))
+            if table_type == "open":
+                is_open = self.cached('open_mask', lambda: analytics.open_mask(self.dataframe_cleaned).to_numpy())
+                rows = rows[is_open[rows]]
+            return self.dataframe_cleaned.iloc[rows]
+        return self.cached(('period_slice', aba_value, table_type), compute)
+
+    def load_store(self):
+        """Grava os dados atuais no SQLite numa thread; até terminar, os filtros usam o dataframe."""
+        self.store_ready = False
+        if self.store_thread is not None and self.store_thread.is_alive():
+            # Carga anterior ainda gravando na mesma conexão: tenta de novo quando ela terminar
+            self.after(STORE_POLL_MS, self.load_store)
+            return
+        dataframe, version = self.dataframe_cleaned, self.data_version
+        elapsed = []
+
+        def load():
+            start = time.perf_counter()
+            self.store.load(dataframe)
+            elapsed.append(time.perf_counter() - start)
+
+        thread = self.store_thread = threading.Thread(target=load, name='sqlite_load', daemon=True)
+        thread.start()
+
+        # O registro da medição e a liberação dos filtros ficam na thread da interface
+        def check():
+            if thread.is_alive():
+                self.after(STORE_POLL_MS, check)
+            elif elapsed and version == self.data_version:
+                instrumentation.record('sqlite_load', elapsed[0], rows=len(dataframe))
+                self.store_ready = True
+
+        self.after(STORE_POLL_MS, check)
+
+    def show_store_page(self, contains=(), equals=None, rows=None):
+        """Exibe as primeiras linhas da consulta no SQLite; "Mais Linhas" amplia a página."""
+        from sqlite_backend import PAGE_ROWS
+        self.store_request = (contains, equals)
+        # Os filtros da visão ativa entram na mesma consulta
+        view_contains, view_equals = views.store_filters(self.active_view)
+        contains, equals = list(view_contains) + list(contains), {**view_equals, **(equals or {})}
+        self.store_query = (contains, equals)
+        self.store_rows = rows or PAGE_ROWS
+        with measure('sqlite_query') as info:
+            page = self.store.query(contains, equals, limit=self.store_rows)
+            total = self.store.count(contains, equals)
+            info['rows'] = len(page)
+        self.populate_treeview(self.project(page))
+        self.page_label.configure(text=f"{len(page)} de {total} linhas")
+
+    def show_more_rows(self):
+        from sqlite_backend import PAGE_ROWS
+        if self.store_request is not None and self.use_store():
+            self.show_store_page(*self.store_request, rows=self.store_rows + PAGE_ROWS)
+
+    def save_snapshot(self, file_paths):
+        """Grava os dados atuais no histórico local em segundo plano."""
+        if SAVE_SNAPSHOTS:
+            snapshots.save_snapshot_in_background(self.dataframe_cleaned, file_paths)
+
+    def client_lifecycle(self):
+        """Matriz cliente × mês (lifecycle.ClientLifecycle), montada uma vez por carga."""
+        def compute():
+            with measure('client_lifecycle', rows=len(self.dataframe_cleaned)):
+                return ClientLifecycle(self.dataframe_cleaned, self.periods)
+        return self.cached('client_lifecycle', compute)
+
+    @timed('create_verification_dataframe')
     def create_verification_dataframe(self):
-        epsilon = 0.05  # Margem de erro para desconsiderar variações de até 1 centavo
-        df = self.clean_dataframe(self.dataframe_cleaned)
-        df['DIF FAT/MED'] = (
-            (df['PREVISÃO DE MEDIÇÃO'] - df['GLOSA - MANUTENÇÃO'] - df['DESC COMERCIAL'] +
-            df['KM EXCEDENTE'] + df['MULTA CONTRATUAL'] + df['AJUSTES / ACRÉCIMOS']) - df['VALOR FATURADO']
-        ).round(2)
-        
-        # Aplicar a margem de erro para ignorar pequenas diferenças
-        df['DIF FAT/MED'] = df['DIF FAT/MED'].apply(lambda x: 0 if abs(x) <= epsilon else x)
-        
-        verification_df = df[['ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'RESP MEDIÇÃO', 'SITUAÇÃO MED.', 'VALOR FATURADO', 
-                            'PREVISÃO DE MEDIÇÃO', 'GLOSA - MANUTENÇÃO', 'DESC COMERCIAL', 'KM EXCEDENTE', 
-                            'MULTA CONTRATUAL', 'AJUSTES / ACRÉCIMOS', 'DIF FAT/MED', 'ADM CONTRATO']]
-        
-        # Filtrar linhas onde DIF FAT/MED é diferente de 0
-        verification_df = verification_df[verification_df['DIF FAT/MED'] != 0]
-        
-        return verification_df
-       
+        return analytics.create_verification_dataframe(self.dataframe_cleaned)
+
     def create_tabs(self):
         self.tabs_info = [
             ("Controle de Medição", self.create_dataframe_viewer),
@@ -167,14 +343,60 @@ class DataFrameViewer(tk.Tk):
             ("Comparar Meses", self.create_comparison_page),
             ("Treinamentos", self.create_trainings_page),
             ("Verificação de Faturamento", self.create_verification_page),
-            ("Acompanhamento de Status", self.create_status_tracking_page)  # Nova aba
+            ("Acompanhamento de Status", self.create_status_tracking_page),  # Nova aba
+            ("Diagnóstico", self.create_diagnostics_page)  # Oculta; exibida com Ctrl+Shift+D
         ]
-       
+
+        # Cada aba é construída na primeira ativação (build_tab); só a aba inicial é montada agora
+        self.tab_builders = {}
+        self.tab_frames = {}
         for tab_name, tab_method in self.tabs_info:
             frame = ttk.Frame(self.notebook)
             self.notebook.add(frame, text=tab_name)
+            self.tab_builders[str(frame)] = (tab_method, frame)
+            self.tab_frames[tab_name] = frame
+
+        self.diagnostics_frame = frame
+        self.notebook.hide(self.diagnostics_frame)
+
+        self.prebuild_queue = list(self.tab_builders)
+        self.build_tab(self.notebook.select())
+
+    def set_compute_busy(self, key, busy):
+        """Marca a aba (título e cursor) enquanto algum cálculo dela roda em segundo plano."""
+        tab_name = COMPUTE_TABS[key]
+        busy = any(self.compute.busy(other) for other, name in COMPUTE_TABS.items() if name == tab_name)
+        frame = self.tab_frames[tab_name]
+        self.notebook.tab(frame, text=tab_name + BUSY_SUFFIX if busy else tab_name)
+        frame.configure(cursor='watch' if busy else '')
+
+    def on_close(self):
+        """Encerra os processos de cálculo junto com a janela."""
+        self.compute.shutdown()
+        self.destroy()
+
+    def show_compute_error(self, error):
+        messagebox.showerror("Erro", str(error))
+
+    def build_tab(self, tab_id):
+        """Constrói a aba, caso ainda não tenha sido construída."""
+        builder = self.tab_builders.pop(str(tab_id), None)
+        if builder is None:
+            return
+        tab_method, frame = builder
+        with measure(f"aba:{self.notebook.tab(frame, 'text')}"):
             tab_method(frame)
 
+    def prebuild_next_tab(self):
+        """Constrói a próxima aba pendente da fila e agenda a seguinte para o próximo momento ocioso."""
+        while self.prebuild_queue:
+            tab_id = self.prebuild_queue.pop(0)
+            if tab_id in self.tab_builders:
+                self.build_tab(tab_id)
+                break
+        if self.prebuild_queue:
+            self.after(PREBUILD_INTERVAL_MS, lambda: self.after_idle(self.prebuild_next_tab))
+
     def add_author_label(self):
         author_label = ttk.Label(self, text="Desenvolvido por Sérgio Filho", font=("Helvetica", 10), foreground="gray")
         author_label.pack(side="bottom", pady=5)
@@ -184,6 +406,7 @@ class DataFrameViewer(tk.Tk):
         self.update_subtitle(page)
         filter_frame = self.create_filter_frame(page)
         self.create_buttons(filter_frame)
+        self.create_view_selector(page)
         self.create_filter_buttons(page)
         self.create_treeview(page)
 
@@ -198,7 +421,10 @@ class DataFrameViewer(tk.Tk):
     def update_last_update(self):
         now = datetime.now()
         current_time = now.strftime("%d/%m/%Y %H:%M:%S")
-        self.subtitle_label.config(text=f"Relatório atualizado às {current_time}")
+        text = f"Relatório atualizado às {current_time}"
+        if len(self.data_issues):
+            text += f" ({len(self.data_issues)} problemas nos dados)"
+        self.subtitle_label.config(text=text)
 
     def create_filter_frame(self, page):
         filter_frame = ttk.Frame(page)
@@ -207,11 +433,24 @@ class DataFrameViewer(tk.Tk):
 
         def create_filter_row(row, label_text, entry_var, column_select):
             ttk.Label(filter_frame, text=label_text).grid(row=row, column=0, padx=5, pady=5, sticky="w")
-            entry = ttk.Entry(filter_frame, textvariable=entry_var, width=40)
-            entry.grid(row=row, column=1, padx=5, pady=5)
+            value_frame = ttk.Frame(filter_frame)
+            value_frame.grid(row=row, column=1, padx=5, pady=5)
+            # Sugestões com os valores distintos da coluna escolhida (por trecho, como o filtro)
+            value_select = AutocompleteCombobox(value_frame, textvariable=entry_var, width=40, match="contains")
+            value_select.pack(side="left")
+            count_label = ttk.Label(value_frame, width=16)
+            count_label.pack(side="left", padx=(5, 0))
+            value_filter = (value_select, column_select, count_label)
+            value_select.on_lookup = lambda text: self.update_value_count(value_filter)
+            value_select.bind("<<ComboboxSelected>>", lambda event: self.update_value_count(value_filter))
+            self.value_filters.append(value_filter)
+
             ttk.Label(filter_frame, text="NA COLUNA:").grid(row=row, column=2, padx=5, pady=5, sticky="w")
             column_select.set_completion_list(columns)
             column_select.grid(row=row, column=3, padx=5, pady=5)
+            column_select.on_lookup = lambda text: self.update_value_suggestions(value_filter)
+            column_select.bind("<<ComboboxSelected>>", lambda event: self.update_value_suggestions(value_filter))
+            column_select.bind("<FocusOut>", lambda event: self.update_value_suggestions(value_filter), add="+")
             if column_select['values']:
                 column_select.current(0)
 
@@ -225,41 +464,213 @@ class DataFrameViewer(tk.Tk):
         self.column_select1.set('')
         self.column_select2.set('')
 
+        # Os valores distintos de cada coluna são calculados nos momentos ociosos, um por vez
+        self.schedule_value_suggestions(PREBUILD_DELAY_MS)
+
         return filter_frame
 
+    def value_suggestions(self, column):
+        """Valores distintos da coluna com a quantidade de linhas (cache até a próxima recarga)."""
+        def compute():
+            counts = analytics.distinct_values(self.dataframe_cleaned[column])
+            return CompletionIndex(counts.index, counts.to_numpy().tolist())
+        return self.cached(('distinct_values', column), compute)
+
+    def schedule_value_suggestions(self, delay_ms=PREBUILD_INTERVAL_MS):
+        """Enfileira o cálculo das sugestões de todas as colunas dos dados atuais."""
+        self.suggestion_queue = self.dataframe_cleaned.columns.tolist()
+        if self.suggestion_job is None:
+            self.suggestion_job = self.after(delay_ms, self.prewarm_value_suggestions)
+
+    def prewarm_value_suggestions(self):
+        """Calcula as sugestões da próxima coluna pendente e agenda a seguinte."""
+        self.suggestion_job = None
+        if self.suggestion_queue:
+            self.value_suggestions(self.suggestion_queue.pop(0))
+        if self.suggestion_queue:
+            self.suggestion_job = self.after(PREBUILD_INTERVAL_MS, self.prewarm_value_suggestions)
+
+    def update_value_suggestions(self, value_filter):
+        value_select, column_select, count_label = value_filter
+        column = column_select.get().strip()
+        if column not in self.dataframe_cleaned.columns:
+            value_select.set_completion_list([])
+            count_label.configure(text="")
+            return
+        value_select.set_completion_index(self.value_suggestions(column))
+        self.update_value_count(value_filter)
+
+    def update_value_count(self, value_filter):
+        """Mostra quantas linhas o texto digitado encontra na coluna (ou quantos valores distintos ela tem)."""
+        value_select, column_select, count_label = value_filter
+        index = value_select.index
+        text = value_select.get().strip()
+        if not len(index):
+            count_label.configure(text="")
+        elif text:
+            count_label.configure(text=f"{index.total_weight(text, 'contains')} linhas")
+        else:
+            count_label.configure(text=f"{len(index)} valores")
+
     def create_buttons(self, filter_frame):
         buttons = [
             ("Aplicar Filtro", self.apply_filter, 0, 4),
             ("Limpar Filtro", self.clear_filter, 1, 4),
             ("Exportar Tabela", self.export_table, 0, 5),
-            ("Atualizar Relatório", self.update_data, 1, 5)
+            ("Atualizar Relatório", self.update_data, 1, 5),
+            ("Problemas nos Dados", self.export_data_issues, 0, 8)
         ]
         for text, command, row, column in buttons:
             ttk.Button(filter_frame, text=text, command=command).grid(row=row, column=column, padx=5, pady=5)
 
+        ttk.Label(filter_frame, text="FORMATO:").grid(row=0, column=6, padx=5, pady=5, sticky="w")
+        self.create_export_format_selector(filter_frame).grid(row=0, column=7, padx=5, pady=5)
+
+        if self.store is not None:
+            ttk.Button(filter_frame, text="Mais Linhas", command=self.show_more_rows).grid(row=1, column=6, padx=5, pady=5)
+            self.page_label = ttk.Label(filter_frame, text="")
+            self.page_label.grid(row=1, column=7, padx=5, pady=5, sticky="w")
+
+    def create_export_format_selector(self, parent):
+        """Cria a caixa de seleção do formato de exportação, compartilhada entre as abas."""
+        return ttk.Combobox(parent, textvariable=self.export_format, values=list(EXPORT_FORMATS), state="readonly", width=8)
+
+    def create_view_selector(self, page):
+        view_frame = ttk.Frame(page)
+        view_frame.pack(side="top", fill="x", padx=10, pady=5)
+        ttk.Label(view_frame, text="Visão:", font=("Helvetica", 10)).pack(side="left", padx=5)
+        self.view_select = ttk.Combobox(view_frame, values=[view['name'] for view in self.views], state="readonly", width=30)
+        self.view_select.current(self.views.index(self.active_view))
+        self.view_select.pack(side="left", padx=5)
+        self.view_select.bind("<<ComboboxSelected>>", lambda event: self.select_view(self.views[self.view_select.current()]))
+        ttk.Button(view_frame, text="Salvar Visão...", command=self.open_save_view_dialog).pack(side="left", padx=5)
+        self.view_description = ttk.Label(view_frame, text=views.describe(self.active_view))
+        self.view_description.pack(side="left", padx=10)
+
+    def use_store(self):
+        """A tabela vem do SQLite? Só quando a carga terminou e a visão ativa cabe numa consulta paginada."""
+        return self.store_ready and views.store_filters(self.active_view) is not None
+
+    def view_rows(self):
+        """Linhas da visão ativa, com todas as colunas (máscara e ordem guardadas até a próxima recarga)."""
+        view = self.active_view
+        positions = self.cached(('view_positions', views.view_key(view)),
+                                lambda: views.view_positions(self.dataframe_cleaned, view))
+        if len(positions) == len(self.dataframe_cleaned) and not view.get('sort'):
+            return self.dataframe_cleaned
+        return self.dataframe_cleaned.iloc[positions]
+
+    def project(self, dataframe):
+        """Só as colunas da visão ativa, na ordem dela."""
+        columns = views.view_columns(self.active_view, dataframe.columns)
+        return dataframe if columns == list(dataframe.columns) else dataframe[columns]
+
+    @timed('acao:trocar_visao')
+    def select_view(self, view):
+        self.active_view = view
+        self.table_sort = None
+        self.view_description.configure(text=views.describe(view))
+        self.apply_filter()  # Reaplica os filtros de texto sobre as linhas da nova visão
+
+    def open_save_view_dialog(self):
+        """Janela para gravar a visão: nome, colunas visíveis (e ordem), só abertas e filtros atuais."""
+        dialog = tk.Toplevel(self)
+        dialog.title("Salvar Visão")
+        dialog.transient(self)
+
+        ttk.Label(dialog, text="Nome:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        name_var = tk.StringVar(value="" if self.active_view['name'] in {view['name'] for view in views.DEFAULT_VIEWS} else self.active_view['name'])
+        ttk.Entry(dialog, textvariable=name_var, width=40).grid(row=0, column=1, columnspan=2, padx=5, pady=5, sticky="we")
+
+        # Colunas da visão ativa primeiro (na ordem dela), depois as demais
+        shown = views.view_columns(self.active_view, self.dataframe_cleaned.columns)
+        ordered = shown + [col for col in self.dataframe_cleaned.columns if col not in shown]
+        ttk.Label(dialog, text="Colunas visíveis:").grid(row=1, column=0, padx=5, pady=5, sticky="nw")
+        column_list = tk.Listbox(dialog, selectmode="multiple", exportselection=False, height=18, width=40)
+        column_list.grid(row=1, column=1, padx=5, pady=5, sticky="nsew")
+        for i, col in enumerate(ordered):
+            column_list.insert("end", col)
+            if col in shown:
+                column_list.selection_set(i)
+
+        def move(step):
+            active = column_list.index("active")
+            target = active + step
+            if not 0 <= target < column_list.size():
+                return
+            text, selected = column_list.get(active), column_list.selection_includes(active)
+            column_list.delete(active)
+            column_list.insert(target, text)
+            if selected:
+                column_list.selection_set(target)
+            column_list.activate(target)
+
+        move_frame = ttk.Frame(dialog)
+        move_frame.grid(row=1, column=2, padx=5, pady=5, sticky="n")
+        ttk.Button(move_frame, text="Subir", command=lambda: move(-1)).pack(side="top", pady=2)
+        ttk.Button(move_frame, text="Descer", command=lambda: move(1)).pack(side="top", pady=2)
+
+        open_only = tk.BooleanVar(value=bool(self.active_view.get('open_only')))
+        ttk.Checkbutton(dialog, text="Só medições em aberto", variable=open_only).grid(row=2, column=1, padx=5, sticky="w")
+        keep_filters = tk.BooleanVar(value=True)
+        ttk.Checkbutton(dialog, text="Incluir os filtros de texto atuais", variable=keep_filters).grid(row=3, column=1, padx=5, sticky="w")
+
+        def save():
+            name = name_var.get().strip()
+            columns = [column_list.get(i) for i in range(column_list.size()) if column_list.selection_includes(i)]
+            if not name or not columns:
+                messagebox.showwarning("Aviso", "Informe o nome e ao menos uma coluna.", parent=dialog)
+                return
+            filters = list(self.active_view.get('filters', []))
+            if keep_filters.get():
+                for value_var, column_select in ((self.search_var1, self.column_select1), (self.search_var2, self.column_select2)):
+                    value, column = value_var.get().strip(), column_select.get().strip()
+                    if not value or not column:
+                        break  # O segundo filtro só vale junto com o primeiro
+                    filters.append([column, 'contains', value])
+            sort = [[self.table_sort, True]] if self.table_sort else self.active_view.get('sort', [])
+            view = {'name': name, 'columns': columns, 'filters': filters, 'open_only': open_only.get(), 'sort': sort}
+            try:
+                views.save_view(view)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Erro", f"Erro ao salvar a visão: {e}", parent=dialog)
+                return
+            self.views = views.load_views()
+            names = [entry['name'] for entry in self.views]
+            self.view_select.configure(values=names)
+            self.view_select.current(names.index(name))
+            dialog.destroy()
+            self.search_var1.set("")
+            self.search_var2.set("")
+            self.select_view(self.views[names.index(name)])
+
+        button_frame = ttk.Frame(dialog)
+        button_frame.grid(row=4, column=0, columnspan=3, pady=10)
+        ttk.Button(button_frame, text="Salvar", command=save).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Cancelar", command=dialog.destroy).pack(side="left", padx=5)
+
     def create_filter_buttons(self, page):
         filter_buttons_frame = ttk.Frame(page)
         filter_buttons_frame.pack(side="top", fill="x", padx=10, pady=5)
 
         ttk.Label(filter_buttons_frame, text="Filtros Rápidos:", font=("Helvetica", 10)).pack(side="left", padx=5)
 
-        months = [f"240{i}" for i in range(1, 10)] + [f"24{i}" for i in range(10, 13)]
-        unique_months = self.dataframe_cleaned['ABA'].unique().tolist()
-
-        filter_buttons_frame1 = ttk.Frame(filter_buttons_frame)
-        filter_buttons_frame1.pack(side="top", fill="x", padx=5, pady=5)
+        self.quick_filter_rows = ttk.Frame(filter_buttons_frame)
+        self.quick_filter_rows.pack(side="top", fill="x")
+        self.refresh_filter_buttons()
 
-        filter_buttons_frame2 = ttk.Frame(filter_buttons_frame)
-        filter_buttons_frame2.pack(side="top", fill="x", padx=5, pady=5)
-
-        buttons = []
-        for month in months:
-            if month in unique_months:
-                buttons.append((month, lambda m=month: self.apply_quick_filter(m)))
+    def refresh_filter_buttons(self):
+        """Recria os botões de filtro rápido, uma linha por ano do eixo de períodos."""
+        for widget in self.quick_filter_rows.winfo_children():
+            widget.destroy()
 
-        for idx, (text, command) in enumerate(buttons):
-            frame = filter_buttons_frame1 if idx < 16 else filter_buttons_frame2
-            button = ttk.Button(frame, text=text, command=command)
+        year_frames = {}
+        for month in self.periods:
+            year = month[:2]
+            if year not in year_frames:
+                year_frames[year] = ttk.Frame(self.quick_filter_rows)
+                year_frames[year].pack(side="top", fill="x", padx=5, pady=5)
+            button = ttk.Button(year_frames[year], text=month, command=lambda m=month: self.apply_quick_filter(m))
             button.pack(side="left", padx=5, pady=5)
 
     def create_treeview(self, page):
@@ -278,7 +689,7 @@ class DataFrameViewer(tk.Tk):
         tree_scroll_y.config(command=self.treeview.yview)
         tree_scroll_x.config(command=self.treeview.xview)
 
-        self.populate_treeview(self.dataframe_cleaned)
+        self.show_view()
 
     def setup_treeview_columns(self, dataframe):
         self.treeview["columns"] = dataframe.columns.tolist()
@@ -289,6 +700,15 @@ class DataFrameViewer(tk.Tk):
             self.treeview.column(col, width=column_width, stretch=False)
 
     def populate_treeview(self, dataframe):
+        if self.store is not None:
+            self.page_label.configure(text="")  # show_store_page preenche de novo depois
+        with measure('populate_treeview', rows=len(dataframe)):
+            self._populate_treeview(dataframe)
+
+    def _populate_treeview(self, dataframe):
+        # Guarda a visão atual (filtrada) para a exportação
+        self.current_view = dataframe
+
         # Limpa todos os itens da Treeview
         self.treeview.delete(*self.treeview.get_children())
 
@@ -302,8 +722,8 @@ class DataFrameViewer(tk.Tk):
             column_width = default_font.measure(col.title())
             self.treeview.column(col, width=column_width, stretch=False)
 
-        # Insere os dados no Treeview
-        for _, row in dataframe.iterrows():
+        # Insere os dados no Treeview (datas em dd/mm/aaaa)
+        for _, row in display_frame(dataframe).iterrows():
             self.treeview.insert("", "end", values=row.tolist())
 
         # Ajusta as larguras das colunas e reaplica o comando de ordenação
@@ -315,16 +735,7 @@ class DataFrameViewer(tk.Tk):
         for col in self.treeview["columns"]:
             self.treeview.heading(col, command=lambda c=col: self.sort_column(c))
 
-    def sort_column(self, col):
-        # Ordena a coluna selecionada
-        try:
-            data = [(self.treeview.set(child, col), child) for child in self.treeview.get_children("")]
-            data.sort(reverse=False)
-            for i, (_, child) in enumerate(data):
-                self.treeview.move(child, "", i)
-        except Exception as e:
-            print(f"Erro ao ordenar a coluna {col}: {e}")
-
+    @timed('adjust_column_widths')
     def adjust_column_widths(self):
         for col in self.treeview["columns"]:
             max_width = Font().measure(col.title())
@@ -335,7 +746,9 @@ class DataFrameViewer(tk.Tk):
                     max_width = row_width
             self.treeview.column(col, width=max_width)
 
+    @timed('acao:ordenar_coluna')
     def sort_column(self, col):
+        self.table_sort = col
         data = [(self.treeview.set(child, col), child) for child in self.treeview.get_children("")]
         data.sort()
         for i, (_, child) in enumerate(data):
@@ -344,42 +757,85 @@ class DataFrameViewer(tk.Tk):
         for i, item in enumerate(self.treeview.get_children()):
             self.treeview.item(item, tags=("evenrow" if i % 2 == 0 else "oddrow",))
 
+    @timed('acao:aplicar_filtro')
     def apply_filter(self):
         value1 = self.search_var1.get().strip()
         column1 = self.column_select1.get().strip()
         value2 = self.search_var2.get().strip()
         column2 = self.column_select2.get().strip()
 
-        if value1 and column1 not in ('', ' ') and value2 and column2 not in ('', ' '):
-            mask1 = self.dataframe_cleaned[column1].astype(str).str.contains(value1, case=False, na=False)
-            mask2 = self.dataframe_cleaned[column2].astype(str).str.contains(value2, case=False, na=False)
-            filtered_df = self.dataframe_cleaned[mask1 & mask2]
-        elif value1 and column1 not in ('', ' '):
-            filtered_df = self.dataframe_cleaned[self.dataframe_cleaned[column1].astype(str).str.contains(value1, case=False, na=False)]
-        else:
-            filtered_df = self.dataframe_cleaned
+        # O segundo filtro só vale junto com o primeiro
+        contains = []
+        if value1 and column1 not in ('', ' '):
+            contains.append((column1, value1))
+            if value2 and column2 not in ('', ' '):
+                contains.append((column2, value2))
 
-        self.populate_treeview(filtered_df)
+        if self.use_store():
+            self.show_store_page(contains)
+            return
+
+        filtered_df = self.view_rows()
+        for column, value in contains:
+            filtered_df = filtered_df[display_text(filtered_df[column]).str.contains(value, case=False, na=False, regex=False)]
+        self.populate_treeview(self.project(filtered_df))
 
+    @timed('acao:filtro_rapido')
     def apply_quick_filter(self, month):
         month_str = str(month)
-        filtered_df = self.dataframe_cleaned[self.dataframe_cleaned['ABA'] == month_str]
-        self.populate_treeview(filtered_df)
+        if self.use_store():
+            self.show_store_page(equals={'ABA': month_str})
+            return
+        filtered_df = self.view_rows()
+        filtered_df = filtered_df[filtered_df['ABA'] == month_str]
+        self.populate_treeview(self.project(filtered_df))
 
+    @timed('acao:limpar_filtro')
     def clear_filter(self):
         self.search_var1.set("")
         self.search_var2.set("")
         self.column_select1.set('')
         self.column_select2.set('')
-        self.populate_treeview(self.dataframe_cleaned)
+        self.show_view()
+
+    def show_view(self):
+        """Exibe todas as linhas da visão ativa (sem os filtros de texto)."""
+        if self.use_store():
+            self.show_store_page()
+            return
+        self.populate_treeview(self.project(self.view_rows()))
 
     def export_table(self):
         now = datetime.now()
         current_time = now.strftime("%d.%m.%Y_%H-%M-%S")
-        file_path = f"C:/Users/{os.getlogin()}/Desktop/RELATORIO_GERAL_MEDICAO_EXPORTADO_{current_time}.xlsx"
-        self.dataframe_cleaned.to_excel(file_path, index=False)
-        messagebox.showinfo("Exportar Tabela", f"Tabela exportada com sucesso para {file_path}")
+        dataframe = self.current_view
+        if self.use_store() and self.store_query is not None:
+            # A tabela mostra só uma página; a exportação leva todas as linhas da consulta
+            dataframe = self.project(self.store.query(*self.store_query, limit=None))
+        self.export_view(dataframe, f"RELATORIO_GERAL_MEDICAO_EXPORTADO_{current_time}",
+                         "Exportar Tabela", "Tabela exportada com sucesso para {}")
+
+    def export_data_issues(self):
+        """Exporta o relatório de problemas encontrados na validação da planilha."""
+        if self.data_issues.empty:
+            messagebox.showinfo("Problemas nos Dados", "Nenhum problema encontrado nos dados.")
+            return
+        current_time = datetime.now().strftime("%d.%m.%Y_%H-%M-%S")
+        self.export_view(self.data_issues, f"PROBLEMAS_NOS_DADOS_{current_time}",
+                         "Problemas nos Dados", "Relatório de problemas exportado para {}")
+
+    def export_view(self, dataframe, base_name, title, success_message):
+        """Exporta o dataframe no formato selecionado e informa o resultado ao usuário."""
+        fmt = self.export_format.get()
+        try:
+            with measure(f'acao:exportar_{fmt}', rows=len(dataframe)):
+                file_path = export_dataframe(dataframe, build_export_path(base_name, fmt), fmt)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao exportar ({fmt}): {e}")
+            return
+        messagebox.showinfo(title, success_message.format(file_path))
 
+    @timed('acao:atualizar_relatorio')
     def update_data(self):
         # Recarregar os dados
         self._data()  # Atualiza o dataframe com os novos dados
@@ -390,33 +846,68 @@ class DataFrameViewer(tk.Tk):
         # Recarregar os gráficos com os novos dados
         self.refresh_graphs()
 
-    def _data(self):
-        username = os.getlogin()
-        file_paths = [
-            f'C:\\Users\\{username}\\EBEC\\NC - Medicao - Documentos\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento\\RELATORIO GERAL MEDIÇÃO.xlsx',
-            f'C:\\Users\\joana.conceicao.EBEC-SA.000\\EBEC\\NC - Medicao - Documentos\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento\\RELATORIO GERAL MEDIÇÃO.xlsx',
-            f'C:\\Users\\{username}\\EBEC\\NC - Medicao - Documentos.000\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento\\RELATORIO GERAL MEDIÇÃO.xlsx'
-        ]
+    def poll_data_service(self):
+        """Recarrega os dados quando o serviço publica uma nova versão (uma versão que falhou ao
+        carregar só é tentada de novo pelo botão Atualizar Relatório ou quando outra for publicada)."""
+        if self.data_client.changed():
+            self.update_data()
+        self.after(DATA_SERVICE_POLL_MS, self.poll_data_service)
 
-        for file_path in file_paths:
-            if os.path.exists(file_path):
-                df = pd.read_excel(file_path)
-                break
+    def _data(self):
+        if self.data_client is not None:
+            # O serviço já leu e limpou a planilha; o histórico de snapshots fica a cargo dele
+            try:
+                with measure('data_service_load') as info:
+                    self.dataframe_cleaned = self.data_client.load()
+                    info['rows'] = len(self.dataframe_cleaned)
+                self.data_issues = self.data_client.issues
+            except (OSError, RuntimeError) as e:
+                messagebox.showerror("Erro", f"Erro ao carregar os dados do serviço: {e}")
+                return
         else:
-            file_path = filedialog.askopenfilename(title="Selecione o arquivo RELATORIO GERAL MEDIÇÃO", filetypes=[("Excel files", "*.xlsx")])
-            if not file_path:
-                messagebox.showwarning("Aviso", "Arquivo não selecionado.")
+            file_paths = default_workbook_paths()
+            if not file_paths:
+                file_paths = filedialog.askopenfilenames(title="Selecione o(s) arquivo(s) RELATORIO GERAL MEDIÇÃO", filetypes=[("Excel files", "*.xlsx")])
+                if not file_paths:
+                    messagebox.showwarning("Aviso", "Arquivo não selecionado.")
+                    return
+            with measure('read_workbooks') as info:
+                df = load_workbooks(file_paths)
+                info['rows'] = len(df)
+
+            # Atualizar o dataframe limpo com os novos dados
+            try:
+                with measure('validate', rows=len(df)):
+                    self.dataframe_cleaned, self.data_issues = validation.validate(df)
+            except ValueError as e:
+                messagebox.showerror("Erro", str(e))
                 return
-            df = pd.read_excel(file_path)
-
-        # Atualizar o dataframe limpo com os novos dados
-        self.dataframe_cleaned = self.clean_dataframe(df)
+            self.save_snapshot(file_paths)
+        self.data_version += 1
+        if self.store is not None:
+            self.store_query = None
+            self.load_store()
+        self.periods = period_axis(self.dataframe_cleaned['ABA'])
+        self.refresh_filter_buttons()
+        if hasattr(self, 'month1_select'):
+            self.month1_select.set_completion_list(self.periods)
+            self.month2_select.set_completion_list(self.periods)
 
         # Atualizar o dataframe de verificação
         self.verification_dataframe = self.create_verification_dataframe()
 
+        # Atualizar os cards de fechamento (quando a aba já foi construída)
+        if self.closure_cards or self.compute.busy('fechamentos'):
+            self.refresh_closure_metrics()
+
+        # Sugestões dos filtros com os valores dos novos dados
+        for value_filter in self.value_filters:
+            self.update_value_suggestions(value_filter)
+        if self.value_filters:
+            self.schedule_value_suggestions()
+
         # Recarregar a tabela na visualização
-        self.populate_treeview(self.dataframe_cleaned)
+        self.show_view()
 
         # Recarregar os gráficos com os novos dados
         self.refresh_graphs()
@@ -426,6 +917,7 @@ class DataFrameViewer(tk.Tk):
         self.graph_frame = ttk.Frame(page)
         self.graph_frame.pack(fill="both", expand=True)
 
+        load_chart_backend()  # No-op quando o pré-aquecimento já importou o matplotlib
         self.create_graphs()
 
         self.left_button = ttk.Button(page, text="<", command=self.show_prev_graph)
@@ -434,31 +926,148 @@ class DataFrameViewer(tk.Tk):
         self.right_button = ttk.Button(page, text=">", command=self.show_next_graph)
         self.right_button.pack(side="right", padx=10, pady=10)
 
-        self.show_graph(0)
+        export_frame = ttk.Frame(page)
+        export_frame.pack(side="left", expand=True)
+        ttk.Label(export_frame, text="DPI:").pack(side="left", padx=5)
+        self.chart_dpi = ttk.Combobox(export_frame, values=CHART_EXPORT_DPIS, width=5, state="readonly")
+        self.chart_dpi.set('150')
+        self.chart_dpi.pack(side="left", padx=5)
+        self.export_charts_button = ttk.Button(export_frame, text="Exportar Gráficos (PDF e PNG)", command=self.export_charts)
+        self.export_charts_button.pack(side="left", padx=5)
+        self.export_charts_status = ttk.Label(export_frame, text="")
+        self.export_charts_status.pack(side="left", padx=5)
+
+        self.show_graph(self.graph_index)
+
+    def export_charts(self):
+        """Desenha todos os gráficos sem tela (Agg) em processos paralelos: um PNG por gráfico numa
+        pasta e um PDF com uma página por gráfico. Os canvas da tela não são usados."""
+        if str(self.export_charts_button['state']) == 'disabled':
+            return
+        dpi = int(self.chart_dpi.get())
+        base_name = f"GRAFICOS_{datetime.now().strftime('%d.%m.%Y_%H-%M-%S')}"
+        folder, png_paths, pdf_path = charts.export_paths(default_export_dir(), base_name)
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Erro ao criar a pasta dos gráficos: {e}")
+            return
+
+        # Os dados de cada gráfico saem do cache; os processos só desenham
+        inputs = [self.chart_input(chart.key) for chart in charts.CHARTS]
+        executor = ProcessPoolExecutor(max_workers=min(len(charts.CHARTS), os.cpu_count() or 1))
+        futures = [executor.submit(charts.render_chart, chart.key, data, path, dpi)
+                   for chart, data, path in zip(charts.CHARTS, inputs, png_paths)]
+        pdf_future = None
+        start = time.perf_counter()
+        self.export_charts_button.state(['disabled'])
+
+        def finish(error=None):
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.export_charts_button.state(['!disabled'])
+            self.export_charts_status.configure(text="")
+            if error is not None:
+                messagebox.showerror("Erro", f"Erro ao exportar os gráficos: {error}")
+                return
+            instrumentation.record('acao:exportar_graficos', time.perf_counter() - start, rows=len(self.dataframe_cleaned), dpi=dpi)
+            messagebox.showinfo("Exportação concluída", f"Gráficos exportados para:\n{pdf_path}\n{folder}")
+
+        def poll():
+            nonlocal pdf_future
+            pending = [future for future in futures if not future.done()]
+            errors = [future.exception() for future in futures if future.done() and future.exception() is not None]
+            if errors:
+                finish(errors[0])
+                return
+            if pending:
+                self.export_charts_status.configure(text=f"Gráficos: {len(futures) - len(pending)}/{len(futures)}")
+            elif pdf_future is None:
+                self.export_charts_status.configure(text="Montando o PDF...")
+                pdf_future = executor.submit(charts.assemble_pdf, png_paths, pdf_path, dpi)
+            elif pdf_future.done():
+                finish(pdf_future.exception())
+                return
+            self.after(CHART_EXPORT_POLL_MS, poll)
+
+        self.after(CHART_EXPORT_POLL_MS, poll)
 
     def create_graphs(self):
-        self.create_graph(self.refresh_graph1, "Valores de Medição / Faturamento")
-        self.create_graph(self.refresh_graph9, "Valores Variáveis")  # Novo gráfico adicionado
-        self.create_graph(self.refresh_graph10, "Total por CR")  # Novo gráfico adicionado        
-        self.create_graph(self.refresh_graph2, "Clientes com Medição Aberta/Fechada por Mês")
-        self.create_graph(self.refresh_graph3, "Contagem de RESP MEDIÇÃO por Mês")
-        self.create_graph(self.refresh_graph4, "Novos Clientes vs Clientes Finalizados por Mês")
-        self.create_graph(self.refresh_graph5, "Total de Carros Locados por Mês")
-        self.create_graph(self.refresh_graph6, "Diferença Faturamento/Medição")
-        self.create_graph(self.refresh_graph7, "Contagem de Situação por ABA")
-        self.create_graph(self.refresh_graph8, "Contagem de Situação por PESSOA")
-
-    def create_graph(self, refresh_method, title):
-        figure = plt.Figure(figsize=(12, 6))
+        for chart in charts.CHARTS:
+            self.create_graph(chart)
+
+    def create_graph(self, chart):
+        figure = Figure(figsize=charts.FIGSIZE)
         canvas = FigureCanvasTkAgg(figure, master=self.graph_frame)
         ax = figure.add_subplot(111)
         toolbar = NavigationToolbar2Tk(canvas, self.graph_frame)
         toolbar.update()
         canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
         toolbar.pack_forget()  # Esconde a barra de ferramentas inicialmente
-        graph = {'canvas': canvas, 'ax': ax, 'title': title, 'toolbar': toolbar}
+        graph = {'canvas': canvas, 'ax': ax, 'title': chart.title, 'toolbar': toolbar, 'chart': chart}
         self.graphs.append(graph)
-        refresh_method(graph)
+        self.refresh_graph(graph)
+
+    def chart_input(self, key):
+        """Dados já preparados de um gráfico de charts.CHARTS, guardados até a próxima carga."""
+        sources = {
+            'financeiro': lambda: chart_data.financial_by_period(self.dataframe_cleaned),
+            'variaveis': lambda: self.chart_input('financeiro'),
+            'cr': lambda: chart_data.top_with_others(self.cr_totals(), charts.TOP_CR, 'VALOR FATURADO'),
+            'faturamento': lambda: chart_data.invoicing_progress(self.dataframe_cleaned),
+            'resp': lambda: chart_data.counts_by_resp(self.aggregate_cube()),
+            'clientes': lambda: chart_data.client_flow(self.client_lifecycle()),
+            'locados': lambda: chart_data.rented_by_resp(self.aggregate_cube()),
+            'diferencas': lambda: chart_data.differences_by_period(self.verification_dataframe),
+            'situacao': lambda: chart_data.situation_counts(self.aggregate_cube()),
+            'situacao_resp': lambda: chart_data.situation_count_by_resp(self.aggregate_cube()),
+        }
+        return self.cached(('chart', key), sources[key])
+
+    def cr_totals(self):
+        """Totais por Nº CR (todos os CRs da planilha, mesmo sem valores), do cubo de agregados."""
+        return self.cached('totals_by_cr', lambda: chart_data.totals_by_cr(self.aggregate_cube()))
+
+    def refresh_graph(self, graph):
+        chart = graph['chart']
+        with measure(f"grafico:{graph['title']}", rows=len(self.dataframe_cleaned)):
+            ax = graph['ax']
+            ax.clear()
+            for other in ax.figure.axes:  # Eixos secundários (twinx) da atualização anterior
+                if other is not ax:
+                    other.remove()
+            if chart.key == 'cr':
+                labels = self.draw_graph_cr(graph)
+            else:
+                labels = self.chart_labels(graph)
+                chart.draw(ax, self.chart_input(chart.key), labels, chart.title)
+            labels.attach(graph['canvas'])
+            graph['canvas'].draw()
+
+    def draw_graph_cr(self, graph):
+        """Gráfico 10: visão geral dos CRs ou, depois de um clique num CR, os clientes dele por mês."""
+        cr = graph.get('cr')
+
+        def select_cr(selected):
+            if selected is not None or cr is not None:
+                graph['cr'] = selected
+                self.refresh_graph(graph)
+
+        labels = self.chart_labels(graph, on_click=select_cr)
+        if cr is not None and cr in self.cr_totals().index:
+            positions = self.cached('cr_positions', lambda: self.dataframe_cleaned.groupby('Nº CR').indices)
+            rows = self.dataframe_cleaned.iloc[positions.get(cr, np.array([], dtype=np.intp))]
+            charts.draw_cr_detail(graph['ax'], chart_data.cr_clients_by_month(rows), labels, cr)
+        else:
+            graph['cr'] = None
+            charts.draw_totals_by_cr(graph['ax'], self.chart_input('cr'), labels, graph['title'])
+        return labels
+
+    def chart_labels(self, graph, on_click=None):
+        """Rótulos e dica do gráfico (chart_labels.ChartLabels), trocando os da atualização anterior."""
+        if graph.get('labels') is not None:
+            graph['labels'].detach()
+        graph['labels'] = ChartLabels(graph['ax'], on_click=on_click)
+        return graph['labels']
 
     def show_graph(self, index):
         for graph in self.graphs:
@@ -477,541 +1086,23 @@ class DataFrameViewer(tk.Tk):
         self.graph_index = (self.graph_index - 1) % len(self.graphs)
         self.show_graph(self.graph_index)
 
-    def refresh_graph1(self, graph):
-        ax = graph['ax']
-        ax.clear()
-        aba_values = self.dataframe_cleaned['ABA'].unique().tolist()
-        val_fat_values = self.dataframe_cleaned.groupby('ABA')['VALOR FATURADO'].sum().tolist()
-        prev_med_values = self.dataframe_cleaned.groupby('ABA')['PREVISÃO DE MEDIÇÃO'].sum().tolist()
-        glosa_values = self.dataframe_cleaned.groupby('ABA')['GLOSA - MANUTENÇÃO'].sum().tolist()
-        desc_com_values = self.dataframe_cleaned.groupby('ABA')['DESC COMERCIAL'].sum().tolist()
-        km_exc_values = self.dataframe_cleaned.groupby('ABA')['KM EXCEDENTE'].sum().tolist()
-        multa_values = self.dataframe_cleaned.groupby('ABA')['MULTA CONTRATUAL'].sum().tolist()
-        ajustes_values = self.dataframe_cleaned.groupby('ABA')['AJUSTES / ACRÉCIMOS'].sum().tolist()
-
-        # Cálculo da nova linha total
-        linha_total = [-glosa - desc + km + multa + ajuste for glosa, desc, km, multa, ajuste in zip(glosa_values, desc_com_values, km_exc_values, multa_values, ajustes_values)]
-
-        x = np.arange(len(aba_values))
-        width = 0.35
-
-        # Barras
-        bars1 = ax.bar(x - width / 2, val_fat_values, width, label='Valor Faturado', color='#003f70')
-        bars2 = ax.bar(x + width / 2, prev_med_values, width, label='Previsão de Medição', color='#00afa0')
-
-        # Rótulos para as barras
-        for bar, value in zip(bars1, val_fat_values):
-            if value > 0:
-                ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'R$ {value:,.2f}', ha='center', va='bottom',
-                        color=bar.get_facecolor(), rotation=90)
-        for bar, value in zip(bars2, prev_med_values):
-            if value > 0:
-                ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'R$ {value:,.2f}', ha='center', va='bottom',
-                        color=bar.get_facecolor(), rotation=90)
-
-        # Eixo principal
-        ax.set_ylim(0, 30000000)
-        ax.set_ylabel('R$ (Eixo Principal)')
-
-        # Eixo secundário para a linha total
-        ax2 = ax.twinx()
-        line_total, = ax2.plot(x, linha_total, marker='o', color='#F15A22', label='Variáveis')
-
-        # Ajuste do limite do eixo secundário
-        ax2.set_ylim(0, 1500000)
-        ax2.set_ylabel('R$ (Eixo Secundário)')
-
-        # Rótulos para a linha total
-        for x_value, total, glosa, desc, km, multa, ajuste in zip(x, linha_total, glosa_values, desc_com_values, km_exc_values, multa_values, ajustes_values):
-            # Valor total acima do marcador
-            if total != 0:
-                ax2.text(x_value, total, f'R$ {total:,.2f}', ha='center', va='bottom', color='#F15A22')
-            
-            # Valores positivos e negativos abaixo do marcador
-            sum_negatives = -glosa - desc
-            sum_positives = km + multa + ajuste
-
-            # Valor positivo (em verde) e valor negativo (em vermelho)
-            if sum_positives != 0:
-                ax2.text(x_value, total - (total * 0.05), f'({sum_positives:,.2f})', ha='center', va='top', color='#00FA3C', fontsize=10)
-            if sum_negatives != 0:
-                ax2.text(x_value, total - (total * 0.15), f'({sum_negatives:,.2f})', ha='center', va='top', color='#FA0000', fontsize=10)
-
-        # Ajuste do posicionamento das linhas para ficarem centralizadas
-        ax2.set_xticks(x)
-        ax.set_xticks(x)
-        ax.set_xticklabels(aba_values)
-        ax2.set_xticklabels(aba_values)
-
-        # Legendas combinadas
-        bars = [bars1, bars2]
-        lines = [line_total]
-        labels = [bar.get_label() for bar in bars] + [line.get_label() for line in lines]
-        ax.legend(bars + lines, labels, loc='upper right')
-
-        # Formatadores de moeda
-        def currency_formatter(x, pos):
-            return 'R$ {:,.2f}'.format(x).replace(',', 'x').replace('.', ',').replace('x', '.')
-
-        ax.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
-        ax2.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
-
-        graph['canvas'].draw()
-
-    def refresh_graph2(self, graph):
-        ax = graph['ax']
-        ax.clear()
-        aba_values = self.dataframe_cleaned['ABA'].unique().tolist()
-        sim_counts = []
-        nao_counts = []
-
-        for aba in aba_values:
-            aba_df = self.dataframe_cleaned[self.dataframe_cleaned['ABA'] == aba]
-            sim_count = aba_df.dropna(subset=['ENVIO FAT', 'FAT MEDIÇÃO']).shape[0]
-            nao_count = len(aba_df) - sim_count
-            sim_counts.append(sim_count)
-            nao_counts.append(nao_count)
-
-        total_counts = [sim + nao for sim, nao in zip(sim_counts, nao_counts)]
-        sim_percents = [sim / total * 100 for sim, total in zip(sim_counts, total_counts)]
-        nao_percents = [nao / total * 100 for nao, total in zip(nao_counts, total_counts)]
-
-        bar_width = 0.6
-        indices = list(range(len(aba_values)))
-
-        p1 = ax.barh(indices, sim_percents, bar_width, label='Finalizados', color='#00afa0')
-        p2 = ax.barh(indices, nao_percents, bar_width, left=sim_percents, label='Não Finalizados', color='#a09ba2')
-
-        ax.set_yticks(indices)
-        ax.set_yticklabels(aba_values)
-        ax.set_title(graph['title'])
-        ax.get_xaxis().set_visible(False)
-
-        for rect1, rect2, sim_count, nao_count, total in zip(p1, p2, sim_counts, nao_counts, total_counts):
-            ax.text(rect1.get_x() + rect1.get_width() - 1, rect1.get_y() + rect1.get_height() / 2, f'{sim_count}', ha='right', va='center', color='black')
-            ax.text(rect2.get_x() + 1, rect2.get_y() + rect2.get_height() / 2, f'{nao_count}', ha='left', va='center', color='black')
-
-        graph['canvas'].draw()
-
-    def refresh_graph3(self, graph):
-        ax = graph['ax']
-        ax.clear()
-        aba_values = self.dataframe_cleaned['ABA'].unique().tolist()
-        resp_medicao_values = self.dataframe_cleaned['RESP MEDIÇÃO'].unique().tolist()
-
-        counts = {aba: {resp: 0 for resp in resp_medicao_values} for aba in aba_values}
-
-        for aba in aba_values:
-            aba_df = self.dataframe_cleaned[self.dataframe_cleaned['ABA'] == aba]
-            for resp in resp_medicao_values:
-                counts[aba][resp] = aba_df[aba_df['RESP MEDIÇÃO'] == resp].shape[0]
-
-        aba_indices = range(len(aba_values))
-        bar_width = 0.6
-        bottom = np.zeros(len(aba_values))
-
-        colors = ['#003f70', '#00afa0', '#ff7f0e', '#d62728', '#9467bd', '#8c564b', '#e377c2']
-
-        for resp, color in zip(resp_medicao_values, colors):
-            values = [counts[aba][resp] for aba in aba_values]
-            bars = ax.bar(aba_indices, values, bar_width, bottom=bottom, label=resp, color=color)
-            bottom += values
-
-            for bar in bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax.text(bar.get_x() + bar.get_width() / 2, bar.get_y() + height / 2, f'{height}', ha='center', va='center', fontsize=8, color='black')
-
-        ax.set_xticks(aba_indices)
-        ax.set_xticklabels(aba_values)
-        ax.set_title(graph['title'])
-        ax.legend(loc='upper right')
-
-        graph['canvas'].draw()
-
-    def refresh_graph4(self, graph):
-        ax = graph['ax']
-        ax.clear()
-        aba_values = self.dataframe_cleaned['ABA'].unique().tolist()
-
-        new_clients_counts = {aba: 0 for aba in aba_values}
-        finalized_clients_counts = {aba: 0 for aba in aba_values}
-
-        for aba in aba_values:
-            aba_df = self.dataframe_cleaned[self.dataframe_cleaned['ABA'] == aba]
-            finalized_clients_counts[aba] = aba_df[aba_df['STATUS'] == 'FINALIZADO']['CLIENTE'].nunique()
-
-        seen_clients = set()
-        for idx, row in self.dataframe_cleaned.iterrows():
-            if row['CLIENTE'] not in seen_clients:
-                seen_clients.add(row['CLIENTE'])
-                new_clients_counts[row['ABA']] += 1
-
-        # Limitar novos clientes para 5 em janeiro (2401)
-        if '2401' in new_clients_counts:
-            new_clients_counts['2401'] = 5
-
-        aba_indices = range(len(aba_values))
-        bar_width = 0.6
-
-        new_clients_values = [new_clients_counts[aba] for aba in aba_values]
-        finalized_clients_values = [finalized_clients_counts[aba] for aba in aba_values]
-
-        p1 = ax.barh(aba_indices, new_clients_values, bar_width, label='Novos Clientes', color='#00afa0')
-        p2 = ax.barh(aba_indices, finalized_clients_values, bar_width, left=new_clients_values, label='Clientes Finalizados', color='#a09ba2')
-
-        ax.set_yticks(aba_indices)
-        ax.set_yticklabels(aba_values)
-        ax.set_title(graph['title'])
-        ax.legend(loc='upper right')
-
-        for bar1, bar2, value1, value2 in zip(p1, p2, new_clients_values, finalized_clients_values):
-            width1 = bar1.get_width()
-            width2 = bar2.get_width()
-            ax.text(width1 / 2, bar1.get_y() + bar1.get_height() / 2, f'{value1}', ha='center', va='center', color='black')
-            ax.text(width1 + width2 / 2, bar2.get_y() + bar2.get_height() / 2, f'{value2}', ha='center', va='center', color='black')
-
-        graph['canvas'].draw()
-
-    def refresh_graph5(self, graph):
-        ax = graph['ax']
-        ax.clear()
-
-        self.dataframe_cleaned['QTDE LOCADOS'] = pd.to_numeric(self.dataframe_cleaned['QTDE LOCADOS'], errors='coerce')
-        self.dataframe_cleaned = self.dataframe_cleaned.dropna(subset=['QTDE LOCADOS'])
-
-        valid_resp_medicao = self.dataframe_cleaned['RESP MEDIÇÃO'].dropna().unique().tolist()
-
-        aba_values = self.dataframe_cleaned['ABA'].unique().tolist()
-        grouped = self.dataframe_cleaned.groupby(['ABA', 'RESP MEDIÇÃO'])['QTDE LOCADOS'].sum().unstack().fillna(0)
-
-        grouped = grouped[valid_resp_medicao]
-
-        colors = ['#003f70', '#00afa0', '#ff7f0e', '#d62728', '#9467bd', '#8c564b', '#e377c2']
-        grouped.plot(kind='bar', stacked=True, ax=ax, color=colors[:len(valid_resp_medicao)])
-
-        ax.set_xticks(range(len(aba_values)))
-        ax.set_xticklabels(aba_values)
-        ax.set_title(graph['title'])
-        ax.legend(title='RESP MEDIÇÃO', bbox_to_anchor=(1.05, 1), loc='upper right')
-
-        for i in range(len(aba_values)):
-            for j, (resp, value) in enumerate(grouped.iloc[i].items()):
-                if value > 0:
-                    ax.text(i, sum(grouped.iloc[i, :j + 1]) - value / 2, f'{int(value)}', ha='center', va='center', color='black')
-
-        graph['canvas'].draw()
-
-    def refresh_graph6(self, graph):
-        ax = graph['ax']
-        ax.clear()
-
-        aba_counts = self.verification_dataframe['ABA'].value_counts().sort_index()
-
-        aba_counts.plot(kind='bar', ax=ax, color='#003f70')
-
-        ax.set_xlabel('MÊS')
-        ax.set_ylabel('Diferenças')
-        ax.set_title('Diferença Faturamento/Medição')
-
-        for i, (index, value) in enumerate(aba_counts.items()):
-            ax.text(i, value, str(value), ha='center', va='bottom', color='black')
-
-        graph['canvas'].draw()
-
-    def refresh_graph7(self, graph):
-        ax = graph['ax']
-        ax.clear()
-
-        # Definir o mapeamento de situações para as categorias desejadas
-        situation_mapping = {
-            'PARCIAL': 'FAT. PARCIAL',
-            'AG. CLIENTE': 'AG. CLIENTE/APROV.',
-            'AG. APROV.': 'AG. CLIENTE/APROV.',
-            'AG. MANUT.': 'AG. MANUT./COMERCIAL',
-            'AG. COMERCIAL': 'AG. MANUT./COMERCIAL',
-            'AG. FAT.': 'AG. FAT.',
-            '1° TENTATIVA': 'ENVIO S/ APROV.',
-            '2° TENTATIVA': 'ENVIO S/ APROV.',
-            '3° TENTATIVA': 'ENVIO S/ APROV.',
-            'ENVIO S/ APROV.': 'ENVIO S/ APROV.',
-            'CNPJ': 'CNPJ/LET\'S',
-            'LET\'S': 'CNPJ/LET\'S',
-            'AG. CANCEL FAT.': 'AG. CANCEL FAT.',
-            'AG. DOC': 'AG. DOC',
-            # Outras situações vão para "OUTROS"
-        }
-
-        # Filtrar e agrupar os dados, ignorando valores vazios
-        df_filtered = self.dataframe_cleaned.dropna(subset=['ABA', 'SITUAÇÃO MED.']).copy()  # Usar .copy() para evitar a cópia de visão
-
-        # Aplicar o mapeamento às situações de medição
-        df_filtered.loc[:, 'SITUAÇÃO MED.'] = df_filtered['SITUAÇÃO MED.'].apply(
-            lambda x: situation_mapping.get(x, 'OUTROS') if x.strip() else 'VOZ INCORRETA'
-        )
-
-        # Agrupar por 'ABA' e 'SITUAÇÃO MED.', contando as ocorrências
-        grouped = df_filtered.groupby(['ABA', 'SITUAÇÃO MED.']).size().unstack(fill_value=0)
-
-        # Preparar os dados para o gráfico
-        aba_values = sorted(grouped.index)
-        plot_data = grouped.T  # Transpor para ter categorias nas linhas e ABAs nas colunas
-
-        # Plotar o gráfico de barras empilhadas
-        width = 0.08  # largura das barras
-        x = np.arange(len(aba_values))  # localização dos grupos no eixo x
-
-        for i, (label, values) in enumerate(plot_data.iterrows()):
-            ax.bar(x + i * width, values, width, label=label)
-
-        # Configurações adicionais do gráfico
-        ax.set_title('Contagem de Situação por ABA')
-        ax.set_ylabel('Total')
-        ax.set_xlabel('ABA')
-        ax.set_xticks(x + width)
-        ax.set_xticklabels(aba_values)
-
-        # Adicionar rótulos com o total
-        for i, (label, values) in enumerate(plot_data.iterrows()):
-            for j, value in enumerate(values):
-                if value > 0:
-                    ax.text(x[j] + i * width, value, f'{int(value)}', ha='center', va='bottom')
-
-        # Mostrar a legenda
-        ax.legend()
-
-        # Redesenhar o canvas do gráfico
-        graph['canvas'].draw()
-
-    def refresh_graph8(self, graph):
-        ax = graph['ax']
-        ax.clear()
-
-        # Filtrar e agrupar os dados, ignorando valores vazios
-        df_filtered = self.dataframe_cleaned.dropna(subset=['ABA', 'RESP MEDIÇÃO', 'SITUAÇÃO MED.'])
-
-        # Verificar se o DataFrame filtrado está vazio
-        if df_filtered.empty:
-            ax.set_title('Nenhum dado disponível para exibir no gráfico')
-            graph['canvas'].draw()
-            return
-
-        # Ordenar os valores de ABA
-        aba_values = sorted(df_filtered['ABA'].unique())  # Ordenando os valores de ABA
-        resp_medicao_values = df_filtered['RESP MEDIÇÃO'].unique()
-
-        # Agrupar os dados por 'ABA', 'RESP MEDIÇÃO' e 'SITUAÇÃO MED.', e contar as ocorrências
-        grouped = df_filtered.groupby(['ABA', 'RESP MEDIÇÃO'])['SITUAÇÃO MED.'].count().unstack(fill_value=0)
-
-        # Verificar se há dados suficientes após o agrupamento
-        if grouped.empty:
-            ax.set_title('Nenhum dado disponível após o agrupamento')
-            graph['canvas'].draw()
-            return
-
-        # Preparar o gráfico de barras empilhadas
-        width = 0.35  # largura das barras
-        x = np.arange(len(aba_values))  # localização dos grupos no eixo x
-
-        # Inicializar o array de valores empilhados para cada RESP MEDIÇÃO
-        bottom = np.zeros(len(aba_values))
-
-        # Definir um conjunto de cores
-        colors = plt.get_cmap('tab10').colors  # Usar um colormap padrão do matplotlib para cores
-
-        # Iterar sobre cada 'RESP MEDIÇÃO'
-        for i, resp in enumerate(resp_medicao_values):
-            if resp in grouped.columns:
-                # Extrair os valores da contagem por RESP MEDIÇÃO
-                values = grouped[resp].reindex(aba_values, fill_value=0).values
-
-                # Plotar as barras empilhadas
-                bars = ax.bar(x, values, width, bottom=bottom, label=resp, color=colors[i % len(colors)])
-
-                # Atualizar o 'bottom' para a próxima barra empilhada
-                bottom += values
-
-                # Adicionar rótulos de dados com a contagem
-                for bar in bars:
-                    height = bar.get_height()
-                    if height > 0:
-                        ax.text(bar.get_x() + bar.get_width() / 2, bar.get_y() + height / 2, f'{int(height)}', ha='center', va='center', fontsize=8, color='black')
-
-        # Configurações adicionais do gráfico
-        ax.set_title('Contagem de Situação por RESP MEDIÇÃO e ABA')
-        ax.set_ylabel('Total de Situações')
-        ax.set_xlabel('ABA')
-        ax.set_xticks(x)
-        ax.set_xticklabels(aba_values)
-
-        # Mostrar a legenda
-        ax.legend(title='RESP MEDIÇÃO')
-
-        # Redesenhar o canvas do gráfico
-        graph['canvas'].draw()
-
-    def refresh_graph9(self, graph):
-        """
-        Atualiza o gráfico 9 com as configurações padrão definidas pelo usuário e adiciona uma linha em branco na tabela para separar da legenda.
-        """
-
-        # Limpar gráfico existente
-        ax = graph['ax']
-        ax.clear()
-
-        # Corrigir o cálculo de valores para serem negativos
-        aba_values = self.dataframe_cleaned['ABA'].unique().tolist()
-        glosa_values = [-1 * value for value in self.dataframe_cleaned.groupby('ABA')['GLOSA - MANUTENÇÃO'].sum().tolist()]
-        desc_com_values = [-1 * value for value in self.dataframe_cleaned.groupby('ABA')['DESC COMERCIAL'].sum().tolist()]
-        km_exc_values = self.dataframe_cleaned.groupby('ABA')['KM EXCEDENTE'].sum().tolist()
-        multa_values = self.dataframe_cleaned.groupby('ABA')['MULTA CONTRATUAL'].sum().tolist()
-        ajustes_values = self.dataframe_cleaned.groupby('ABA')['AJUSTES / ACRÉCIMOS'].sum().tolist()
-
-        x = np.arange(len(aba_values))  # Eixo X para os meses
-
-        # Linhas para cada valor
-        lines1, = ax.plot(x, glosa_values, marker='v', color='#ff7f0e', label='Glosa - Manutenção')
-        lines2, = ax.plot(x, desc_com_values, marker='v', color='#d62728', label='Desc. Comercial')
-        lines3, = ax.plot(x, km_exc_values, marker='^', color='#9467bd', label='KM Excedente')
-        lines4, = ax.plot(x, multa_values, marker='^', color='#8c564b', label='Multa Contratual')
-        lines5, = ax.plot(x, ajustes_values, marker='^', color='#e377c2', label='Ajustes / Acréscimos')
-
-        # Adicionar a linha no valor zero
-        ax.axhline(0, color='gray', linewidth=1, linestyle='--')  # Linha horizontal no valor zero
-
-        # Ajustar a posição das linhas e dos rótulos no gráfico
-        ax.set_xticks(x)
-        ax.set_xticklabels(aba_values)
-
-        # Adicionar legendas das linhas
-        lines = [lines1, lines2, lines3, lines4, lines5]
-        labels = [line.get_label() for line in lines]
-        ax.legend(lines, labels, loc='upper right')
-
-        # Formatação do eixo Y para valores monetários
-        def currency_formatter(x, pos):
-            return 'R$ {:,.2f}'.format(x).replace('.', 'x').replace(',', '.').replace('x', ',')
-
-        ax.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
-
-        # Ajustar automaticamente os limites do eixo Y
-        ax.set_ylim(auto=True)  # Remover limites manuais e ajustar automaticamente
-
-        # Criar uma linha vazia (separadora)
-        empty_line = ['' for _ in aba_values]
-
-        # Criar a tabela de dados na parte inferior (sem cabeçalho)
-        data = [empty_line,
-                [f'R$ {value:,.2f}' for value in glosa_values],
-                [f'R$ {value:,.2f}' for value in desc_com_values],
-                [f'R$ {value:,.2f}' for value in km_exc_values],
-                [f'R$ {value:,.2f}' for value in multa_values],
-                [f'R$ {value:,.2f}' for value in ajustes_values]]
-
-        # Títulos das linhas, incluindo a linha vazia
-        row_labels = [''] + ['Glosa', 'Desc. Comercial', 'KM Excedente', 'Multa', 'Ajustes']
-
-        # Adicionar a tabela ao gráfico (sem colLabels)
-        table = ax.table(cellText=data, rowLabels=row_labels, cellLoc='center', loc='bottom')
-
-        # Definir cores para cada linha
-        colors = {
-            'Glosa': '#ff7f0e',
-            'Desc. Comercial': '#d62728',
-            'KM Excedente': '#9467bd',
-            'Multa': '#8c564b',
-            'Ajustes': '#e377c2'
-        }
-
-        # Aplicar cores aos textos das células da tabela com base nos rótulos das linhas
-        for i, row_label in enumerate(row_labels):
-            if row_label in colors:
-                for col in range(len(aba_values)):
-                    cell = table[(i, col)]  # Acessar a célula usando (linha, coluna)
-                    cell.set_text_props(color=colors[row_label])  # Definir a cor do texto
-
-        # Definir valores automáticos de tamanho e espaçamento
-        table_height = len(row_labels) * 0.05  # Calcula altura baseada no número de linhas
-        table_scale_factor = 6  # Fator de escala para a altura da tabela
-        table.scale(1, table_scale_factor)  # Aumenta a altura da tabela
-
-        # Obter tamanho atual da figura
-        fig = graph['canvas'].figure
-        fig_width, fig_height = fig.get_size_inches()
-
-        # Calcular altura total disponível para a tabela
-        height_for_table = table_height * table_scale_factor
-        bottom_margin = height_for_table / fig_height  # Porcentagem da altura para a margem inferior
-
-        # Ajustar a altura do gráfico para o espaço disponível, incluindo a linha extra de separação
-        fig.subplots_adjust(left=0.1, bottom=bottom_margin, right=0.95, top=0.85)  # Ajuste manual de subplots
-
-        # Ajustar a altura das células da tabela
-        for key, cell in table.get_celld().items():
-            if key[1] == -1:  # Row Labels
-                cell.set_text_props(weight='bold')
-                cell.set_fontsize(9)
-                cell.set_height(0.075)
-            else:
-                cell.set_fontsize(9)
-                cell.set_height(0.075)  # Ajustar altura para caber corretamente
-
-        # Desativar o cabeçalho (colLabels)
-        table.auto_set_font_size(False)
-        table.set_fontsize(9)
-
-        # Redesenhar o gráfico e a tabela
-        graph['canvas'].draw()
-
-    def refresh_graph10(self, graph):
-        """
-        Novo gráfico baseado na coluna 'Nº CR' para visualizar o 'VALOR FATURADO' e 'PREV. MEDIÇÃO'.
-        """
-        ax = graph['ax']
-        ax.clear()
-
-        # Preparar os dados, garantindo que todos os 'Nº CR' sejam contabilizados, mesmo com dados ausentes
-        cr_values = self.dataframe_cleaned['Nº CR'].unique()
-        df_grouped = self.dataframe_cleaned.groupby('Nº CR').agg({
-            'VALOR FATURADO': 'sum',
-            'PREVISÃO DE MEDIÇÃO': 'sum',
-            'GLOSA - MANUTENÇÃO': 'sum',
-            'DESC COMERCIAL': 'sum',
-            'KM EXCEDENTE': 'sum',
-            'MULTA CONTRATUAL': 'sum',
-            'AJUSTES / ACRÉCIMOS': 'sum'
-        }).reindex(cr_values, fill_value=0)  # Preenche valores ausentes com 0
-
-        # Calculando os valores de 'PREV. MEDIÇÃO'
-        val_faturado = df_grouped['VALOR FATURADO']
-        prev_medicao = (df_grouped['PREVISÃO DE MEDIÇÃO'] - df_grouped['GLOSA - MANUTENÇÃO'] - df_grouped['DESC COMERCIAL'] +
-                        df_grouped['KM EXCEDENTE'] + df_grouped['MULTA CONTRATUAL'] + df_grouped['AJUSTES / ACRÉCIMOS'])
-
-        x = np.arange(len(cr_values))  # Posição no eixo X para 'Nº CR'
-        width = 0.35  # Largura das barras
-
-        # Criar barras para o 'VALOR FATURADO' e 'PREV. MEDIÇÃO'
-        bars1 = ax.bar(x - width / 2, val_faturado, width, label='Valor Faturado', color='#003f70')
-        bars2 = ax.bar(x + width / 2, prev_medicao, width, label='Prev. Medição', color='#00afa0')
-
-        # Rótulos para as barras, rotacionados em 90º
-        for bar, value in zip(bars1, val_faturado):
-            ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'R$ {value:,.2f}', ha='center', va='bottom', rotation=90)
-        for bar, value in zip(bars2, prev_medicao):
-            ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'R$ {value:,.2f}', ha='center', va='bottom', rotation=90)
-
-        # Ajustes de labels e legendas
-        ax.set_ylabel('Valores em R$')
-        ax.set_xticks(x)
-        ax.set_xticklabels(cr_values, rotation=45, ha='right')
-        ax.legend()
-
-        # Formatadores de moeda no eixo Y
-        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f'R$ {x:,.2f}'))
-
-        graph['canvas'].draw()
-
     def create_closures_page(self, page):
+        reports_frame = ttk.Frame(page)
+        reports_frame.pack(side="top", fill="x", padx=20, pady=(10, 0))
+        ttk.Label(reports_frame, text="Relatório de fechamento de:").pack(side="left", padx=5)
+        self.closure_report_first = ttk.Combobox(reports_frame, width=8, state="readonly")
+        self.closure_report_first.pack(side="left", padx=5)
+        ttk.Label(reports_frame, text="até:").pack(side="left", padx=5)
+        self.closure_report_last = ttk.Combobox(reports_frame, width=8, state="readonly")
+        self.closure_report_last.pack(side="left", padx=5)
+        self.closure_report_layout = ttk.Combobox(reports_frame, values=list(reports.LAYOUTS.values()), width=28, state="readonly")
+        self.closure_report_layout.current(0)
+        self.closure_report_layout.pack(side="left", padx=5)
+        self.closure_reports_button = ttk.Button(reports_frame, text="Gerar Relatórios de Fechamento", command=self.export_closure_reports)
+        self.closure_reports_button.pack(side="left", padx=5)
+        self.closure_reports_status = ttk.Label(reports_frame, text="")
+        self.closure_reports_status.pack(side="left", padx=5)
+
         closure_frame = ttk.Frame(page)
         closure_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
@@ -1032,82 +1123,56 @@ class DataFrameViewer(tk.Tk):
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
     def refresh_closure_metrics(self, event=None):
-        for widget in self.card_frame.winfo_children():
-            widget.destroy()
-
-        df_filtered = self.dataframe_cleaned
-
-        total_previsao_medicao = df_filtered['PREVISÃO DE MEDIÇÃO'].sum()
-        total_valor_faturado = df_filtered['VALOR FATURADO'].sum()
-        total_glosa = df_filtered['GLOSA - MANUTENÇÃO'].sum()
-        total_desc_comercial = df_filtered['DESC COMERCIAL'].sum()
-        total_multa_contratual = df_filtered['MULTA CONTRATUAL'].sum()
-        total_km_excedente = df_filtered['KM EXCEDENTE'].sum()
-
-        valid_rows = df_filtered.dropna(subset=['MEDIÇÃO EFETUADA', 'ENVIO FAT'])
-        valid_rows = valid_rows[(pd.to_datetime(valid_rows['MEDIÇÃO EFETUADA'], dayfirst=True, errors='coerce').notna()) &
-                                (pd.to_datetime(valid_rows['ENVIO FAT'], dayfirst=True, errors='coerce').notna())]
-        valid_rows['DIFERENCA_DIAS'] = (pd.to_datetime(valid_rows['ENVIO FAT'], dayfirst=True) - pd.to_datetime(valid_rows['MEDIÇÃO EFETUADA'], dayfirst=True)).dt.days
-        media_dias_geral = valid_rows['DIFERENCA_DIAS'].mean()
-
-        total_medicoes_efetuadas = df_filtered['MEDIÇÃO EFETUADA'].dropna().count()
-        total_medicoes_a_faturar = df_filtered['ENVIO FAT'].dropna().count()
-        total_medicoes_finalizadas = df_filtered.dropna(subset=['ENVIO FAT', 'FAT MEDIÇÃO']).shape[0]
-
-        self.create_card(
-            self.card_frame, "Ano: 2024", 
-            f"Previsão de Medição: R$ {total_previsao_medicao:,.2f}    "
-            f"Valor Faturado: R$ {total_valor_faturado:,.2f}    "
-            f"Média de Dias: {media_dias_geral:.1f} dias    \n"           
-            f"Glosa: R$ {total_glosa:,.2f}    "
-            f"Desconto: R$ {total_desc_comercial:,.2f}    "
-            f"Multa: R$ {total_multa_contratual:,.2f}    "
-            f"KM Excedente: R$ {total_km_excedente:,.2f}\n"
-            f"Medições Efetuadas: {total_medicoes_efetuadas}/{df_filtered.shape[0]}    "
-            f"Medições a Faturar: {total_medicoes_a_faturar}/{df_filtered.shape[0]}    "
-            f"Medições Finalizadas: {total_medicoes_finalizadas}/{df_filtered.shape[0]}",
-            "general"
-        )
-
-        for aba_value in df_filtered['ABA'].unique():
-            aba_value_str = str(aba_value)
-            if len(aba_value_str) < 4:
+        """Recalcula as métricas dos cards em segundo plano; show_closure_metrics atualiza os cards."""
+        periods = self.periods
+        self.compute.submit('fechamentos', closure_metrics, self.dataframe_cleaned[analytics.CLOSURE_METRICS_COLUMNS], periods,
+                            on_done=lambda metrics: self.show_closure_metrics(metrics, periods),
+                            on_error=self.show_compute_error, rows=len(self.dataframe_cleaned))
+        self.closure_report_first.configure(values=self.periods)
+        self.closure_report_last.configure(values=self.periods)
+        if self.closure_report_first.get() not in self.periods and self.periods:
+            self.closure_report_first.set(self.periods[0])
+        if self.closure_report_last.get() not in self.periods and self.periods:
+            self.closure_report_last.set(self.periods[-1])
+
+    @timed('refresh_closure_metrics')
+    def show_closure_metrics(self, metrics, periods):
+        """Atualiza os cards no lugar: só muda o texto dos que mudaram e cria/remove os de meses novos/ausentes."""
+        cards = {"general": (years_label(periods), closure_card_content(metrics.loc['GERAL']))}
+        for aba_value in periods:
+            cards[aba_value] = (f"Mês {self.get_month_name(aba_value)}:", closure_card_content(metrics.loc[aba_value]))
+
+        for tag in [tag for tag in self.closure_cards if tag not in cards]:
+            self.closure_cards.pop(tag)["card"].destroy()
+            self.table_frames.pop(tag, None)
+
+        added = False
+        for tag, (title, content) in cards.items():
+            card = self.closure_cards.get(tag)
+            if card is None:
+                self.create_card(self.card_frame, title, content, tag)
+                added = True
                 continue
+            if card["title"] != title:
+                card["title_label"].configure(text=title)
+                card["title"] = title
+            if card["content"] != content:
+                card["content_label"].configure(text=self.format_content(content))
+                card["content"] = content
+            # Tabelas expandidas montadas com dados anteriores são remontadas, mantendo-se abertas
+            table_state = self.table_frames.get(tag)
+            for table_type in ("month", "open"):
+                if table_state and table_state[f"{table_type}_visible"] and table_state[f"{table_type}_version"] != self.data_version:
+                    self.show_table(tag, table_type)
+
+        if added:
+            # Reempacota na ordem dos meses (cards novos são criados no fim)
+            for tag in cards:
+                self.closure_cards[tag]["card"].pack_forget()
+            for tag in cards:
+                self.closure_cards[tag]["card"].pack(side="top", fill="x", padx=10, pady=5)
 
-            aba_df = df_filtered[df_filtered['ABA'] == aba_value]
-            mes = MESES.get(aba_value_str[-2:], 'Desconhecido')
-
-            previsao_medicao = aba_df['PREVISÃO DE MEDIÇÃO'].sum()
-            valor_faturado = aba_df['VALOR FATURADO'].sum()
-            glosa = aba_df['GLOSA - MANUTENÇÃO'].sum()
-            desc_comercial = aba_df['DESC COMERCIAL'].sum()
-            multa_contratual = aba_df['MULTA CONTRATUAL'].sum()
-            km_excedente = aba_df['KM EXCEDENTE'].sum()
-
-            valid_rows_aba = aba_df.dropna(subset=['MEDIÇÃO EFETUADA', 'ENVIO FAT'])
-            valid_rows_aba = valid_rows_aba[(pd.to_datetime(valid_rows_aba['MEDIÇÃO EFETUADA'], dayfirst=True, errors='coerce').notna()) &
-                                            (pd.to_datetime(valid_rows_aba['ENVIO FAT'], dayfirst=True, errors='coerce').notna())]
-            valid_rows_aba['DIFERENCA_DIAS'] = (pd.to_datetime(valid_rows_aba['ENVIO FAT'], dayfirst=True) - pd.to_datetime(valid_rows_aba['MEDIÇÃO EFETUADA'], dayfirst=True)).dt.days
-            media_dias_aba = valid_rows_aba['DIFERENCA_DIAS'].mean()
-
-            medicoes_efetuadas = aba_df['MEDIÇÃO EFETUADA'].dropna().count()
-            medicoes_a_faturar = aba_df['ENVIO FAT'].dropna().count()
-            medicoes_finalizadas = aba_df.dropna(subset=['ENVIO FAT', 'FAT MEDIÇÃO']).shape[0]
-
-            self.create_card(
-                self.card_frame, f"Mês {mes}:", 
-                f"Previsão de Medição: R$ {previsao_medicao:,.2f}    "
-                f"Valor Faturado: R$ {valor_faturado:,.2f}    "
-                f"Média de Dias: {media_dias_aba:.1f} dias    \n"
-                f"Glosa: R$ {glosa:,.2f}    "
-                f"Desconto: R$ {desc_comercial:,.2f}    "
-                f"Multa: R$ {multa_contratual:,.2f}    "
-                f"KM Excedente: R$ {km_excedente:,.2f}\n"                
-                f"Medições Efetuadas: {medicoes_efetuadas}/{aba_df.shape[0]}    "
-                f"Medições a Faturar: {medicoes_a_faturar}/{aba_df.shape[0]}    "
-                f"Medições Finalizadas: {medicoes_finalizadas}/{aba_df.shape[0]}",
-                aba_value
-            )
+        self.update_scrollregion()
 
     def create_card(self, parent, title, content, tag):
         card = ttk.Frame(parent, relief="raise", borderwidth=2)
@@ -1134,6 +1199,10 @@ class DataFrameViewer(tk.Tk):
                 "card": card,
                 "month_frame": None,
                 "open_frame": None,
+                "month_visible": False,
+                "open_visible": False,
+                "month_version": None,
+                "open_version": None,
                 "extract_report_button": extract_report_button
             }
 
@@ -1142,7 +1211,13 @@ class DataFrameViewer(tk.Tk):
         content_label = ttk.Label(card, text=self.format_content(content), font=("Roboto Mono", 10), anchor="center", justify="center")
         content_label.pack(side="top", padx=10, pady=5, fill="x")
 
-        self.update_scrollregion()
+        self.closure_cards[tag] = {
+            "card": card,
+            "title_label": title_label,
+            "content_label": content_label,
+            "title": title,
+            "content": content
+        }
 
     def format_content(self, content):
         lines = content.split('\n')
@@ -1156,27 +1231,29 @@ class DataFrameViewer(tk.Tk):
 
         return formatted_content
 
+    @timed('acao:expandir_tabela')
     def toggle_table(self, tag, table_type):
-        table_frame_key = f"{table_type}_frame"
-        if self.table_frames[tag][table_frame_key] is None:
-            self.show_table(tag, table_type, table_frame_key)
+        if self.table_frames[tag][f"{table_type}_visible"]:
+            self.hide_table(tag, table_type)
         else:
-            self.hide_table(tag, table_type, table_frame_key)
+            self.show_table(tag, table_type)
         self.update_scrollregion()
         self.update_extract_report_button(tag)
 
-    def show_table(self, tag, table_type, table_frame_key):
-        data = self.dataframe_cleaned[self.dataframe_cleaned['ABA'] == tag]
-        if table_type == "open":
-            data = data[data['ENVIO FAT'].isna() | data['FAT MEDIÇÃO'].isna()]
+    def show_table(self, tag, table_type):
+        table_frame_key = f"{table_type}_frame"
+        table_frame = self.table_frames[tag][table_frame_key]
 
-        columns = [
-            "CLIENTE", "Nº MEDIÇÃO", "FECH. CONT.", "MEDIÇÃO EFETUADA",
-            "APROV CLIENTE", "ENVIO FAT", "FAT MEDIÇÃO", "VALOR FATURADO", "PREVISÃO DE MEDIÇÃO",
-            "RESP MEDIÇÃO", "SITUAÇÃO MED."
-        ]
+        # Tabela já montada com os dados atuais: só volta a ser exibida
+        if table_frame is not None and self.table_frames[tag][f"{table_type}_version"] == self.data_version:
+            table_frame.pack(side="top", fill="x", padx=10, pady=10, expand=True)
+            self.table_frames[tag][f"{table_type}_visible"] = True
+            return
+        if table_frame is not None:
+            table_frame.destroy()
 
-        column_widths = [500, 80, 80, 70, 70, 70, 70, 90, 90, 90, 90]
+        rows = self.cached(('closure_rows', tag, table_type), lambda: list(
+            display_frame(self.period_slice(tag, table_type)[CLOSURE_TABLE_COLUMNS]).itertuples(index=False, name=None)))
 
         table_frame = ttk.Frame(self.table_frames[tag]["card"])
         table_frame.pack(side="top", fill="x", padx=10, pady=10, expand=True)
@@ -1191,33 +1268,36 @@ class DataFrameViewer(tk.Tk):
         tree_scroll_x = ttk.Scrollbar(table_frame, orient="horizontal")
         tree_scroll_x.pack(side="bottom", fill="x")
 
-        treeview = ttk.Treeview(table_frame, columns=columns, yscrollcommand=tree_scroll_y.set, xscrollcommand=tree_scroll_x.set, show="headings")
+        treeview = ttk.Treeview(table_frame, columns=CLOSURE_TABLE_COLUMNS, yscrollcommand=tree_scroll_y.set, xscrollcommand=tree_scroll_x.set, show="headings")
         treeview.pack(expand=True, fill="both")
 
         tree_scroll_y.config(command=treeview.yview)
         tree_scroll_x.config(command=treeview.xview)
 
-        for col, width in zip(columns, column_widths):
+        for col, width in zip(CLOSURE_TABLE_COLUMNS, CLOSURE_TABLE_WIDTHS):
             treeview.heading(col, text=col, anchor="w")
             treeview.column(col, width=width, anchor="w")
 
-        for _, row in data.iterrows():
-            values = [row[col] for col in columns]
+        for values in rows:
             treeview.insert("", "end", values=values)
 
         self.table_frames[tag][table_frame_key] = table_frame
+        self.table_frames[tag][f"{table_type}_version"] = self.data_version
+        self.table_frames[tag][f"{table_type}_visible"] = True
 
-    def hide_table(self, tag, table_type, table_frame_key):
-        if self.table_frames[tag][table_frame_key] is not None:
-            self.table_frames[tag][table_frame_key].destroy()
-            self.table_frames[tag][table_frame_key] = None
+    def hide_table(self, tag, table_type):
+        # A tabela é só ocultada; reexpandir não precisa montá-la de novo
+        table_frame = self.table_frames[tag][f"{table_type}_frame"]
+        if table_frame is not None:
+            table_frame.pack_forget()
+        self.table_frames[tag][f"{table_type}_visible"] = False
 
     def update_scrollregion(self):
         self.card_frame.update_idletasks()
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
     def update_extract_report_button(self, tag):
-        if self.table_frames[tag]["month_frame"] or self.table_frames[tag]["open_frame"]:
+        if self.table_frames[tag]["month_visible"] or self.table_frames[tag]["open_visible"]:
             self.table_frames[tag]["extract_report_button"].pack(side="right")
         else:
             self.table_frames[tag]["extract_report_button"].pack_forget()
@@ -1226,10 +1306,10 @@ class DataFrameViewer(tk.Tk):
         month_data = None
         open_data = None
 
-        if self.table_frames[tag]["month_frame"]:
-            month_data = self.dataframe_cleaned[self.dataframe_cleaned['ABA'] == tag]
-        if self.table_frames[tag]["open_frame"]:
-            open_data = self.dataframe_cleaned[(self.dataframe_cleaned['ABA'] == tag) & (self.dataframe_cleaned['ENVIO FAT'].isna() | self.dataframe_cleaned['FAT MEDIÇÃO'].isna())]
+        if self.table_frames[tag]["month_visible"]:
+            month_data = self.period_slice(tag, "month")
+        if self.table_frames[tag]["open_visible"]:
+            open_data = self.period_slice(tag, "open")
 
         if month_data is None and open_data is None:
             messagebox.showwarning("Aviso", "Nenhum relatório a ser extraído.")
@@ -1239,42 +1319,71 @@ class DataFrameViewer(tk.Tk):
         current_time = now.strftime("%d-%m-%Y_%H-%M-%S")
         file_path = f"C:/Users/{os.getlogin()}/Desktop/Relatório Parcial ({self.get_month_name(tag)}) {current_time}.xlsx"
 
-        with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
+        with excel_writer(file_path, engine='xlsxwriter') as writer:
             if month_data is not None:
-                month_data.to_excel(writer, sheet_name='Relatório Mensal', index=False)
+                write_excel_sheet(month_data, writer, 'Relatório Mensal')
             if open_data is not None:
-                open_data.to_excel(writer, sheet_name='Relatório Abertos', index=False)
+                write_excel_sheet(open_data, writer, 'Relatório Abertos')
 
         messagebox.showinfo("Extrair Relatório(s)", f"Relatório(s) extraído(s) com sucesso para {file_path}")
 
+    def export_closure_reports(self):
+        """Gera os relatórios de fechamento dos meses escolhidos (reports.py) numa thread, que distribui
+        os arquivos entre processos; as linhas de cada mês saem do cache por ABA."""
+        if str(self.closure_reports_button['state']) == 'disabled':
+            return
+        periods = reports.select_periods(self.periods, self.closure_report_first.get() or None,
+                                         self.closure_report_last.get() or None)
+        if not periods:
+            messagebox.showwarning("Aviso", "Nenhum mês no intervalo escolhido.")
+            return
+        layout = list(reports.LAYOUTS)[self.closure_report_layout.current()]
+        base_name = f"FECHAMENTO_{datetime.now().strftime('%d.%m.%Y_%H-%M-%S')}"
+        output_dir = os.path.join(default_export_dir(), base_name).replace('\\', '/')
+        slices = {aba: self.period_slice(aba, "month") for aba in periods}
+        dataframe, verification = self.dataframe_cleaned, self.verification_dataframe
+        state = {'done': 0, 'total': None, 'paths': None, 'error': None}
+
+        def progress(done, total, path):
+            state['done'], state['total'] = done, total
+
+        def build():
+            try:
+                state['paths'] = reports.build_closure_reports(dataframe, verification, periods, layout, output_dir,
+                                                               base_name='FECHAMENTO', slices=slices.get, progress=progress)
+            except Exception as e:  # Informada na thread da interface
+                state['error'] = e
+
+        start = time.perf_counter()
+        thread = threading.Thread(target=build, name='closure-reports', daemon=True)
+        self.closure_reports_button.state(['disabled'])
+        self.closure_reports_status.configure(text="Preparando os relatórios...")
+        thread.start()
+
+        def poll():
+            if thread.is_alive():
+                if state['total']:
+                    self.closure_reports_status.configure(text=f"Arquivos: {state['done']}/{state['total']}")
+                self.after(CLOSURE_REPORTS_POLL_MS, poll)
+                return
+            self.closure_reports_button.state(['!disabled'])
+            self.closure_reports_status.configure(text="")
+            if state['error'] is not None:
+                messagebox.showerror("Erro", f"Erro ao gerar os relatórios de fechamento: {state['error']}")
+                return
+            instrumentation.record('acao:relatorios_fechamento', time.perf_counter() - start,
+                                   rows=len(dataframe), months=len(periods), files=len(state['paths']))
+            messagebox.showinfo("Relatórios de fechamento", f"{len(state['paths'])} arquivo(s) gravado(s) em:\n{output_dir}")
+
+        self.after(CLOSURE_REPORTS_POLL_MS, poll)
+
     def get_month_name(self, aba_value):
-        aba_value_str = str(aba_value)
-        return MESES.get(aba_value_str[-2:], 'Desconhecido')
+        return period_label(aba_value, with_year=spans_multiple_years(self.periods))
 
     def refresh_graphs(self):
         for graph in self.graphs:
-            # Executar o método de refresh para cada gráfico individualmente
-            if graph['title'] == "Valores de Medição / Faturamento":
-                self.refresh_graph1(graph)
-            elif graph['title'] == "Clientes com Medição Aberta/Fechada por Mês":
-                self.refresh_graph2(graph)
-            elif graph['title'] == "Contagem de RESP MEDIÇÃO por Mês":
-                self.refresh_graph3(graph)
-            elif graph['title'] == "Novos Clientes vs Clientes Finalizados por Mês":
-                self.refresh_graph4(graph)
-            elif graph['title'] == "Total de Carros Locados por Mês":
-                self.refresh_graph5(graph)
-            elif graph['title'] == "Diferença Faturamento/Medição":
-                self.refresh_graph6(graph)
-            elif graph['title'] == "Contagem de Situação por ABA":
-                self.refresh_graph7(graph)
-            elif graph['title'] == "Contagem de Situação por PESSOA":
-                self.refresh_graph8(graph)
-            elif graph['title'] == "Valores Variáveis":
-                self.refresh_graph9(graph)
-
-            # Redesenhar o gráfico atualizado
-            graph['canvas'].draw()
+            # Executar o método de refresh para cada gráfico individualmente (já redesenha o canvas)
+            self.refresh_graph(graph)
 
     def create_trainings_page(self, page):
         self.trainings_frame = ttk.Frame(page)
@@ -1314,6 +1423,7 @@ class DataFrameViewer(tk.Tk):
         open_button.pack(side="right", padx=10, pady=5)
 
     def open_file(self, file_path):
+        import webbrowser
         webbrowser.open(f'file://{file_path}')
 
     def create_comparison_page(self, page):
@@ -1322,19 +1432,17 @@ class DataFrameViewer(tk.Tk):
         comparison_frame = ttk.Frame(page)
         comparison_frame.pack(fill="x", padx=10, pady=10)
 
-        months = self.dataframe_cleaned['ABA'].unique().tolist()
-
         self.month1_var = tk.StringVar()
         self.month2_var = tk.StringVar()
 
         ttk.Label(comparison_frame, text="Mês 1:").grid(row=0, column=0, padx=5, pady=5, sticky="e")
         self.month1_select = AutocompleteCombobox(comparison_frame, textvariable=self.month1_var, width=55)
-        self.month1_select.set_completion_list(months)
+        self.month1_select.set_completion_list(self.periods)
         self.month1_select.grid(row=0, column=1, padx=5, pady=5, sticky="w")
 
         ttk.Label(comparison_frame, text="Mês 2:").grid(row=0, column=2, padx=5, pady=5, sticky="e")
         self.month2_select = AutocompleteCombobox(comparison_frame, textvariable=self.month2_var, width=55)
-        self.month2_select.set_completion_list(months)
+        self.month2_select.set_completion_list(self.periods)
         self.month2_select.grid(row=0, column=3, padx=5, pady=5, sticky="w")
 
         compare_button = ttk.Button(comparison_frame, text="Comparar", command=self.compare_months)
@@ -1343,11 +1451,16 @@ class DataFrameViewer(tk.Tk):
         self.comparison_treeview = ttk.Treeview(page, show="headings")
         self.comparison_treeview.pack(fill="both", expand=True, padx=10, pady=10)
 
-        export_button = ttk.Button(page, text="Exportar Comparação", command=self.export_comparison)
-        export_button.pack(fill="x", padx=10, pady=10)
+        export_frame = ttk.Frame(page)
+        export_frame.pack(fill="x", padx=10, pady=10)
+
+        self.create_export_format_selector(export_frame).pack(side="right", padx=5)
+        ttk.Label(export_frame, text="Formato:").pack(side="right", padx=5)
+
+        export_button = ttk.Button(export_frame, text="Exportar Comparação", command=self.export_comparison)
+        export_button.pack(side="left", fill="x", expand=True)
 
     def compare_months(self):
-        epsilon = 0.05  # Margem de erro para desconsiderar variações de até 1 centavo
         month1 = self.month1_var.get().strip()
         month2 = self.month2_var.get().strip()
 
@@ -1355,89 +1468,13 @@ class DataFrameViewer(tk.Tk):
             messagebox.showwarning("Aviso", "Por favor, preencha os dois meses para a comparação.")
             return
 
-        df_mes1 = self.dataframe_cleaned[self.dataframe_cleaned['ABA'] == month1].copy()
-        df_mes2 = self.dataframe_cleaned[self.dataframe_cleaned['ABA'] == month2].copy()
-
-        if df_mes1.empty:
-            messagebox.showerror("Erro", f"Não foram encontrados dados para o mês {month1}.")
-            return
-        if df_mes2.empty:
-            messagebox.showerror("Erro", f"Não foram encontrados dados para o mês {month2}.")
-            return
-
-        df_mes1['Código'] = df_mes1['Nº MEDIÇÃO'].apply(lambda x: x.split('-')[0])
-        df_mes2['Código'] = df_mes2['Nº MEDIÇÃO'].apply(lambda x: x.split('-')[0])
-
-        colunas_comparar = [
-            'PREVISÃO DE MEDIÇÃO', 'GLOSA - MANUTENÇÃO', 'DESC COMERCIAL', 
-            'KM EXCEDENTE', 'MULTA CONTRATUAL', 'AJUSTES / ACRÉCIMOS',
-            'QTDE LOCADOS', 'QTDE RESERVA'
-        ]
-
-        resultados = []
-
-        codigos = set(df_mes1['Código'].unique()).union(set(df_mes2['Código'].unique()))
-
-        for codigo in codigos:
-            linha_mes1 = df_mes1[df_mes1['Código'] == codigo].iloc[0] if codigo in df_mes1['Código'].values else None
-            linha_mes2 = df_mes2[df_mes2['Código'] == codigo].iloc[0] if codigo in df_mes2['Código'].values else None
-
-            if linha_mes1 is None:
-                diff = {'ABA': month2, 'CLIENTE': linha_mes2['CLIENTE'], 'Nº MEDIÇÃO': codigo}
-                for coluna in colunas_comparar:
-                    diff[coluna] = -pd.Series(linha_mes2[coluna]).fillna(0).values[0]
-                diff['Valor Diferença'] = (
-                    -pd.Series(linha_mes2['PREVISÃO DE MEDIÇÃO']).fillna(0).values[0]
-                    - pd.Series(linha_mes2['GLOSA - MANUTENÇÃO']).fillna(0).values[0]
-                    - pd.Series(linha_mes2['DESC COMERCIAL']).fillna(0).values[0]
-                    + pd.Series(linha_mes2['KM EXCEDENTE']).fillna(0).values[0]
-                    + pd.Series(linha_mes2['MULTA CONTRATUAL']).fillna(0).values[0]
-                    + pd.Series(linha_mes2['AJUSTES / ACRÉCIMOS']).fillna(0).values[0]
-                )
-            elif linha_mes2 is None:
-                diff = {'ABA': month1, 'CLIENTE': linha_mes1['CLIENTE'], 'Nº MEDIÇÃO': codigo}
-                for coluna in colunas_comparar:
-                    diff[coluna] = pd.Series(linha_mes1[coluna]).fillna(0).values[0]
-                diff['Valor Diferença'] = (
-                    pd.Series(linha_mes1['PREVISÃO DE MEDIÇÃO']).fillna(0).values[0]
-                    - pd.Series(linha_mes1['GLOSA - MANUTENÇÃO']).fillna(0).values[0]
-                    - pd.Series(linha_mes1['DESC COMERCIAL']).fillna(0).values[0]
-                    + pd.Series(linha_mes1['KM EXCEDENTE']).fillna(0).values[0]
-                    + pd.Series(linha_mes1['MULTA CONTRATUAL']).fillna(0).values[0]
-                    + pd.Series(linha_mes1['AJUSTES / ACRÉCIMOS']).fillna(0).values[0]
-                )
-            else:
-                diff = {
-                    'ABA': f"{month1} vs {month2}", 'CLIENTE': linha_mes1['CLIENTE'], 'Nº MEDIÇÃO': codigo
-                }
-                for coluna in colunas_comparar:
-                    diff[coluna] = (
-                        pd.Series(linha_mes2[coluna]).fillna(0).values[0] - 
-                        pd.Series(linha_mes1[coluna]).fillna(0).values[0]
-                    )
-                diff['Valor Diferença'] = (
-                    (pd.Series(linha_mes2['PREVISÃO DE MEDIÇÃO']).fillna(0).values[0] - pd.Series(linha_mes1['PREVISÃO DE MEDIÇÃO']).fillna(0).values[0]) 
-                    - (pd.Series(linha_mes2['GLOSA - MANUTENÇÃO']).fillna(0).values[0] - pd.Series(linha_mes1['GLOSA - MANUTENÇÃO']).fillna(0).values[0])
-                    - (pd.Series(linha_mes2['DESC COMERCIAL']).fillna(0).values[0] - pd.Series(linha_mes1['DESC COMERCIAL']).fillna(0).values[0])
-                    + (pd.Series(linha_mes2['KM EXCEDENTE']).fillna(0).values[0] - pd.Series(linha_mes1['KM EXCEDENTE']).fillna(0).values[0])
-                    + (pd.Series(linha_mes2['MULTA CONTRATUAL']).fillna(0).values[0] - pd.Series(linha_mes1['MULTA CONTRATUAL']).fillna(0).values[0])
-                    + (pd.Series(linha_mes2['AJUSTES / ACRÉCIMOS']).fillna(0).values[0] - pd.Series(linha_mes1['AJUSTES / ACRÉCIMOS']).fillna(0).values[0])
-                )
-                
-            # Aplicar margem de erro
-            diff['Valor Diferença'] = 0 if abs(diff['Valor Diferença']) <= epsilon else diff['Valor Diferença']
-
-            resultados.append(diff)
-
-        df_resultados = pd.DataFrame(resultados)
-
-        df_resultados = df_resultados.round(2)
-        df_resultados = df_resultados.loc[:, (df_resultados != 0).any(axis=0)]
-
-        colunas_final = ['ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'Valor Diferença'] + colunas_comparar
-        colunas_disponiveis = [col for col in colunas_final if col in df_resultados.columns]
-        df_resultados = df_resultados[colunas_disponiveis]
+        # Só as linhas dos dois meses vão para o processo; uma nova comparação substitui a em andamento
+        rows = self.dataframe_cleaned[self.dataframe_cleaned['ABA'].isin([month1, month2])]
+        self.compute.submit('comparacao', analytics.compare_months, rows, month1, month2,
+                            on_done=self.show_comparison, on_error=self.show_compute_error, rows=len(rows))
 
+    @timed('acao:comparar_meses')
+    def show_comparison(self, df_resultados):
         self.df_resultados = df_resultados
 
         self.populate_comparison_treeview(df_resultados)
@@ -1458,10 +1495,8 @@ class DataFrameViewer(tk.Tk):
 
         now = datetime.now()
         current_time = now.strftime("%d-%m-%Y_%H-%M-%S")
-        file_path = f"C:/Users/{os.getlogin()}/Desktop/Comparação_Meses_{current_time}.xlsx"
-
-        self.df_resultados.to_excel(file_path, index=False)
-        messagebox.showinfo("Exportar Comparação", f"Comparação exportada com sucesso para {file_path}")
+        self.export_view(self.df_resultados, f"Comparação_Meses_{current_time}",
+                         "Exportar Comparação", "Comparação exportada com sucesso para {}")
 
     def create_verification_page(self, page):
         """Cria a aba de Verificação de Faturamento com funcionalidades de filtro, ordenação e exportação."""
@@ -1469,16 +1504,6 @@ class DataFrameViewer(tk.Tk):
         self.create_verification_buttons(page)
         self.create_verification_treeview(page)
 
-    def sort_status_column(self, col):
-        """Ordena a Treeview com base na coluna especificada."""
-        try:
-            data = [(self.status_treeview.set(child, col), child) for child in self.status_treeview.get_children("")]
-            data.sort(reverse=False)
-            for i, (_, child) in enumerate(data):
-                self.status_treeview.move(child, "", i)
-        except Exception as e:
-            print(f"Erro ao ordenar a coluna {col}: {e}")
-
     def create_verification_buttons(self, page):
         button_frame = ttk.Frame(page)
         button_frame.pack(side="top", fill="x", padx=10, pady=5)
@@ -1486,6 +1511,9 @@ class DataFrameViewer(tk.Tk):
         generate_report_button = ttk.Button(button_frame, text="Gerar Relatório de Verificação", command=self.generate_verification_report)
         generate_report_button.pack(side="left", padx=5, pady=5)
 
+        ttk.Label(button_frame, text="Formato:").pack(side="left", padx=5, pady=5)
+        self.create_export_format_selector(button_frame).pack(side="left", padx=5, pady=5)
+
     def create_verification_treeview(self, page):
         tree_frame = ttk.Frame(page)
         tree_frame.pack(fill="both", expand=True)
@@ -1559,68 +1587,8 @@ class DataFrameViewer(tk.Tk):
 
         now = datetime.now()
         current_time = now.strftime("%d-%m-%Y_%H-%M-%S")
-        file_path = f"C:/Users/{os.getlogin()}/Desktop/Relatório_de_Verificação_{current_time}.xlsx"
-
-        self.verification_dataframe.to_excel(file_path, index=False)
-        messagebox.showinfo("Relatório de Verificação", f"Relatório de verificação gerado com sucesso para {file_path}")
-
-    def create_status_tracking_page(self, page):
-        """Cria a aba de acompanhamento de status de clientes por mês."""
-        self.create_title(page, "Acompanhamento de Status de Clientes por Mês")
-
-        # Criação da matriz (nmed|cliente | 2401 | 2402 | ... | 2412)
-        matrix_frame = ttk.Frame(page)
-        matrix_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        # Gerar a matriz de status
-        status_matrix = self.generate_status_matrix()
-        columns = ['Nº Medição', 'Cliente'] + [f'24{str(i).zfill(2)}' for i in range(1, 13)]
-
-        # Exibir a matriz de status em uma Treeview
-        tree_scroll_y = ttk.Scrollbar(matrix_frame, orient="vertical")
-        tree_scroll_y.pack(side="right", fill="y")
-
-        tree_scroll_x = ttk.Scrollbar(matrix_frame, orient="horizontal")
-        tree_scroll_x.pack(side="bottom", fill="x")
-
-        self.status_treeview = ttk.Treeview(matrix_frame, columns=columns, yscrollcommand=tree_scroll_y.set, xscrollcommand=tree_scroll_x.set, show="headings")
-        self.status_treeview.pack(expand=True, fill="both")
-
-        tree_scroll_y.config(command=self.status_treeview.yview)
-        tree_scroll_x.config(command=self.status_treeview.xview)
-
-        # Ajustar as larguras das colunas
-        self.status_treeview.column('Nº Medição', width=100, anchor=tk.W)  # Coluna dos 4 dígitos
-        self.status_treeview.column('Cliente', width=300, anchor=tk.W)  # Coluna do cliente
-        for col in columns[2:]:
-            self.status_treeview.column(col, width=50, anchor=tk.W)  # Cada mês com largura 50
-
-        for col in columns:
-            self.status_treeview.heading(col, text=col, anchor=tk.W)
-
-        # Definir a tag para o status "P" com a cor desejada
-        self.status_treeview.tag_configure('pendente', background='#FFFF99')  # Definir a cor de fundo amarela
-
-        for row in status_matrix:
-            # Inserir a linha na Treeview e obter o row_id para referência
-            row_id = self.status_treeview.insert("", "end", values=row)
-            
-            # Iterar por cada valor na linha para identificar o status "P"
-            for col_index, value in enumerate(row):
-                if value == 'P':
-                    # Aplique a tag 'pendente' ao valor 'P'
-                    self.status_treeview.tag_configure('pendente', background='#FFFF99')  # Cor amarela para "P"
-                    # Tag para a célula específica na coluna que contém "P"
-                    self.status_treeview.item(row_id, tags=('pendente',))
-
-        # Definir uma cor diferente para as linhas alternadas
-        self.status_treeview.tag_configure('evenrow', background='#f2f2f2')
-        self.status_treeview.tag_configure('oddrow', background='white')
-        for index, item in enumerate(self.status_treeview.get_children()):
-            if index % 2 == 0:
-                self.status_treeview.item(item, tags=('evenrow',))
-            else:
-                self.status_treeview.item(item, tags=('oddrow',))
+        self.export_view(self.verification_dataframe, f"Relatório_de_Verificação_{current_time}",
+                         "Relatório de Verificação", "Relatório de verificação gerado com sucesso para {}")
 
     def create_status_tracking_page(self, page):
         """Cria a aba de acompanhamento de status de clientes por mês."""
@@ -1650,256 +1618,147 @@ class DataFrameViewer(tk.Tk):
         # Botão de extração da tabela
         self.export_button = ttk.Button(filter_frame, text="Exportar Tabela", command=self.export_status_table)
         self.export_button.pack(side="right", padx=10)
+        self.create_export_format_selector(filter_frame).pack(side="right", padx=5)
+
+        # Legenda das cores das células de mês
+        legend_frame = ttk.Frame(page)
+        legend_frame.pack(side="top", fill="x", padx=10)
+        for letter, color in status_grid.STATUS_COLORS.items():
+            tk.Label(legend_frame, text=f" {letter} = {status_grid.STATUS_NAMES[letter]} ", background=color).pack(side="left", padx=2)
+
+        # Matriz de status (Nº Medição, Cliente e RESP MEDIÇÃO fixos; um mês por coluna)
+        columns = analytics.status_matrix_columns(self.periods)
+        self.status_matrix_df = pd.DataFrame(columns=columns)
+
+        self.status_grid = status_grid.StatusGrid(page, columns, self.status_column_widths(columns), frozen=3)
+        self.status_grid.pack(fill="both", expand=True, padx=10, pady=10)
+        self.request_status_matrix(self.show_status_matrix)
+
+    def status_column_widths(self, columns):
+        fixed = {'Nº Medição': 100, 'Cliente': 300, 'RESP MEDIÇÃO': 150}
+        return [fixed.get(col, 50) for col in columns]
+
+    def request_status_matrix(self, show):
+        """Chama show(matriz, meses) com a matriz de status completa, tirada do ClientLifecycle da
+        carga (client_lifecycle): na hora, se ele já foi montado (ex.: pelo gráfico 4), ou quando o
+        processo de cálculo terminar de montá-lo; o resultado vai para o mesmo cache."""
+        if self.cache_version == self.data_version and 'client_lifecycle' in self.data_cache:
+            show(self.data_cache['client_lifecycle'].status_matrix(), self.periods)
+            return
+        version, periods = self.data_version, self.periods
 
-        # Criação da matriz de status
-        matrix_frame = ttk.Frame(page)
-        matrix_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        # Gerar a matriz de status com a nova coluna "RESP MEDIÇÃO"
-        status_matrix = self.generate_status_matrix_with_resp_medicao()
-        columns = ['Nº Medição', 'Cliente', 'RESP MEDIÇÃO'] + [f'24{str(i).zfill(2)}' for i in range(1, 13)]
-
-        # Exibir a matriz de status em uma Treeview
-        tree_scroll_y = ttk.Scrollbar(matrix_frame, orient="vertical")
-        tree_scroll_y.pack(side="right", fill="y")
+        def done(client_lifecycle):
+            if version == self.data_version:
+                self.cached('client_lifecycle', lambda: client_lifecycle)
+            show(client_lifecycle.status_matrix(), periods)
 
-        tree_scroll_x = ttk.Scrollbar(matrix_frame, orient="horizontal")
-        tree_scroll_x.pack(side="bottom", fill="x")
+        self.compute.submit('status', ClientLifecycle, self.dataframe_cleaned[LIFECYCLE_COLUMNS], periods,
+                            on_done=done, on_error=self.show_compute_error, rows=len(self.dataframe_cleaned))
 
-        self.status_treeview = ttk.Treeview(matrix_frame, columns=columns, yscrollcommand=tree_scroll_y.set, xscrollcommand=tree_scroll_x.set, show="headings")
-        self.status_treeview.pack(expand=True, fill="both")
-
-        tree_scroll_y.config(command=self.status_treeview.yview)
-        tree_scroll_x.config(command=self.status_treeview.xview)
-
-        # Ajustar as larguras das colunas
-        self.status_treeview.column('Nº Medição', width=100, anchor=tk.W)  # Coluna dos 4 dígitos
-        self.status_treeview.column('Cliente', width=300, anchor=tk.W)  # Coluna do cliente
-        self.status_treeview.column('RESP MEDIÇÃO', width=150, anchor=tk.W)  # Coluna "RESP MEDIÇÃO"
-        for col in columns[3:]:
-            self.status_treeview.column(col, width=50, anchor=tk.W)  # Cada mês com largura 50
-
-        for col in columns:
-            # Adiciona o evento de clique no cabeçalho para ordenar a coluna correspondente
-            self.status_treeview.heading(col, text=col, anchor=tk.W, command=lambda c=col: self.sort_status_column(c))
-
-        # Inserir os valores e aplicar as tags de coloração
-        for row in status_matrix:
-            # Inserir a linha na Treeview
-            row_id = self.status_treeview.insert("", "end", values=row)
-
-            # Aplicar as tags de coloração baseadas nos status
-            if 'P' in row:
-                self.status_treeview.item(row_id, tags=('pendente',))
-            if 'X' in row:
-                self.status_treeview.item(row_id, tags=('encerrado',))
-
-        # Definir as tags para as cores
-        self.status_treeview.tag_configure('pendente', background='#FFCCCC')  # Vermelho claro para linhas com "P".
-        self.status_treeview.tag_configure('encerrado', background='#D3D3D3')  # Cinza para linhas com "X".
-
-        # Definir uma cor diferente para as linhas alternadas
-        self.status_treeview.tag_configure('evenrow', background='#f2f2f2')
-        self.status_treeview.tag_configure('oddrow', background='white')
-        for index, item in enumerate(self.status_treeview.get_children()):
-            if index % 2 == 0:
-                self.status_treeview.item(item, tags=('evenrow',))
-            else:
-                self.status_treeview.item(item, tags=('oddrow',))
-
-    def generate_status_matrix_with_resp_medicao(self):
-        """Gera a matriz de status com a coluna 'RESP MEDIÇÃO' baseada no dataframe de controle."""
-        # Selecionar colunas relevantes
-        df_status = self.dataframe_cleaned[['CLIENTE', 'ABA', 'STATUS', 'Nº MEDIÇÃO', 'RESP MEDIÇÃO']].copy()
-        df_status = df_status.dropna(subset=['CLIENTE', 'ABA', 'STATUS', 'Nº MEDIÇÃO'])
-
-        # Gerar lista de clientes únicos
-        clientes = df_status['CLIENTE'].unique().tolist()
-        meses = [f'24{str(i).zfill(2)}' for i in range(1, 13)]
-
-        # Inicializar a matriz
-        status_matrix = []
-
-        for cliente in clientes:
-            cliente_row = []
-            cliente_data = df_status[df_status['CLIENTE'] == cliente]
-
-            # Obter os 4 primeiros dígitos da primeira ocorrência de 'Nº MEDIÇÃO'
-            n_medicao = cliente_data['Nº MEDIÇÃO'].iloc[0].split('-')[0][:4]
-
-            # Adicionar o código de medição e o nome do cliente
-            cliente_row.append(n_medicao)  # Nova coluna com os 4 primeiros dígitos
-            cliente_row.append(cliente)
-
-            # Obter o responsável pela medição mais recente para o mês atual
-            resp_medicao = ""
-            for mes in meses[::-1]:
-                mes_data = cliente_data[cliente_data['ABA'] == mes]
-                if not mes_data.empty:
-                    resp_medicao = mes_data['RESP MEDIÇÃO'].iloc[0]
-                    break
-
-            # Adicionar a coluna "RESP MEDIÇÃO"
-            cliente_row.append(resp_medicao)
-
-            cliente_status = {str(aba): status for aba, status in zip(cliente_data['ABA'], cliente_data['STATUS'])}
-
-            ultimo_status = None
-            primeiro_pendente = False  # Indica se o primeiro P já foi encontrado
-
-            for mes in meses:
-                if mes in cliente_status:
-                    status_atual = cliente_status[mes].strip().upper()
-
-                    if status_atual in ['ATIVO', 'AG. FAT.', 'PARCIAL']:
-                        cliente_row.append('A')  # Aberto (Ativo)
-                        ultimo_status = 'A'
-                    elif status_atual == 'FINALIZADO':
-                        cliente_row.append('F')  # Fechado (Finalizado)
-                        ultimo_status = 'F'
-                    else:
-                        cliente_row.append('O')  # Outros status, mapeados como "O"
-                        ultimo_status = 'O'
-                else:
-                    if ultimo_status == 'A' and not primeiro_pendente:
-                        cliente_row.append('P')  # Pendente
-                        primeiro_pendente = True
-                        ultimo_status = 'P'
-                    elif ultimo_status == 'F':
-                        cliente_row.append('X')  # Inativo após Fechado (Finalizado)
-                    elif primeiro_pendente:
-                        cliente_row.append('')  # Vazio após o primeiro P
-                    else:
-                        cliente_row.append('')  # Nenhum status conhecido antes de P
-
-            status_matrix.append(cliente_row)
-
-        return status_matrix
+    @timed('status_matrix')
+    def show_status_matrix(self, matrix, periods):
+        columns = analytics.status_matrix_columns(periods)
+        self.status_matrix_df = pd.DataFrame(matrix, columns=columns)
+        if columns != self.status_grid.columns:
+            self.status_grid.set_columns(columns, self.status_column_widths(columns), frozen=3)
+        self.status_grid.set_rows(matrix)
 
     def export_status_table(self):
-        """Exporta a tabela de acompanhamento de status para um arquivo Excel."""
-        # Criar um dataframe com as colunas e linhas da Treeview
-        columns = [self.status_treeview.heading(col)["text"] for col in self.status_treeview["columns"]]
-        data = [self.status_treeview.item(item)["values"] for item in self.status_treeview.get_children()]
-
-        df_export = pd.DataFrame(data, columns=columns)
-
+        """Exporta a matriz de status exibida (já filtrada) no formato selecionado."""
         # Gerar o nome do arquivo com data e hora
         now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        file_path = f"C:/Users/{os.getlogin()}/Desktop/Acomp_Status_Abertos_{now}.xlsx"
-
-        # Salvar o dataframe em um arquivo Excel
-        df_export.to_excel(file_path, index=False)
-        messagebox.showinfo("Exportar Tabela", f"Tabela exportada com sucesso para {file_path}")
-
+        self.export_view(self.status_matrix_df, f"Acomp_Status_Abertos_{now}",
+                         "Exportar Tabela", "Tabela exportada com sucesso para {}")
 
-    def populate_status_treeview(self, matrix):
-        """Popula a Treeview com os dados da matriz filtrada."""
-        # Limpar a Treeview antes de popular novamente
-        self.status_treeview.delete(*self.status_treeview.get_children())
-
-        # Definir as colunas da Treeview (mantém as existentes)
-        columns = ['Nº Medição', 'Cliente', 'RESP MEDIÇÃO'] + [f'24{str(i).zfill(2)}' for i in range(1, 13)]
-        self.status_treeview["columns"] = columns
-
-        # Redefinir os títulos das colunas na Treeview
-        for col in columns:
-            self.status_treeview.heading(col, text=col, anchor=tk.W)
-            self.status_treeview.column(col, width=100 if col in ['Nº Medição', 'Cliente', 'RESP MEDIÇÃO'] else 50, anchor=tk.W)
-
-        # Inserir os dados da matriz na Treeview
-        for row in matrix:
-            # Adiciona a linha completa
-            row_id = self.status_treeview.insert("", "end", values=row)
-
-            # Adiciona tags específicas para linhas contendo status 'P' ou 'X'
-            if 'P' in row:
-                self.status_treeview.item(row_id, tags=('pendente',))
-            if 'X' in row:
-                self.status_treeview.item(row_id, tags=('encerrado',))
-
-        # Reaplicar coloração das linhas
-        self.reapply_row_coloring()
-
-    def reassign_sorting_to_columns(self):
-        """
-        Reaplica o comando de ordenação para cada coluna da Treeview após a aplicação do filtro.
-        """
-        for col in self.status_treeview["columns"]:
-            self.status_treeview.heading(col, command=lambda c=col: self.sort_status_column(c))
 
     def apply_status_filter(self):
         """Aplica o filtro de status baseado no mês atual e nos filtros selecionados."""
-        current_month = f"24{datetime.now().month:02d}"
-
-        filter_a = self.status_filter_a.get()
-        filter_p = self.status_filter_p.get()
-        filter_x = self.status_filter_x.get()
-
-        for item in self.status_treeview.get_children():
-            self.status_treeview.delete(item)
-
-        status_matrix = self.generate_status_matrix_with_resp_medicao()
-        filtered_matrix = []
-        for row in status_matrix:
-            status_values = row[3:]
-            month_index = int(current_month[-2:]) - 1
-
-            status_atual = status_values[month_index]
-            if (status_atual == 'A' and filter_a) or (status_atual == 'P' and filter_p) or (status_atual == 'X' and filter_x):
-                filtered_matrix.append(row)
-
-        self.populate_status_treeview(filtered_matrix)
-
-        # Reaplicar a coloração das linhas
-        self.reapply_row_coloring()
-
-        # Reaplicar a configuração de ordenação após aplicar o filtro
-        self.reassign_sorting_to_columns()
-
-    def reapply_row_coloring(self):
-        """Reaplica a coloração das linhas e a alternância."""
-        for index, item in enumerate(self.status_treeview.get_children()):
-            # Alternar entre linhas pares e ímpares para aplicar cor
-            if index % 2 == 0:
-                self.status_treeview.item(item, tags=('evenrow',))
-            else:
-                self.status_treeview.item(item, tags=('oddrow',))
-
-    def apply_color_to_cell(self, row_id, col_index, color):
-        """Aplica a cor à célula específica com base no index da coluna."""
-        # Obter o valor atual da célula para mantê-lo intacto
-        current_value = self.status_treeview.item(row_id, "values")[col_index]
+        selected = {status for status, var in (('A', self.status_filter_a), ('P', self.status_filter_p),
+                                               ('X', self.status_filter_x)) if var.get()}
+
+        @timed('acao:filtrar_status')
+        def show(status_matrix, periods):
+            current_month = latest_period_until(periods, current_period())
+            self.show_status_matrix(analytics.filter_status_matrix(status_matrix, periods, current_month, selected), periods)
+
+        self.request_status_matrix(show)
+
+    def create_diagnostics_page(self, page):
+        """Aba oculta com o tempo, as linhas e a memória de cada fase e ação (Ctrl+Shift+D)."""
+        self.create_title(page, "Diagnóstico")
+
+        info_frame = ttk.Frame(page)
+        info_frame.pack(side="top", fill="x", padx=10, pady=5)
+        ttk.Label(info_frame, text=f"Log: {self.diagnostics_log or 'desativado (sem permissão de escrita)'}").pack(side="left", padx=5)
+        ttk.Button(info_frame, text="Limpar", command=self.clear_diagnostics).pack(side="right", padx=5)
+
+        columns = ["Hora", "Fase", "Tempo (s)", "Linhas", "Memória (MB)"]
+        self.diagnostics_treeview = ttk.Treeview(page, columns=columns, show="headings")
+        self.diagnostics_treeview.pack(fill="both", expand=True, padx=10, pady=10)
+        for col, width in zip(columns, [140, 420, 90, 90, 110]):
+            self.diagnostics_treeview.heading(col, text=col, anchor=tk.W)
+            self.diagnostics_treeview.column(col, width=width, anchor=tk.W)
+
+        for entry in instrumentation.records():
+            self.add_diagnostics_row(entry)
+        instrumentation.add_listener(self.add_diagnostics_row)
+
+    def add_diagnostics_row(self, entry):
+        # Mais recente no topo
+        values = (entry['time'], entry['phase'], f"{entry['seconds']:.3f}",
+                  "" if entry['rows'] is None else entry['rows'],
+                  "" if entry['memory_mb'] is None else f"{entry['memory_mb']:+.1f}")
+        self.diagnostics_treeview.insert("", 0, values=values)
+        children = self.diagnostics_treeview.get_children()
+        if len(children) > instrumentation.MAX_RECORDS:
+            self.diagnostics_treeview.delete(*children[instrumentation.MAX_RECORDS:])
+
+    def clear_diagnostics(self):
+        instrumentation.clear()
+        self.diagnostics_treeview.delete(*self.diagnostics_treeview.get_children())
+
+    def toggle_diagnostics_tab(self, event=None):
+        """Exibe ou oculta a aba Diagnóstico."""
+        if self.notebook.tab(self.diagnostics_frame, "state") == "hidden":
+            self.notebook.add(self.diagnostics_frame)
+            self.notebook.select(self.diagnostics_frame)
+        else:
+            self.notebook.hide(self.diagnostics_frame)
 
-        # Redefinir o valor com a cor aplicada
-        self.status_treeview.item(row_id, values=(
-            *self.status_treeview.item(row_id, "values")[:col_index],
-            f'{{{current_value}}}',  # Adicionar chaves ao redor para destacar que é um valor formatado (opcional)
-            *self.status_treeview.item(row_id, "values")[col_index + 1:]
-        ))
+if __name__ == "__main__":
+    freeze_support()  # Necessário para os processos de leitura no executável (PyInstaller)
 
-        # Aplicar a tag 'pendente' à célula com o status 'P'
-        self.status_treeview.tag_configure('pendente', background=color)  # Define a cor amarela para "P"
-        self.status_treeview.item(row_id, tags=('pendente',))
+    STARTUP_TIMINGS['imports'] = time.perf_counter() - _STARTUP_T0
 
-if __name__ == "__main__":
-    username = os.getlogin()
-    file_paths = [
-        f'C:\\Users\\{username}\\EBEC\\NC - Medicao - Documentos\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento\\RELATORIO GERAL MEDIÇÃO.xlsx',
-        f'C:\\Users\\joana.conceicao.EBEC-SA.000\\EBEC\\NC - Medicao - Documentos\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento\\RELATORIO GERAL MEDIÇÃO.xlsx',
-        f'C:\\Users\\{username}\\EBEC\\NC - Medicao - Documentos.000\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento\\RELATORIO GERAL MEDIÇÃO.xlsx'
-    ]
-
-    for file_path in file_paths:
-        if os.path.exists(file_path):
-            df = pd.read_excel(file_path)
-            break
-    else:
-        file_path = filedialog.askopenfilename(title="Selecione o arquivo RELATORIO GERAL MEDIÇÃO", filetypes=[("Excel files", "*.xlsx")])
-        if not file_path:
-            messagebox.showwarning("Aviso", "Arquivo não selecionado.")
-            exit()
-        df = pd.read_excel(file_path)
-
-    viewer = DataFrameViewer(df)
+    data_client, df, file_paths = None, None, ()
+    if DATA_SERVICE:
+        from data_service import DataServiceClient
+        data_client = DataServiceClient()
+        try:
+            with measure('data_service_load') as info:
+                df = data_client.load()
+                info['rows'] = len(df)
+        except (OSError, RuntimeError) as e:
+            # Serviço sem dados publicados (ou sem pyarrow): a instância lê a planilha sozinha
+            print(f"Serviço de dados indisponível: {e}", file=sys.stderr)
+            data_client = None
+
+    if data_client is None:
+        file_paths = default_workbook_paths()
+        if not file_paths:
+            file_paths = filedialog.askopenfilenames(title="Selecione o(s) arquivo(s) RELATORIO GERAL MEDIÇÃO", filetypes=[("Excel files", "*.xlsx")])
+            if not file_paths:
+                messagebox.showwarning("Aviso", "Arquivo não selecionado.")
+                exit()
+        with measure('read_workbooks') as info:
+            df = load_workbooks(file_paths)
+            info['rows'] = len(df)
+    STARTUP_TIMINGS['data_load'] = time.perf_counter() - _STARTUP_T0
+
+    try:
+        viewer = DataFrameViewer(df, file_paths, data_client)
+    except ValueError as e:
+        # Planilha sem alguma coluna obrigatória (validation.REQUIRED_COLUMNS)
+        messagebox.showerror("Erro", str(e))
+        exit()
     viewer.mainloop()
\ No newline at end of file
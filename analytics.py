@@ -0,0 +1,180 @@
+"""Cálculos do programa sem dependência de interface (tkinter/matplotlib)."""
+import pandas as pd
+
+from schema import display_text
+from validation import validate
+
+EPSILON = 0.05  # Margem de erro para desconsiderar variações de até 1 centavo
+
+VERIFICATION_COLUMNS = [
+    'ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'RESP MEDIÇÃO', 'SITUAÇÃO MED.', 'VALOR FATURADO',
+    'PREVISÃO DE MEDIÇÃO', 'GLOSA - MANUTENÇÃO', 'DESC COMERCIAL', 'KM EXCEDENTE',
+    'MULTA CONTRATUAL', 'AJUSTES / ACRÉCIMOS', 'DIF FAT/MED', 'ADM CONTRATO'
+]
+
+COMPARISON_COLUMNS = [
+    'PREVISÃO DE MEDIÇÃO', 'GLOSA - MANUTENÇÃO', 'DESC COMERCIAL',
+    'KM EXCEDENTE', 'MULTA CONTRATUAL', 'AJUSTES / ACRÉCIMOS',
+    'QTDE LOCADOS', 'QTDE RESERVA'
+]
+
+# Colunas lidas por closure_metrics (recorte enviado aos processos de cálculo)
+CLOSURE_METRICS_COLUMNS = [
+    'ABA', 'PREVISÃO DE MEDIÇÃO', 'VALOR FATURADO', 'GLOSA - MANUTENÇÃO', 'DESC COMERCIAL', 'MULTA CONTRATUAL',
+    'KM EXCEDENTE', 'MEDIÇÃO EFETUADA', 'ENVIO FAT', 'FAT MEDIÇÃO'
+]
+
+# Status da planilha que indicam medição aberta na matriz de status
+OPEN_STATUSES = ['ATIVO', 'AG. FAT.', 'PARCIAL']
+
+
+def clean_dataframe(df):
+    """Dataframe tipado da planilha (ver validation.validate; o relatório de problemas é descartado)."""
+    return validate(df).frame
+
+
+def create_verification_dataframe(df_cleaned):
+    """Linhas em que o valor faturado difere do valor medido (fora da margem de erro)."""
+    df = df_cleaned.copy()
+    df['DIF FAT/MED'] = (
+        (df['PREVISÃO DE MEDIÇÃO'] - df['GLOSA - MANUTENÇÃO'] - df['DESC COMERCIAL'] +
+         df['KM EXCEDENTE'] + df['MULTA CONTRATUAL'] + df['AJUSTES / ACRÉCIMOS']) - df['VALOR FATURADO']
+    ).round(2)
+
+    # Aplicar a margem de erro para ignorar pequenas diferenças
+    df['DIF FAT/MED'] = df['DIF FAT/MED'].mask(df['DIF FAT/MED'].abs() <= EPSILON, 0)
+
+    verification_df = df[VERIFICATION_COLUMNS]
+
+    # Filtrar linhas onde DIF FAT/MED é diferente de 0
+    return verification_df[verification_df['DIF FAT/MED'] != 0]
+
+
+def distinct_values(series):
+    """Valores distintos (como texto, igual ao filtro da tabela) com a quantidade de linhas, do mais frequente ao menos."""
+    return display_text(series.dropna()).value_counts()
+
+
+def open_mask(df):
+    """Linhas ainda não finalizadas (sem ENVIO FAT ou sem FAT MEDIÇÃO)."""
+    return df['ENVIO FAT'].isna() | df['FAT MEDIÇÃO'].isna()
+
+
+def days_to_invoice(df):
+    """Dias entre MEDIÇÃO EFETUADA e ENVIO FAT (NaN quando alguma das datas está vazia ou é inválida)."""
+    return (df['ENVIO FAT'] - df['MEDIÇÃO EFETUADA']).dt.days
+
+
+def closure_metrics(df, periods):
+    """Métricas dos cards de fechamento: linha 'GERAL' seguida de uma linha por período."""
+    work = pd.DataFrame({
+        'ABA': df['ABA'],
+        'PREVISÃO DE MEDIÇÃO': df['PREVISÃO DE MEDIÇÃO'],
+        'VALOR FATURADO': df['VALOR FATURADO'],
+        'GLOSA - MANUTENÇÃO': df['GLOSA - MANUTENÇÃO'],
+        'DESC COMERCIAL': df['DESC COMERCIAL'],
+        'MULTA CONTRATUAL': df['MULTA CONTRATUAL'],
+        'KM EXCEDENTE': df['KM EXCEDENTE'],
+        'MÉDIA DE DIAS': days_to_invoice(df),
+        'MEDIÇÕES': 1,
+        'EFETUADAS': df['MEDIÇÃO EFETUADA'].notna(),
+        'A FATURAR': df['ENVIO FAT'].notna(),
+        'FINALIZADAS': df['ENVIO FAT'].notna() & df['FAT MEDIÇÃO'].notna(),
+    })
+    aggregations = {col: 'sum' for col in work.columns if col != 'ABA'}
+    aggregations['MÉDIA DE DIAS'] = 'mean'
+
+    per_period = work.groupby('ABA').agg(aggregations).reindex(periods)
+    general = work.drop(columns='ABA').agg(aggregations).to_frame('GERAL').T
+    metrics = pd.concat([general, per_period])
+    metrics.index.name = 'ABA'
+
+    count_columns = ['MEDIÇÕES', 'EFETUADAS', 'A FATURAR', 'FINALIZADAS']
+    metrics[count_columns] = metrics[count_columns].fillna(0).astype(int)
+    return metrics
+
+
+def closure_card_content(metrics):
+    """Texto de um card de fechamento a partir de uma linha de closure_metrics."""
+    total = int(metrics['MEDIÇÕES'])
+    return (
+        f"Previsão de Medição: R$ {metrics['PREVISÃO DE MEDIÇÃO']:,.2f}    "
+        f"Valor Faturado: R$ {metrics['VALOR FATURADO']:,.2f}    "
+        f"Média de Dias: {metrics['MÉDIA DE DIAS']:.1f} dias    \n"
+        f"Glosa: R$ {metrics['GLOSA - MANUTENÇÃO']:,.2f}    "
+        f"Desconto: R$ {metrics['DESC COMERCIAL']:,.2f}    "
+        f"Multa: R$ {metrics['MULTA CONTRATUAL']:,.2f}    "
+        f"KM Excedente: R$ {metrics['KM EXCEDENTE']:,.2f}\n"
+        f"Medições Efetuadas: {int(metrics['EFETUADAS'])}/{total}    "
+        f"Medições a Faturar: {int(metrics['A FATURAR'])}/{total}    "
+        f"Medições Finalizadas: {int(metrics['FINALIZADAS'])}/{total}"
+    )
+
+
+def compare_months(df, month1, month2):
+    """Diferenças por código de medição entre dois meses (ValueError se algum mês não tiver dados)."""
+    df_mes1 = df[df['ABA'] == month1]
+    df_mes2 = df[df['ABA'] == month2]
+
+    if df_mes1.empty:
+        raise ValueError(f"Não foram encontrados dados para o mês {month1}.")
+    if df_mes2.empty:
+        raise ValueError(f"Não foram encontrados dados para o mês {month2}.")
+
+    # Primeira linha de cada código (parte do Nº MEDIÇÃO antes do '-') em cada mês
+    def first_by_code(month_df):
+        codes = month_df['Nº MEDIÇÃO'].astype(str).str.split('-').str[0]
+        values = month_df[['CLIENTE'] + COMPARISON_COLUMNS].assign(**{'Código': codes})
+        return values.drop_duplicates('Código').set_index('Código')
+
+    linhas_mes1 = first_by_code(df_mes1)
+    linhas_mes2 = first_by_code(df_mes2)
+    codigos = linhas_mes1.index.union(linhas_mes2.index)
+    only_mes1 = ~codigos.isin(linhas_mes2.index)
+    only_mes2 = ~codigos.isin(linhas_mes1.index)
+
+    linhas_mes1 = linhas_mes1.reindex(codigos)
+    linhas_mes2 = linhas_mes2.reindex(codigos)
+    valores1 = linhas_mes1[COMPARISON_COLUMNS].fillna(0)
+    valores2 = linhas_mes2[COMPARISON_COLUMNS].fillna(0)
+
+    diffs = valores2 - valores1
+    diffs[only_mes2] = -valores2[only_mes2]
+    diffs[only_mes1] = valores1[only_mes1]
+
+    def valor_diferenca(values):
+        return (values['PREVISÃO DE MEDIÇÃO'] - values['GLOSA - MANUTENÇÃO'] - values['DESC COMERCIAL'] +
+                values['KM EXCEDENTE'] + values['MULTA CONTRATUAL'] + values['AJUSTES / ACRÉCIMOS'])
+
+    valor = valor_diferenca(diffs)
+    # Código só no mês 2: a previsão entra negativa e os demais valores com o sinal do mês 2
+    valor[only_mes2] = (-valores2['PREVISÃO DE MEDIÇÃO'] - valores2['GLOSA - MANUTENÇÃO'] - valores2['DESC COMERCIAL'] +
+                        valores2['KM EXCEDENTE'] + valores2['MULTA CONTRATUAL'] + valores2['AJUSTES / ACRÉCIMOS'])[only_mes2]
+
+    df_resultados = diffs.copy()
+    df_resultados.insert(0, 'ABA', f"{month1} vs {month2}")
+    df_resultados.loc[only_mes1, 'ABA'] = month1
+    df_resultados.loc[only_mes2, 'ABA'] = month2
+    df_resultados.insert(1, 'CLIENTE', linhas_mes1['CLIENTE'].where(~only_mes2, linhas_mes2['CLIENTE']))
+    df_resultados.insert(2, 'Nº MEDIÇÃO', codigos)
+
+    # Aplicar margem de erro
+    df_resultados['Valor Diferença'] = valor.mask(valor.abs() <= EPSILON, 0)
+    df_resultados = df_resultados.reset_index(drop=True).round(2)
+    df_resultados = df_resultados.loc[:, (df_resultados != 0).any(axis=0)]
+
+    colunas_final = ['ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'Valor Diferença'] + COMPARISON_COLUMNS
+    return df_resultados[[col for col in colunas_final if col in df_resultados.columns]]
+
+
+def status_matrix_columns(periods, include_resp=True):
+    """Cabeçalho da matriz de status."""
+    return ['Nº Medição', 'Cliente'] + (['RESP MEDIÇÃO'] if include_resp else []) + list(periods)
+
+
+def filter_status_matrix(status_matrix, periods, month, statuses, include_resp=True):
+    """Linhas da matriz cujo status no mês informado está entre os selecionados (ex.: {'A', 'P'})."""
+    if month not in periods:
+        return []
+    month_index = (3 if include_resp else 2) + list(periods).index(month)
+    return [row for row in status_matrix if row[month_index] in statuses]
@@ -0,0 +1,136 @@
+"""Medição de desempenho dos cálculos do programa com planilhas sintéticas de vários tamanhos.
+
+Cada etapa é medida isoladamente (sem interface), com o melhor e a mediana de várias repetições.
+O resultado é gravado em JSON; --baseline compara com uma execução anterior.
+
+Exemplos:
+    python benchmark.py --output antes.json
+    python benchmark.py --rows 1000 10000 --repeat 5 --output depois.json --baseline antes.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import chart_data
+from lifecycle import ClientLifecycle
+from periods import period_axis
+from synthetic import DATE_FORMATS, SIZES, STATUS_MIXES, make_measurement_frame
+
+
+def _time(function, repeat):
+    """Executa function repeat vezes; retorna (melhor, mediana) em segundos."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def benchmark_steps(df):
+    """Etapas medidas, na ordem em que o programa as executa: {nome: função sem argumentos}."""
+    cleaned = analytics.clean_dataframe(df)
+    periods = period_axis(cleaned['ABA'])
+    month1, month2 = periods[-2:] if len(periods) >= 2 else (periods[0], periods[0])
+    verification = analytics.create_verification_dataframe(cleaned)
+
+    steps = {
+        'clean_dataframe': lambda: analytics.clean_dataframe(df),
+        'create_verification_dataframe': lambda: analytics.create_verification_dataframe(cleaned),
+        'compare_months': lambda: analytics.compare_months(cleaned, month1, month2),
+        'client_lifecycle': lambda: ClientLifecycle(cleaned, periods),
+        'generate_status_matrix_with_resp_medicao': lambda: ClientLifecycle(cleaned, periods).status_matrix(),
+        'closure_metrics': lambda: analytics.closure_metrics(cleaned, periods),
+        'grafico6_diferencas': lambda: chart_data.differences_by_period(verification),
+    }
+    for name, prepare in chart_data.GRAPH_DATA.items():
+        steps[name] = lambda prepare=prepare: prepare(cleaned)
+    lifecycle = ClientLifecycle(cleaned, periods)
+    steps['grafico4_clientes'] = lambda: chart_data.client_flow(lifecycle)
+    cube = chart_data.aggregate_cube(cleaned)
+    steps['aggregate_cube'] = lambda: chart_data.aggregate_cube(cleaned)
+    for name, prepare in chart_data.CUBE_GRAPH_DATA.items():
+        steps[name] = lambda prepare=prepare: prepare(cube)
+    return steps
+
+
+def run(sizes, repeat=3, status_mix='padrao', date_format='texto', steps=None, seed=0, progress=None):
+    """Mede as etapas para cada tamanho; retorna o dicionário gravado no JSON."""
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'status_mix': status_mix,
+        'date_format': date_format,
+        'sizes': {},
+    }
+    for rows in sizes:
+        start = time.perf_counter()
+        df = make_measurement_frame(rows, seed=seed, status_mix=status_mix, date_format=date_format)
+        generated = time.perf_counter() - start
+        timings = {'gerar_dados': {'best': generated, 'median': generated}}
+
+        for name, function in benchmark_steps(df).items():
+            if steps and name not in steps:
+                continue
+            best, median = _time(function, repeat)
+            timings[name] = {'best': best, 'median': median}
+            if progress:
+                progress(rows, name, best)
+        results['sizes'][str(rows)] = timings
+    return results
+
+
+def compare(results, baseline):
+    """Linhas (tamanho, etapa, melhor atual, melhor anterior, razão) para as etapas presentes nas duas execuções."""
+    rows = []
+    for size, timings in results['sizes'].items():
+        previous = baseline.get('sizes', {}).get(size, {})
+        for name, timing in timings.items():
+            if name in previous:
+                before = previous[name]['best']
+                rows.append((size, name, timing['best'], before, timing['best'] / before if before else float('inf')))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo dos cálculos com planilhas sintéticas.")
+    parser.add_argument('--rows', nargs='+', type=int, default=SIZES, help="tamanhos (linhas) a medir")
+    parser.add_argument('--repeat', type=int, default=3, help="repetições de cada etapa")
+    parser.add_argument('--status-mix', choices=list(STATUS_MIXES), default='padrao', help="proporção de status")
+    parser.add_argument('--date-format', choices=DATE_FORMATS, default='texto', help="formato das colunas de data")
+    parser.add_argument('--steps', nargs='+', help="mede só as etapas informadas")
+    parser.add_argument('--output', default='benchmark.json', help="arquivo JSON de saída")
+    parser.add_argument('--baseline', help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    def progress(rows, name, best):
+        print(f"{rows:>9} {name:<45} {best * 1000:>10.1f} ms", file=sys.stderr)
+
+    results = run(args.rows, args.repeat, args.status_mix, args.date_format, args.steps, progress=progress)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"{'linhas':>9} {'etapa':<45} {'atual (ms)':>11} {'anterior (ms)':>14} {'razão':>7}")
+        for size, name, best, before, ratio in compare(results, baseline):
+            print(f"{size:>9} {name:<45} {best * 1000:>11.1f} {before * 1000:>14.1f} {ratio:>7.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Preparação dos dados de cada gráfico, sem dependência de interface (tkinter/matplotlib)."""
+import pandas as pd
+
+from schema import VALUE_COLUMNS
+
+# Agrupamento das situações de medição exibido no gráfico de situações; as demais vão para "OUTROS"
+SITUATION_GROUPS = {
+    'PARCIAL': 'FAT. PARCIAL',
+    'AG. CLIENTE': 'AG. CLIENTE/APROV.',
+    'AG. APROV.': 'AG. CLIENTE/APROV.',
+    'AG. MANUT.': 'AG. MANUT./COMERCIAL',
+    'AG. COMERCIAL': 'AG. MANUT./COMERCIAL',
+    'AG. FAT.': 'AG. FAT.',
+    '1° TENTATIVA': 'ENVIO S/ APROV.',
+    '2° TENTATIVA': 'ENVIO S/ APROV.',
+    '3° TENTATIVA': 'ENVIO S/ APROV.',
+    'ENVIO S/ APROV.': 'ENVIO S/ APROV.',
+    'CNPJ': 'CNPJ/LET\'S',
+    'LET\'S': 'CNPJ/LET\'S',
+    'AG. CANCEL FAT.': 'AG. CANCEL FAT.',
+    'AG. DOC': 'AG. DOC',
+}
+
+
+# Dimensões do cubo de agregados; SITUAÇÃO é a situação agrupada (SITUATION_GROUPS)
+CUBE_KEYS = ['ABA', 'RESP MEDIÇÃO', 'SITUAÇÃO', 'STATUS', 'Nº CR']
+CUBE_SUMS = ['QTDE LOCADOS', 'VALOR FATURADO', 'PREVISÃO DE MEDIÇÃO'] + VALUE_COLUMNS
+
+
+def aggregate_cube(df):
+    """Contagens e somas por ABA × RESP MEDIÇÃO × SITUAÇÃO × STATUS × Nº CR, numa única passada.
+
+    Valores vazios formam grupos próprios (NaN nas chaves). As linhas saem na ordem da primeira
+    ocorrência de cada combinação, então a ordem de RESP MEDIÇÃO e Nº CR no cubo é a da planilha.
+    MEDIÇÕES conta as linhas e LINHAS LOCADOS as linhas com QTDE LOCADOS preenchida.
+    """
+    situations = df['SITUAÇÃO MED.']
+    keys = df[['ABA', 'RESP MEDIÇÃO', 'STATUS', 'Nº CR']].assign(
+        **{'SITUAÇÃO': situation_groups(situations).where(situations.notna())})[CUBE_KEYS]
+    values = df[CUBE_SUMS].assign(**{'MEDIÇÕES': 1, 'LINHAS LOCADOS': df['QTDE LOCADOS'].notna().astype(int)})
+    grouped = values.groupby([keys[col] for col in CUBE_KEYS], dropna=False, sort=False)
+    return grouped.sum().reset_index()
+
+
+def _cube_counts(cube, columns, value='MEDIÇÕES', column_order=None):
+    """Soma de value por ABA (linhas, em ordem) e columns, descartando grupos com chave vazia."""
+    cube = cube.dropna(subset=['ABA', columns])
+    table = cube.groupby(['ABA', columns])[value].sum().unstack(fill_value=0)
+    if column_order is not None:
+        table = table.reindex(columns=[col for col in column_order if col in table.columns])
+    table.columns.name = columns
+    return table
+
+
+def _resp_order(cube):
+    """RESP MEDIÇÃO na ordem da planilha (mantém as mesmas cores em todos os gráficos)."""
+    return cube['RESP MEDIÇÃO'].dropna().unique()
+
+
+def financial_by_period(df):
+    """Valor faturado, previsão e variáveis somados por ABA (gráficos 1 e 9)."""
+    columns = ['VALOR FATURADO', 'PREVISÃO DE MEDIÇÃO'] + VALUE_COLUMNS
+    totals = df.groupby('ABA')[columns].sum()
+    totals['VARIÁVEIS'] = (-totals['GLOSA - MANUTENÇÃO'] - totals['DESC COMERCIAL'] + totals['KM EXCEDENTE'] +
+                           totals['MULTA CONTRATUAL'] + totals['AJUSTES / ACRÉCIMOS'])
+    return totals
+
+
+def invoicing_progress(df):
+    """Medições finalizadas (ENVIO FAT e FAT MEDIÇÃO preenchidos) e não finalizadas por ABA (gráfico 2)."""
+    finalized = df['ENVIO FAT'].notna() & df['FAT MEDIÇÃO'].notna()
+    counts = finalized.groupby(df['ABA']).agg(['sum', 'size'])
+    result = pd.DataFrame({'FINALIZADOS': counts['sum'].astype(int)})
+    result['NÃO FINALIZADOS'] = counts['size'] - result['FINALIZADOS']
+    return result
+
+
+def counts_by_resp(cube):
+    """Quantidade de medições por ABA e RESP MEDIÇÃO, com os responsáveis na ordem da planilha (gráfico 3)."""
+    return _cube_counts(cube, 'RESP MEDIÇÃO', column_order=_resp_order(cube))
+
+
+def client_flow(lifecycle):
+    """Clientes novos (primeiro mês após o mês base) e clientes finalizados por ABA (gráfico 4),
+    a partir do lifecycle.ClientLifecycle dos dados."""
+    return lifecycle.flow()[['NOVOS', 'FINALIZADOS']]
+
+
+def rented_by_resp(cube):
+    """QTDE LOCADOS somada por ABA e RESP MEDIÇÃO, na ordem da planilha (gráfico 5)."""
+    return _cube_counts(cube[cube['LINHAS LOCADOS'] > 0], 'RESP MEDIÇÃO', 'QTDE LOCADOS', _resp_order(cube))
+
+
+def differences_by_period(verification_df):
+    """Quantidade de diferenças faturamento/medição por ABA (gráfico 6)."""
+    return verification_df['ABA'].value_counts().sort_index()
+
+
+def situation_groups(situations):
+    """Situação de medição agrupada conforme SITUATION_GROUPS ('VOZ INCORRETA' quando em branco)."""
+    grouped = situations.map(SITUATION_GROUPS).fillna('OUTROS')
+    return grouped.mask(situations.astype(str).str.strip() == '', 'VOZ INCORRETA')
+
+
+def situation_counts(cube):
+    """Quantidade de medições por ABA e situação agrupada (gráfico 7)."""
+    return _cube_counts(cube, 'SITUAÇÃO')
+
+
+def situation_count_by_resp(cube):
+    """Medições com situação preenchida por ABA e RESP MEDIÇÃO, na ordem da planilha (gráfico 8)."""
+    return _cube_counts(cube.dropna(subset=['SITUAÇÃO']), 'RESP MEDIÇÃO', column_order=_resp_order(cube))
+
+
+def totals_by_cr(cube):
+    """Valor faturado e previsão ajustada pelas variáveis por Nº CR, na ordem da planilha (gráfico 10)."""
+    cr_values = cube['Nº CR'].unique()
+    totals = cube.groupby('Nº CR')[['VALOR FATURADO', 'PREVISÃO DE MEDIÇÃO'] + VALUE_COLUMNS].sum().reindex(cr_values, fill_value=0)
+    prev_medicao = (totals['PREVISÃO DE MEDIÇÃO'] - totals['GLOSA - MANUTENÇÃO'] - totals['DESC COMERCIAL'] +
+                    totals['KM EXCEDENTE'] + totals['MULTA CONTRATUAL'] + totals['AJUSTES / ACRÉCIMOS'])
+    return pd.DataFrame({'VALOR FATURADO': totals['VALOR FATURADO'], 'PREV. MEDIÇÃO': prev_medicao})
+
+
+def top_with_others(totals, n, by, label='Outros'):
+    """As n linhas com maior valor em by, em ordem decrescente, e uma linha label com a soma das demais."""
+    ordered = totals.sort_values(by, ascending=False, kind='stable')
+    if len(ordered) <= n:
+        return ordered
+    others = ordered.iloc[n:].sum().to_frame(label).T
+    return pd.concat([ordered.iloc[:n], others])
+
+
+def cr_clients_by_month(rows, top=10):
+    """VALOR FATURADO por ABA e CLIENTE das linhas de um CR (detalhe do gráfico 10): os top clientes
+    de maior faturamento, em ordem decrescente, e os demais somados na coluna "Outros"."""
+    table = rows.groupby(['ABA', 'CLIENTE'])['VALOR FATURADO'].sum().unstack(fill_value=0)
+    by_client = top_with_others(table.T.assign(_total=table.sum()), top, '_total')
+    return by_client.drop(columns='_total').T
+
+
+# Preparação de cada gráfico a partir do dataframe limpo (usada também pelo benchmark)
+GRAPH_DATA = {
+    'grafico1_9_financeiro': financial_by_period,
+    'grafico2_faturamento': invoicing_progress,
+}
+
+# Gráficos recortados do cubo de agregados (aggregate_cube)
+CUBE_GRAPH_DATA = {
+    'grafico3_resp': counts_by_resp,
+    'grafico5_locados': rented_by_resp,
+    'grafico7_situacao': situation_counts,
+    'grafico8_situacao_resp': situation_count_by_resp,
+    'grafico10_cr': totals_by_cr,
+}
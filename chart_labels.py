@@ -0,0 +1,158 @@
+"""Rótulos de barras e dica flutuante (tooltip) dos gráficos.
+
+Os rótulos de cada série são criados de uma vez com Axes.bar_label e só existem enquanto as barras
+têm tamanho para lê-los: com barras estreitas (ex.: centenas de CRs no gráfico 10) ou segmentos
+empilhados baixos, os valores ficam só na dica ao passar o mouse. A dica procura a barra sob o
+cursor num índice das barras ordenado pela posição no eixo x (searchsorted), sem um texto por barra.
+
+Não importa o matplotlib: trabalha só com os objetos (eixo, barras e canvas) recebidos.
+"""
+import numpy as np
+
+# Largura aproximada de um caractere e altura de uma linha de rótulo, em pixels
+CHAR_PX = 6.5
+LINE_PX = 12
+
+# Distância máxima, em pixels, entre o cursor e a barra indicada na dica
+HOVER_PX = 3
+
+
+class ChartLabels:
+    """Rótulos e dica de um eixo; recriado a cada atualização do gráfico (detach() no anterior)."""
+
+    def __init__(self, ax, on_click=None):
+        self.ax = ax
+        self.on_click = on_click  # Chamado com a chave da barra clicada (None fora das barras)
+        self.series = []
+        self.canvas = None
+        self.connections = []
+        self.tooltip = None
+        self.hovered = None
+        self._index = None
+
+    def add_bars(self, container, labels, tips=None, keys=None, **kwargs):
+        """Série de barras verticais: labels são os rótulos ('' sem rótulo), tips os textos da dica
+        (padrão: os próprios rótulos), keys o que on_click recebe para cada barra e kwargs vão
+        para Axes.bar_label (label_type, rotation, color...)."""
+        rects = container.patches
+        geometry = np.array([(r.get_x(), r.get_width(), r.get_y(), r.get_height()) for r in rects], dtype=float)
+        self.series.append({
+            'container': container,
+            'labels': list(labels),
+            'tips': list(tips) if tips is not None else list(labels),
+            'keys': list(keys) if keys is not None else [None] * len(rects),
+            'geometry': geometry.reshape(-1, 4),
+            'kwargs': kwargs,
+            'artists': [],
+        })
+        self._index = None
+
+    def attach(self, canvas):
+        """Cria os rótulos que cabem e passa a acompanhar o mouse, o redimensionamento e o zoom."""
+        self.canvas = canvas
+        self.connections = [
+            canvas.mpl_connect('motion_notify_event', self.on_motion),
+            canvas.mpl_connect('resize_event', self.on_resize),
+        ]
+        if self.on_click is not None:
+            self.connections.append(canvas.mpl_connect('button_press_event', self.on_press))
+        self.ax.callbacks.connect('xlim_changed', self.on_resize)
+        self.ax.callbacks.connect('ylim_changed', self.on_resize)
+        self.tooltip = self.ax.annotate(
+            '', xy=(0, 0), xytext=(12, 12), textcoords='offset points', visible=False, zorder=10,
+            annotation_clip=False, fontsize=9, bbox={'boxstyle': 'round', 'fc': '#ffffe0', 'ec': '#888888'})
+        self.update_labels()
+
+    def detach(self):
+        if self.canvas is not None:
+            for connection in self.connections:
+                self.canvas.mpl_disconnect(connection)
+        self.connections = []
+
+    def update_labels(self):
+        """Recria os rótulos de cada série, só nas barras com largura e altura suficientes."""
+        (xmin, xmax), _ = self.ax.get_xlim(), self.ax.get_ylim()  # Aplica o autoescalonamento pendente
+        to_pixels = self.ax.transData.transform
+        origin = to_pixels((0, 0))
+        px_x, px_y = np.abs(to_pixels((1, 1)) - origin)
+        for series in self.series:
+            for artist in series['artists']:
+                artist.remove()
+            series['artists'] = []
+
+            labels, geometry, kwargs = series['labels'], series['geometry'], series['kwargs']
+            rotated = kwargs.get('rotation') in (90, 270)
+            chars = np.array([len(label) for label in labels])
+            needed_width = LINE_PX if rotated else chars * CHAR_PX
+            in_view = (geometry[:, 0] + geometry[:, 1] >= min(xmin, xmax)) & (geometry[:, 0] <= max(xmin, xmax))
+            visible = in_view & (chars > 0) & (geometry[:, 1] * px_x >= needed_width)
+            if kwargs.get('label_type') == 'center':
+                needed_height = chars * CHAR_PX if rotated else LINE_PX
+                visible &= np.abs(geometry[:, 3]) * px_y >= needed_height
+            shown = np.flatnonzero(visible)
+            if len(shown):
+                # Só as barras com rótulo entram no bar_label: nenhum texto é criado para as demais
+                container = series['container']
+                subset = type(container)([container.patches[i] for i in shown], datavalues=np.asarray(container.datavalues)[shown],
+                                         orientation=container.orientation)
+                series['artists'] = self.ax.bar_label(subset, labels=[labels[i] for i in shown], **kwargs)
+
+    def on_resize(self, *_):
+        self.update_labels()
+        if self.canvas is not None:
+            self.canvas.draw_idle()
+
+    def hit(self, x, y, tolerance=0.0):
+        """Posição (no índice) da barra sob o ponto (coordenadas de dados), ou None; com tolerance
+        (em unidades de x), vale também a barra mais próxima dentro dessa distância."""
+        if self._index is None:
+            geometry = np.concatenate([series['geometry'] for series in self.series]) if self.series else np.empty((0, 4))
+            tips = [tip for series in self.series for tip in series['tips']]
+            keys = [key for series in self.series for key in series['keys']]
+            order = np.argsort(geometry[:, 0], kind='stable')
+            left = geometry[order, 0]
+            right = left + geometry[order, 1]
+            bottom = np.minimum(geometry[order, 2], geometry[order, 2] + geometry[order, 3])
+            top = np.maximum(geometry[order, 2], geometry[order, 2] + geometry[order, 3])
+            widest = geometry[:, 1].max() if len(geometry) else 0
+            self._index = (left, right, bottom, top, widest)
+            self.tips, self.keys = [tips[i] for i in order], [keys[i] for i in order]
+
+        left, right, bottom, top, widest = self._index
+        # Só as barras que começam entre x - (maior largura) e x podem conter o ponto
+        start = np.searchsorted(left, x - widest - tolerance, side='left')
+        stop = np.searchsorted(left, x + tolerance, side='right')
+        candidates = np.arange(start, stop)
+        candidates = candidates[(bottom[candidates] <= y) & (y <= top[candidates])]
+        if not len(candidates):
+            return None
+        distance = np.maximum(left[candidates] - x, 0) + np.maximum(x - right[candidates], 0)
+        best = candidates[distance.argmin()]
+        return int(best) if distance.min() <= tolerance else None
+
+    def _event_hit(self, event):
+        if not self.ax.bbox.contains(event.x, event.y):
+            return None, None
+        x, y = self.ax.transData.inverted().transform((event.x, event.y))
+        x_per_px = abs(self.ax.transData.inverted().transform((event.x + 1, event.y))[0] - x)
+        return self.hit(x, y, tolerance=HOVER_PX * x_per_px), (x, y)
+
+    def on_motion(self, event):
+        position, xy = self._event_hit(event)
+        tip = None if position is None else self.tips[position]
+        if tip is not None:
+            self.tooltip.xy = xy
+            self.tooltip.set_text(tip)
+        if tip != self.hovered or tip is not None:
+            self.hovered = tip
+            self.tooltip.set_visible(tip is not None)
+            self.canvas.draw_idle()
+
+    def on_press(self, event):
+        if event.button != 1 or not self.ax.bbox.contains(event.x, event.y):
+            return
+        toolbar = getattr(self.canvas, 'toolbar', None)
+        if toolbar is not None and toolbar.mode:  # Clique de zoom/deslocamento da barra de ferramentas
+            return
+        position, _ = self._event_hit(event)
+        self.on_click(None if position is None else self.keys[position])
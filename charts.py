@@ -0,0 +1,485 @@
+"""Desenho dos gráficos da aba "Gráficos", sem dependência de tkinter.
+
+Cada função recebe o eixo, os dados já preparados (chart_data) e um chart_labels.ChartLabels para
+os rótulos das barras; CHARTS lista os gráficos na ordem da aba. A interface desenha nos canvas da
+tela e render_chart/assemble_pdf desenham sem tela (Agg), nos processos da exportação em lote.
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.ticker import FuncFormatter
+
+from chart_labels import ChartLabels
+
+FIGSIZE = (12, 6)
+
+# CRs exibidos no gráfico 10 (os demais vão para a barra "Outros")
+TOP_CR = 20
+
+# Gráficos da aba, na ordem de exibição; key identifica os dados em DataFrameViewer.chart_input
+Chart = namedtuple('Chart', ['key', 'title', 'draw'])
+
+
+def currency_br(x, pos=None):
+    """R$ no formato brasileiro (1.234,56)."""
+    return 'R$ {:,.2f}'.format(x).replace(',', 'x').replace('.', ',').replace('x', '.')
+
+
+def draw_financial(ax, totals, labels, title):
+    """Gráfico 1: valor faturado e previsão por mês, com a linha das variáveis no eixo secundário."""
+    aba_values = totals.index.tolist()
+    val_fat_values = totals['VALOR FATURADO'].tolist()
+    prev_med_values = totals['PREVISÃO DE MEDIÇÃO'].tolist()
+    glosa_values = totals['GLOSA - MANUTENÇÃO'].tolist()
+    desc_com_values = totals['DESC COMERCIAL'].tolist()
+    km_exc_values = totals['KM EXCEDENTE'].tolist()
+    multa_values = totals['MULTA CONTRATUAL'].tolist()
+    ajustes_values = totals['AJUSTES / ACRÉCIMOS'].tolist()
+
+    # Linha total das variáveis
+    linha_total = totals['VARIÁVEIS'].tolist()
+
+    x = np.arange(len(aba_values))
+    width = 0.35
+
+    # Barras
+    bars1 = ax.bar(x - width / 2, val_fat_values, width, label='Valor Faturado', color='#003f70')
+    bars2 = ax.bar(x + width / 2, prev_med_values, width, label='Previsão de Medição', color='#00afa0')
+
+    # Rótulos para as barras (na dica do mouse quando não cabem)
+    for bars, values, color in ((bars1, val_fat_values, '#003f70'), (bars2, prev_med_values, '#00afa0')):
+        labels.add_bars(bars, [f'R$ {value:,.2f}' if value > 0 else '' for value in values],
+                        tips=[f'{aba}\n{bars.get_label()}: R$ {value:,.2f}' for aba, value in zip(aba_values, values)],
+                        color=color, rotation=90)
+
+    # Eixo principal
+    ax.set_ylim(0, 30000000)
+    ax.set_ylabel('R$ (Eixo Principal)')
+
+    # Eixo secundário para a linha total
+    ax2 = ax.twinx()
+    line_total, = ax2.plot(x, linha_total, marker='o', color='#F15A22', label='Variáveis')
+
+    # Ajuste do limite do eixo secundário
+    ax2.set_ylim(0, 1500000)
+    ax2.set_ylabel('R$ (Eixo Secundário)')
+
+    # Rótulos para a linha total
+    for x_value, total, glosa, desc, km, multa, ajuste in zip(x, linha_total, glosa_values, desc_com_values, km_exc_values, multa_values, ajustes_values):
+        # Valor total acima do marcador
+        if total != 0:
+            ax2.text(x_value, total, f'R$ {total:,.2f}', ha='center', va='bottom', color='#F15A22')
+
+        # Valores positivos e negativos abaixo do marcador
+        sum_negatives = -glosa - desc
+        sum_positives = km + multa + ajuste
+
+        # Valor positivo (em verde) e valor negativo (em vermelho)
+        if sum_positives != 0:
+            ax2.text(x_value, total - (total * 0.05), f'({sum_positives:,.2f})', ha='center', va='top', color='#00FA3C', fontsize=10)
+        if sum_negatives != 0:
+            ax2.text(x_value, total - (total * 0.15), f'({sum_negatives:,.2f})', ha='center', va='top', color='#FA0000', fontsize=10)
+
+    # Ajuste do posicionamento das linhas para ficarem centralizadas
+    ax2.set_xticks(x)
+    ax.set_xticks(x)
+    ax.set_xticklabels(aba_values)
+    ax2.set_xticklabels(aba_values)
+
+    # Legendas combinadas
+    bars = [bars1, bars2]
+    lines = [line_total]
+    legend_labels = [bar.get_label() for bar in bars] + [line.get_label() for line in lines]
+    ax.legend(bars + lines, legend_labels, loc='upper right')
+
+    # Formatadores de moeda
+    ax.yaxis.set_major_formatter(FuncFormatter(currency_br))
+    ax2.yaxis.set_major_formatter(FuncFormatter(currency_br))
+
+
+def draw_variables(ax, totals, labels, title):
+    """Gráfico 9: variáveis por mês (linhas), com a tabela dos valores abaixo do gráfico."""
+    # Corrigir o cálculo de valores para serem negativos
+    aba_values = totals.index.tolist()
+    glosa_values = (-totals['GLOSA - MANUTENÇÃO']).tolist()
+    desc_com_values = (-totals['DESC COMERCIAL']).tolist()
+    km_exc_values = totals['KM EXCEDENTE'].tolist()
+    multa_values = totals['MULTA CONTRATUAL'].tolist()
+    ajustes_values = totals['AJUSTES / ACRÉCIMOS'].tolist()
+
+    x = np.arange(len(aba_values))  # Eixo X para os meses
+
+    # Linhas para cada valor
+    lines1, = ax.plot(x, glosa_values, marker='v', color='#ff7f0e', label='Glosa - Manutenção')
+    lines2, = ax.plot(x, desc_com_values, marker='v', color='#d62728', label='Desc. Comercial')
+    lines3, = ax.plot(x, km_exc_values, marker='^', color='#9467bd', label='KM Excedente')
+    lines4, = ax.plot(x, multa_values, marker='^', color='#8c564b', label='Multa Contratual')
+    lines5, = ax.plot(x, ajustes_values, marker='^', color='#e377c2', label='Ajustes / Acréscimos')
+
+    # Adicionar a linha no valor zero
+    ax.axhline(0, color='gray', linewidth=1, linestyle='--')  # Linha horizontal no valor zero
+
+    # Ajustar a posição das linhas e dos rótulos no gráfico
+    ax.set_xticks(x)
+    ax.set_xticklabels(aba_values)
+
+    # Adicionar legendas das linhas
+    lines = [lines1, lines2, lines3, lines4, lines5]
+    ax.legend(lines, [line.get_label() for line in lines], loc='upper right')
+
+    # Formatação do eixo Y para valores monetários
+    def currency_formatter(x, pos):
+        return 'R$ {:,.2f}'.format(x).replace('.', 'x').replace(',', '.').replace('x', ',')
+
+    ax.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
+
+    # Ajustar automaticamente os limites do eixo Y
+    ax.set_ylim(auto=True)  # Remover limites manuais e ajustar automaticamente
+
+    # Criar uma linha vazia (separadora)
+    empty_line = ['' for _ in aba_values]
+
+    # Criar a tabela de dados na parte inferior (sem cabeçalho)
+    data = [empty_line,
+            [f'R$ {value:,.2f}' for value in glosa_values],
+            [f'R$ {value:,.2f}' for value in desc_com_values],
+            [f'R$ {value:,.2f}' for value in km_exc_values],
+            [f'R$ {value:,.2f}' for value in multa_values],
+            [f'R$ {value:,.2f}' for value in ajustes_values]]
+
+    # Títulos das linhas, incluindo a linha vazia
+    row_labels = [''] + ['Glosa', 'Desc. Comercial', 'KM Excedente', 'Multa', 'Ajustes']
+
+    # Adicionar a tabela ao gráfico (sem colLabels)
+    table = ax.table(cellText=data, rowLabels=row_labels, cellLoc='center', loc='bottom')
+
+    # Definir cores para cada linha
+    colors = {
+        'Glosa': '#ff7f0e',
+        'Desc. Comercial': '#d62728',
+        'KM Excedente': '#9467bd',
+        'Multa': '#8c564b',
+        'Ajustes': '#e377c2'
+    }
+
+    # Aplicar cores aos textos das células da tabela com base nos rótulos das linhas
+    for i, row_label in enumerate(row_labels):
+        if row_label in colors:
+            for col in range(len(aba_values)):
+                cell = table[(i, col)]  # Acessar a célula usando (linha, coluna)
+                cell.set_text_props(color=colors[row_label])  # Definir a cor do texto
+
+    # Definir valores automáticos de tamanho e espaçamento
+    table_height = len(row_labels) * 0.05  # Calcula altura baseada no número de linhas
+    table_scale_factor = 6  # Fator de escala para a altura da tabela
+    table.scale(1, table_scale_factor)  # Aumenta a altura da tabela
+
+    # Obter tamanho atual da figura
+    fig = ax.figure
+    fig_width, fig_height = fig.get_size_inches()
+
+    # Calcular altura total disponível para a tabela
+    height_for_table = table_height * table_scale_factor
+    bottom_margin = height_for_table / fig_height  # Porcentagem da altura para a margem inferior
+
+    # Ajustar a altura do gráfico para o espaço disponível, incluindo a linha extra de separação
+    fig.subplots_adjust(left=0.1, bottom=bottom_margin, right=0.95, top=0.85)  # Ajuste manual de subplots
+
+    # Ajustar a altura das células da tabela
+    for key, cell in table.get_celld().items():
+        if key[1] == -1:  # Row Labels
+            cell.set_text_props(weight='bold')
+        cell.set_fontsize(9)
+        cell.set_height(0.075)  # Ajustar altura para caber corretamente
+
+    # Desativar o cabeçalho (colLabels)
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+
+
+def draw_totals_by_cr(ax, totals, labels, title, top=TOP_CR):
+    """Gráfico 10: os top CRs de maior faturamento (mais "Outros"), com valor faturado e previsão."""
+    cr_values = totals.index
+    val_faturado = totals['VALOR FATURADO']
+    prev_medicao = totals['PREV. MEDIÇÃO']
+
+    x = np.arange(len(cr_values))  # Posição no eixo X para 'Nº CR'
+    width = 0.35  # Largura das barras
+
+    # Criar barras para o 'VALOR FATURADO' e 'PREV. MEDIÇÃO'
+    bars1 = ax.bar(x - width / 2, val_faturado, width, label='Valor Faturado', color='#003f70')
+    bars2 = ax.bar(x + width / 2, prev_medicao, width, label='Prev. Medição', color='#00afa0')
+
+    # Rótulos para as barras, rotacionados em 90º; a barra "Outros" não abre detalhe
+    keys = [None if position == top else cr for position, cr in enumerate(cr_values)]
+    for bars, values in ((bars1, val_faturado), (bars2, prev_medicao)):
+        labels.add_bars(bars, [f'R$ {value:,.2f}' for value in values],
+                        tips=[f'CR {cr}\n{bars.get_label()}: R$ {value:,.2f}' for cr, value in zip(cr_values, values)],
+                        keys=keys, rotation=90)
+
+    # Ajustes de labels e legendas
+    ax.set_title(f"{title} (maiores {top}; clique num CR para ver os clientes)")
+    ax.set_ylabel('Valores em R$')
+    ax.set_xticks(x)
+    ax.set_xticklabels(cr_values, rotation=45, ha='right')
+    ax.legend()
+
+    # Formatadores de moeda no eixo Y
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f'R$ {x:,.2f}'))
+
+
+def draw_cr_detail(ax, table, labels, cr):
+    """Detalhe do gráfico 10: VALOR FATURADO dos clientes do CR por mês (barras empilhadas)."""
+    x = np.arange(len(table.index))
+    bottom = np.zeros(len(table.index))
+    colors = colormaps['tab20'].colors
+    for i, client in enumerate(table.columns):
+        values = table[client].to_numpy()
+        bars = ax.bar(x, values, 0.6, bottom=bottom, label=client, color=colors[i % len(colors)])
+        bottom += values
+        labels.add_bars(bars, [f'R$ {value:,.0f}' if value > 0 else '' for value in values],
+                        tips=[f'{aba}\n{client}: R$ {value:,.2f}' for aba, value in zip(table.index, values)],
+                        label_type='center', fontsize=8)
+
+    ax.set_title(f"CR {cr}: faturamento por cliente e mês (clique para voltar)")
+    ax.set_ylabel('Valores em R$')
+    ax.set_xticks(x)
+    ax.set_xticklabels(table.index)
+    ax.legend(fontsize=8, loc='upper left', bbox_to_anchor=(1.0, 1.0))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f'R$ {x:,.2f}'))
+
+
+def draw_invoicing(ax, progress, labels, title):
+    """Gráfico 2: percentual de medições finalizadas e não finalizadas por mês."""
+    aba_values = progress.index.tolist()
+    sim_counts = progress['FINALIZADOS'].tolist()
+    nao_counts = progress['NÃO FINALIZADOS'].tolist()
+
+    total_counts = [sim + nao for sim, nao in zip(sim_counts, nao_counts)]
+    sim_percents = [sim / total * 100 for sim, total in zip(sim_counts, total_counts)]
+    nao_percents = [nao / total * 100 for nao, total in zip(nao_counts, total_counts)]
+
+    bar_width = 0.6
+    indices = list(range(len(aba_values)))
+
+    p1 = ax.barh(indices, sim_percents, bar_width, label='Finalizados', color='#00afa0')
+    p2 = ax.barh(indices, nao_percents, bar_width, left=sim_percents, label='Não Finalizados', color='#a09ba2')
+
+    ax.set_yticks(indices)
+    ax.set_yticklabels(aba_values)
+    ax.set_title(title)
+    ax.get_xaxis().set_visible(False)
+
+    for rect1, rect2, sim_count, nao_count, total in zip(p1, p2, sim_counts, nao_counts, total_counts):
+        ax.text(rect1.get_x() + rect1.get_width() - 1, rect1.get_y() + rect1.get_height() / 2, f'{sim_count}', ha='right', va='center', color='black')
+        ax.text(rect2.get_x() + 1, rect2.get_y() + rect2.get_height() / 2, f'{nao_count}', ha='left', va='center', color='black')
+
+
+def draw_counts_by_resp(ax, counts, labels, title):
+    """Gráfico 3: medições por mês empilhadas por RESP MEDIÇÃO."""
+    aba_values = counts.index.tolist()
+    resp_medicao_values = counts.columns.tolist()
+
+    aba_indices = range(len(aba_values))
+    bar_width = 0.6
+    bottom = np.zeros(len(aba_values))
+
+    colors = ['#003f70', '#00afa0', '#ff7f0e', '#d62728', '#9467bd', '#8c564b', '#e377c2']
+
+    for resp, color in zip(resp_medicao_values, colors):
+        values = counts[resp].to_numpy()
+        bars = ax.bar(aba_indices, values, bar_width, bottom=bottom, label=resp, color=color)
+        bottom += values
+        labels.add_bars(bars, [f'{value}' if value > 0 else '' for value in values],
+                        tips=[f'{aba}\n{resp}: {value}' for aba, value in zip(aba_values, values)],
+                        label_type='center', fontsize=8, color='black')
+
+    ax.set_xticks(aba_indices)
+    ax.set_xticklabels(aba_values)
+    ax.set_title(title)
+    ax.legend(loc='upper right')
+
+
+def draw_client_flow(ax, flow, labels, title):
+    """Gráfico 4: clientes novos e finalizados por mês (no mês base ninguém conta como novo)."""
+    aba_values = flow.index.tolist()
+
+    aba_indices = range(len(aba_values))
+    bar_width = 0.6
+
+    new_clients_values = flow['NOVOS'].tolist()
+    finalized_clients_values = flow['FINALIZADOS'].tolist()
+
+    p1 = ax.barh(aba_indices, new_clients_values, bar_width, label='Novos Clientes', color='#00afa0')
+    p2 = ax.barh(aba_indices, finalized_clients_values, bar_width, left=new_clients_values, label='Clientes Finalizados', color='#a09ba2')
+
+    ax.set_yticks(aba_indices)
+    ax.set_yticklabels(aba_values)
+    ax.set_title(title)
+    ax.legend(loc='upper right')
+
+    for bar1, bar2, value1, value2 in zip(p1, p2, new_clients_values, finalized_clients_values):
+        width1 = bar1.get_width()
+        width2 = bar2.get_width()
+        ax.text(width1 / 2, bar1.get_y() + bar1.get_height() / 2, f'{value1}', ha='center', va='center', color='black')
+        ax.text(width1 + width2 / 2, bar2.get_y() + bar2.get_height() / 2, f'{value2}', ha='center', va='center', color='black')
+
+
+def draw_rented_by_resp(ax, grouped, labels, title):
+    """Gráfico 5: QTDE LOCADOS por mês empilhada por RESP MEDIÇÃO."""
+    valid_resp_medicao = grouped.columns.tolist()
+    aba_values = grouped.index.tolist()
+
+    colors = ['#003f70', '#00afa0', '#ff7f0e', '#d62728', '#9467bd', '#8c564b', '#e377c2']
+    grouped.plot(kind='bar', stacked=True, ax=ax, color=colors[:len(valid_resp_medicao)])
+
+    ax.set_xticks(range(len(aba_values)))
+    ax.set_xticklabels(aba_values)
+    ax.set_title(title)
+    ax.legend(title='RESP MEDIÇÃO', bbox_to_anchor=(1.05, 1), loc='upper right')
+
+    for i in range(len(aba_values)):
+        for j, (resp, value) in enumerate(grouped.iloc[i].items()):
+            if value > 0:
+                ax.text(i, sum(grouped.iloc[i, :j + 1]) - value / 2, f'{int(value)}', ha='center', va='center', color='black')
+
+
+def draw_differences(ax, aba_counts, labels, title):
+    """Gráfico 6: diferenças faturamento/medição por mês."""
+    aba_counts.plot(kind='bar', ax=ax, color='#003f70')
+
+    ax.set_xlabel('MÊS')
+    ax.set_ylabel('Diferenças')
+    ax.set_title('Diferença Faturamento/Medição')
+
+    for i, (index, value) in enumerate(aba_counts.items()):
+        ax.text(i, value, str(value), ha='center', va='bottom', color='black')
+
+
+def draw_situation_counts(ax, grouped, labels, title):
+    """Gráfico 7: medições por mês e situação agrupada (chart_data.SITUATION_GROUPS)."""
+    # Preparar os dados para o gráfico
+    aba_values = sorted(grouped.index)
+    plot_data = grouped.T  # Transpor para ter categorias nas linhas e ABAs nas colunas
+
+    # Plotar o gráfico de barras agrupadas
+    width = 0.08  # largura das barras
+    x = np.arange(len(aba_values))  # localização dos grupos no eixo x
+
+    for i, (label, values) in enumerate(plot_data.iterrows()):
+        bars = ax.bar(x + i * width, values, width, label=label)
+        labels.add_bars(bars, [f'{int(value)}' if value > 0 else '' for value in values],
+                        tips=[f'{aba}\n{label}: {int(value)}' for aba, value in zip(aba_values, values)])
+
+    # Configurações adicionais do gráfico
+    ax.set_title('Contagem de Situação por ABA')
+    ax.set_ylabel('Total')
+    ax.set_xlabel('ABA')
+    ax.set_xticks(x + width)
+    ax.set_xticklabels(aba_values)
+
+    # Mostrar a legenda
+    ax.legend()
+
+
+def draw_situation_by_resp(ax, grouped, labels, title):
+    """Gráfico 8: medições com situação preenchida por mês, empilhadas por RESP MEDIÇÃO."""
+    # Verificar se há dados para exibir
+    if grouped.empty:
+        ax.set_title('Nenhum dado disponível para exibir no gráfico')
+        return
+
+    aba_values = grouped.index.tolist()
+    resp_medicao_values = grouped.columns.tolist()
+
+    # Preparar o gráfico de barras empilhadas
+    width = 0.35  # largura das barras
+    x = np.arange(len(aba_values))  # localização dos grupos no eixo x
+
+    # Inicializar o array de valores empilhados para cada RESP MEDIÇÃO
+    bottom = np.zeros(len(aba_values))
+
+    # Definir um conjunto de cores
+    colors = colormaps['tab10'].colors  # Usar um colormap padrão do matplotlib para cores
+
+    # Iterar sobre cada 'RESP MEDIÇÃO'
+    for i, resp in enumerate(resp_medicao_values):
+        # Extrair os valores da contagem por RESP MEDIÇÃO
+        values = grouped[resp].values
+
+        # Plotar as barras empilhadas
+        bars = ax.bar(x, values, width, bottom=bottom, label=resp, color=colors[i % len(colors)])
+
+        # Atualizar o 'bottom' para a próxima barra empilhada
+        bottom += values
+
+        # Rótulos de dados com a contagem
+        labels.add_bars(bars, [f'{int(value)}' if value > 0 else '' for value in values],
+                        tips=[f'{aba}\n{resp}: {int(value)}' for aba, value in zip(aba_values, values)],
+                        label_type='center', fontsize=8, color='black')
+
+    # Configurações adicionais do gráfico
+    ax.set_title('Contagem de Situação por RESP MEDIÇÃO e ABA')
+    ax.set_ylabel('Total de Situações')
+    ax.set_xlabel('ABA')
+    ax.set_xticks(x)
+    ax.set_xticklabels(aba_values)
+
+    # Mostrar a legenda
+    ax.legend(title='RESP MEDIÇÃO')
+
+
+CHARTS = [
+    Chart('financeiro', "Valores de Medição / Faturamento", draw_financial),
+    Chart('variaveis', "Valores Variáveis", draw_variables),
+    Chart('cr', "Total por CR", draw_totals_by_cr),
+    Chart('faturamento', "Clientes com Medição Aberta/Fechada por Mês", draw_invoicing),
+    Chart('resp', "Contagem de RESP MEDIÇÃO por Mês", draw_counts_by_resp),
+    Chart('clientes', "Novos Clientes vs Clientes Finalizados por Mês", draw_client_flow),
+    Chart('locados', "Total de Carros Locados por Mês", draw_rented_by_resp),
+    Chart('diferencas', "Diferença Faturamento/Medição", draw_differences),
+    Chart('situacao', "Contagem de Situação por ABA", draw_situation_counts),
+    Chart('situacao_resp', "Contagem de Situação por PESSOA", draw_situation_by_resp),
+]
+CHARTS_BY_KEY = {chart.key: chart for chart in CHARTS}
+
+
+def render_chart(key, data, path, dpi=150):
+    """Desenha o gráfico sem tela (Agg) e grava o PNG; executado nos processos de trabalho."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    chart = CHARTS_BY_KEY[key]
+    figure = Figure(figsize=FIGSIZE)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    labels = ChartLabels(ax)
+    chart.draw(ax, data, labels, chart.title)
+    labels.update_labels()
+    figure.savefig(path, dpi=dpi)
+    return path
+
+
+def assemble_pdf(png_paths, pdf_path, dpi=150):
+    """Junta os PNGs num PDF, uma página por gráfico, no tamanho em que foram gravados."""
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+    from matplotlib.image import imread
+
+    with PdfPages(pdf_path) as pdf:
+        for path in png_paths:
+            image = imread(path)
+            height, width = image.shape[:2]
+            figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+            figure.figimage(image, resize=False)
+            pdf.savefig(figure, dpi=dpi)
+    return pdf_path
+
+
+def export_paths(directory, base_name):
+    """Caminhos dos PNGs (um por gráfico, na ordem de CHARTS) e do PDF da exportação em lote."""
+    folder = os.path.join(directory, base_name)
+    pngs = [os.path.join(folder, f'{position + 1:02d}_{chart.key}.png') for position, chart in enumerate(CHARTS)]
+    return folder, pngs, os.path.join(directory, f'{base_name}.pdf')
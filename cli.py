@@ -0,0 +1,134 @@
+"""Geração dos relatórios sem interface gráfica (verificação, fechamentos, comparação e matriz de status).
+
+Exemplo (agendamento noturno):
+    python cli.py --output-dir "C:/Relatorios" --format csv --compare 2405 2406
+
+Fechamento de vários meses (reports.py), um arquivo por mês:
+    python cli.py --output-dir "C:/Relatorios" --closure-reports mes --months 2401 2412
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import analytics
+import reports
+import snapshots
+import validation
+from export_service import EXPORT_FORMATS, build_export_path, export_dataframe
+from ingestion import READER_BACKEND, default_workbook_paths, load_workbooks
+from lifecycle import ClientLifecycle
+from periods import current_period, latest_period_until, period_axis
+from readers import BACKENDS, USED_COLUMNS
+
+REPORTS = ['verification', 'closures', 'comparison', 'status', 'issues']
+
+
+def build_reports(df, reports, compare=None, status_filter=None, issues=None):
+    """Calcula os relatórios pedidos; retorna {nome do arquivo: dataframe}.
+
+    issues é o relatório de problemas de validation.validate (relatório 'issues').
+    """
+    periods = period_axis(df['ABA'])
+    outputs = {}
+
+    if 'verification' in reports:
+        outputs['Relatório_de_Verificação'] = analytics.create_verification_dataframe(df)
+
+    if 'closures' in reports:
+        outputs['Fechamentos'] = analytics.closure_metrics(df, periods).reset_index()
+
+    if 'comparison' in reports:
+        month1, month2 = compare or (periods[-2:] if len(periods) >= 2 else (None, None))
+        if month1 is None:
+            print("Aviso: comparação ignorada (são necessários ao menos dois meses).", file=sys.stderr)
+        else:
+            outputs[f'Comparação_Meses_{month1}_{month2}'] = analytics.compare_months(df, month1, month2)
+
+    if 'status' in reports:
+        matrix = ClientLifecycle(df, periods).status_matrix()
+        if status_filter:
+            month = latest_period_until(periods, current_period())
+            matrix = analytics.filter_status_matrix(matrix, periods, month, set(status_filter))
+        outputs['Acomp_Status_Abertos'] = pd.DataFrame(matrix, columns=analytics.status_matrix_columns(periods))
+
+    if 'issues' in reports and issues is not None:
+        outputs['Problemas_nos_Dados'] = issues
+
+    return outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera os relatórios de medição sem abrir a interface gráfica.")
+    parser.add_argument('--input', nargs='+', help="planilha(s) RELATORIO GERAL MEDIÇÃO (padrão: pasta sincronizada)")
+    parser.add_argument('--output-dir', default='.', help="pasta de saída (padrão: pasta atual)")
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='xlsx', help="formato dos arquivos")
+    parser.add_argument('--reports', nargs='+', choices=REPORTS, default=REPORTS, help="relatórios a gerar")
+    parser.add_argument('--compare', nargs=2, metavar=('MES1', 'MES2'), help="meses da comparação (padrão: os dois últimos)")
+    parser.add_argument('--status-filter', help="status do mês atual a manter na matriz, ex.: AP (padrão: todos os clientes)")
+    parser.add_argument('--reader', choices=['auto'] + BACKENDS, default=READER_BACKEND, help="backend de leitura")
+    parser.add_argument('--snapshot', action='store_true', help="grava a carga no histórico local (snapshots.py)")
+    parser.add_argument('--closure-reports', choices=list(reports.LAYOUTS),
+                        help="gera também os relatórios de fechamento: um arquivo, um por mês ou um por RESP MEDIÇÃO")
+    parser.add_argument('--months', nargs=2, metavar=('INICIO', 'FIM'), help="meses dos relatórios de fechamento (padrão: todos)")
+    args = parser.parse_args(argv)
+
+    file_paths = args.input or default_workbook_paths()
+    if not file_paths:
+        print("Erro: nenhuma planilha encontrada; informe --input.", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    # O histórico guarda todas as colunas; sem ele, só as usadas nos cálculos são lidas
+    columns = None if args.snapshot else USED_COLUMNS
+    try:
+        df, issues = validation.validate(load_workbooks(file_paths, columns=columns, backend=args.reader))
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    loaded = time.perf_counter()
+    if len(issues):
+        print(f"Aviso: {len(issues)} problemas nos dados:", file=sys.stderr)
+        for (column, problem), count in validation.issue_summary(issues).items():
+            print(f"  {column}: {problem} ({count})", file=sys.stderr)
+
+    if args.snapshot:
+        try:
+            entry = snapshots.save_snapshot(df, file_paths)
+            print(f"Snapshot {entry['id']} gravado ({entry['rows']} linhas)", file=sys.stderr)
+        except (RuntimeError, OSError) as e:
+            print(f"Aviso: snapshot não gravado: {e}", file=sys.stderr)
+
+    try:
+        outputs = build_reports(df, args.reports, args.compare, args.status_filter, issues)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    current_time = datetime.now().strftime("%d-%m-%Y_%H-%M-%S")
+    for name, dataframe in outputs.items():
+        file_path = build_export_path(f"{name}_{current_time}", args.format, args.output_dir)
+        export_dataframe(dataframe, file_path, args.format)
+        print(f"{file_path} ({len(dataframe)} linhas)")
+
+    if args.closure_reports:
+        periods = period_axis(df['ABA'])
+        periods = reports.select_periods(periods, *args.months) if args.months else periods
+        paths = reports.build_closure_reports(
+            df, analytics.create_verification_dataframe(df), periods, args.closure_reports, args.output_dir,
+            base_name=f"FECHAMENTO_{current_time}",
+            progress=lambda done, total, path: print(f"[{done}/{total}] {path}"))
+        if not paths:
+            print("Aviso: nenhum mês no intervalo dos relatórios de fechamento.", file=sys.stderr)
+
+    done = time.perf_counter()
+    print(f"Leitura: {loaded - start:.2f} s | cálculos e gravação: {done - loaded:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
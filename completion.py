@@ -0,0 +1,82 @@
+"""Índice de busca por prefixo (e, opcionalmente, por trecho) para listas de autocompletar."""
+import heapq
+from bisect import bisect_left, bisect_right
+
+# Caractere acima de qualquer texto digitado, usado como limite superior da faixa de prefixo
+_MAX_CHAR = '\U0010ffff'
+
+
+class CompletionIndex:
+    """Lista ordenada pelo texto em minúsculas, com busca por prefixo via bisect.
+
+    A busca por trecho ("contém") usa um índice de trigramas montado na primeira consulta.
+    Com weights (ex.: quantidade de linhas de cada valor), os resultados vêm do maior peso
+    para o menor; sem pesos, em ordem alfabética.
+    """
+
+    def __init__(self, items=(), weights=None):
+        items = [str(item) for item in items]
+        weights = list(weights) if weights is not None else [0] * len(items)
+        triples = sorted(zip((item.lower() for item in items), items, weights))
+        self.keys = [key for key, _, _ in triples]
+        self.items = [item for _, item, _ in triples]
+        self.weights = [weight for _, _, weight in triples]
+        self.ranked = any(self.weights)
+        self._trigrams = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def prefix(self, text, limit=None):
+        """Itens que começam com text (sem diferenciar maiúsculas)."""
+        positions = self._prefix_range(text.lower())
+        if self.ranked:
+            return self._ranked(positions, limit)
+        if limit is not None:
+            positions = positions[:limit]
+        return self.items[positions.start:positions.stop]
+
+    def contains(self, text, limit=None):
+        """Itens que contêm text em qualquer posição."""
+        positions = self._contains_positions(text.lower())
+        if self.ranked:
+            return self._ranked(positions, limit)
+        hits = []
+        for position in positions:
+            hits.append(self.items[position])
+            if limit is not None and len(hits) >= limit:
+                break
+        return hits
+
+    def total_weight(self, text, match="prefix"):
+        """Soma dos pesos dos itens encontrados (ex.: linhas que o filtro por trecho vai manter)."""
+        text = text.lower()
+        positions = self._prefix_range(text) if match == "prefix" else self._contains_positions(text)
+        return sum(self.weights[position] for position in positions)
+
+    def _prefix_range(self, text):
+        start = bisect_left(self.keys, text)
+        return range(start, bisect_right(self.keys, text + _MAX_CHAR, lo=start))
+
+    def _contains_positions(self, text):
+        if len(text) < 3:
+            candidates = range(len(self.keys))
+        else:
+            trigrams = self._trigram_index()
+            # A menor lista de posições entre os trigramas do texto; a confirmação vem logo abaixo
+            candidates = min((trigrams.get(text[i:i + 3], ()) for i in range(len(text) - 2)), key=len)
+        return (position for position in candidates if text in self.keys[position])
+
+    def _ranked(self, positions, limit):
+        key = lambda position: (-self.weights[position], self.keys[position])
+        ordered = sorted(positions, key=key) if limit is None else heapq.nsmallest(limit, positions, key=key)
+        return [self.items[position] for position in ordered]
+
+    def _trigram_index(self):
+        if self._trigrams is None:
+            trigrams = {}
+            for position, key in enumerate(self.keys):
+                for trigram in {key[i:i + 3] for i in range(len(key) - 2)}:
+                    trigrams.setdefault(trigram, []).append(position)
+            self._trigrams = trigrams
+        return self._trigrams
@@ -0,0 +1,109 @@
+"""Cálculos das abas (comparação, matriz de status, métricas de fechamento) em processos separados.
+
+Cada pedido tem uma chave (ex.: 'comparacao'): um pedido novo com a mesma chave substitui o anterior.
+O anterior ainda na fila é cancelado; o que já está rodando termina, mas o resultado é descartado.
+Os argumentos são copiados para o processo no envio, então o cálculo usa os dados do momento do
+pedido mesmo que uma recarga troque o dataframe da interface. Os resultados voltam à thread do Tk
+por `after`, e on_busy(chave, ocupado) permite marcar a aba enquanto o cálculo roda.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+
+# Intervalo de verificação dos cálculos em andamento
+POLL_MS = 100
+
+# Processos do pool: os cálculos são curtos; dois permitem uma aba calcular enquanto outra espera
+MAX_WORKERS = 2
+
+
+class _Job:
+    def __init__(self, future, on_done, on_error, rows):
+        self.future = future
+        self.on_done = on_done
+        self.on_error = on_error
+        self.rows = rows
+        self.start = time.perf_counter()
+
+
+class ComputeExecutor:
+    """Pool de processos com um pedido ativo por chave, acompanhado pelo laço de eventos do Tk."""
+
+    def __init__(self, root, max_workers=None, on_busy=None, poll_ms=POLL_MS):
+        self.root = root
+        self.max_workers = max_workers or min(MAX_WORKERS, os.cpu_count() or 1)
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+        self.executor = None  # Criado no primeiro pedido
+        self.jobs = {}
+        self.polling = None
+
+    def submit(self, key, fn, *args, on_done, on_error=None, rows=None):
+        """Roda fn(*args) num processo e chama on_done(resultado) (ou on_error(exceção)) na thread
+        do Tk; um pedido anterior com a mesma chave é substituído. rows vai para o diagnóstico."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._discard(key)
+        self.jobs[key] = _Job(self.executor.submit(fn, *args), on_done, on_error, rows)
+        self._set_busy(key, True)
+        if self.polling is None:
+            self.polling = self.root.after(self.poll_ms, self._poll)
+
+    def busy(self, key):
+        return key in self.jobs
+
+    def cancel(self, key):
+        """Descarta o pedido da chave (o resultado, se vier, é ignorado)."""
+        if self._discard(key):
+            self._set_busy(key, False)
+
+    def cancel_all(self):
+        for key in list(self.jobs):
+            self.cancel(key)
+
+    def shutdown(self):
+        self.cancel_all()
+        if self.polling is not None:
+            self.root.after_cancel(self.polling)
+            self.polling = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _discard(self, key):
+        job = self.jobs.pop(key, None)
+        if job is not None:
+            job.future.cancel()  # Só tem efeito se ainda não começou
+        return job is not None
+
+    def _set_busy(self, key, busy):
+        if self.on_busy is not None:
+            self.on_busy(key, busy)
+
+    def _poll(self):
+        self.polling = None
+        for key, job in [(key, job) for key, job in self.jobs.items() if job.future.done()]:
+            if self.jobs.get(key) is not job:
+                continue  # Substituído por um callback anterior desta mesma passada
+            del self.jobs[key]
+            try:
+                self._set_busy(key, False)
+                self._deliver(key, job)
+            except Exception:
+                # Erro num callback não pode parar o acompanhamento dos demais pedidos
+                self.root.report_callback_exception(*sys.exc_info())
+        if self.jobs and self.polling is None:  # on_done pode ter feito um novo pedido
+            self.polling = self.root.after(self.poll_ms, self._poll)
+
+    def _deliver(self, key, job):
+        error = job.future.exception()
+        if error is None:
+            instrumentation.record(f'calculo:{key}', time.perf_counter() - job.start, rows=job.rows)
+            job.on_done(job.future.result())
+        elif job.on_error is not None:
+            job.on_error(error)
+        else:
+            raise error
@@ -0,0 +1,223 @@
+"""Serviço local de dados: lê e limpa a planilha uma vez e publica o resultado para todas as
+instâncias do programa na mesma máquina (ex.: servidor de terminais com vários analistas).
+
+O serviço grava os dados limpos num arquivo Arrow IPC sem compressão, o relatório de problemas da
+validação (validation.validate) num segundo arquivo Arrow e um arquivo de versão (current.json). As instâncias com PROGMEDICAO_DATA_SERVICE=1 mapeiam o arquivo em memória em vez
+de ler a planilha: as colunas de texto (a maior parte dos dados) são usadas direto do mapeamento,
+compartilhado pelo sistema entre as instâncias, e uma nova versão é detectada pelo arquivo de versão.
+
+Uso:
+    python data_service.py                      # planilhas da pasta sincronizada, verificadas a cada minuto
+    python data_service.py --input "RELATORIO GERAL MEDIÇÃO.xlsx" --interval 30 --snapshot
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import validation
+from export_service import parquet_ready
+from ingestion import default_workbook_paths, load_workbooks
+
+# Pasta comum a todos os usuários da máquina (ProgramData no Windows)
+SERVICE_DIR = os.environ.get('PROGMEDICAO_SERVICE_DIR') or os.path.join(
+    os.environ.get('PROGRAMDATA') or tempfile.gettempdir(), 'ProgMedicao', 'servico')
+CURRENT = 'current.json'
+
+# Intervalo, em segundos, entre as verificações de mudança nas planilhas
+CHECK_INTERVAL = 60
+
+# Versões mantidas na pasta: instâncias abertas podem ainda estar usando a anterior
+KEEP_VERSIONS = 2
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("O serviço de dados requer o pacote 'pyarrow'.")
+    return pyarrow
+
+
+def read_current(directory=SERVICE_DIR):
+    """Entrada da versão publicada (None quando o serviço ainda não publicou nada)."""
+    try:
+        with open(os.path.join(directory, CURRENT), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_arrow(dataframe, path):
+    pa = _require_pyarrow()
+    import pyarrow.ipc
+
+    table = pa.Table.from_pandas(parquet_ready(dataframe.reset_index(drop=True)), preserve_index=False)
+    with pa.OSFile(path + '.tmp', 'wb') as sink, pyarrow.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(path + '.tmp', path)
+    return table.num_rows
+
+
+def _issues_file(data_file):
+    """Arquivo do relatório de problemas da versão (dados-X.arrow -> problemas-X.arrow)."""
+    return 'problemas-' + data_file[len('dados-'):]
+
+
+def publish(dataframe, sources=(), directory=SERVICE_DIR, created=None, issues=None):
+    """Grava o dataframe limpo (e o relatório de problemas da validação) como nova versão
+    publicada; retorna a entrada de current.json."""
+    created = created or datetime.now()
+    os.makedirs(directory, exist_ok=True)
+    version = created.strftime('%Y%m%d-%H%M%S-%f')
+    file_name = f'dados-{version}.arrow'
+    path = os.path.join(directory, file_name)
+
+    rows = _write_arrow(dataframe, path)
+    issues_file = None
+    if issues is not None:
+        issues_file = _issues_file(file_name)
+        _write_arrow(issues, os.path.join(directory, issues_file))
+
+    entry = {
+        'version': version,
+        'file': file_name,
+        'issues': issues_file,
+        'created': created.isoformat(timespec='seconds'),
+        'rows': rows,
+        'sources': [os.path.basename(source) for source in sources],
+    }
+    # Grava num arquivo temporário e substitui, para nenhuma instância ler a versão pela metade
+    current = os.path.join(directory, CURRENT)
+    with open(current + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False, indent=1)
+    os.replace(current + '.tmp', current)
+    remove_old_versions(directory)
+    return entry
+
+
+def remove_old_versions(directory=SERVICE_DIR, keep=KEEP_VERSIONS):
+    """Apaga as versões além das keep mais recentes; as que ainda estão mapeadas por alguma
+    instância (no Windows não podem ser apagadas) ficam para a próxima publicação."""
+    paths = sorted(glob.glob(os.path.join(glob.escape(directory), 'dados-*.arrow')))
+    for path in paths[:-keep]:
+        issues_path = os.path.join(os.path.dirname(path), _issues_file(os.path.basename(path)))
+        for old in (path, issues_path):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+class DataServiceClient:
+    """Acesso de uma instância do programa aos dados publicados pelo serviço."""
+
+    def __init__(self, directory=SERVICE_DIR):
+        self.directory = directory
+        self.version = None  # Versão carregada por último
+        self.entry = None
+        self.issues = pd.DataFrame(columns=validation.ISSUE_COLUMNS)  # Relatório de problemas da versão carregada
+        self.failed = None  # Versão cuja carga falhou: não é tentada de novo por changed()
+
+    def available(self):
+        return read_current(self.directory) is not None
+
+    def changed(self):
+        """Há uma versão publicada diferente da carregada (e que não falhou)? (só lê o arquivo de versão)"""
+        entry = read_current(self.directory)
+        return entry is not None and entry['version'] not in (self.version, self.failed)
+
+    def load(self):
+        """Dataframe limpo da versão publicada, lido do arquivo mapeado em memória; o relatório de
+        problemas da versão fica em self.issues. Se a carga falhar, a versão é guardada em
+        self.failed e só volta a ser tentada por uma chamada direta a load()."""
+        pa = _require_pyarrow()
+        import pyarrow.ipc
+
+        entry = read_current(self.directory)
+        if entry is None:
+            raise RuntimeError(f"Nenhum dado publicado pelo serviço em {self.directory}")
+        try:
+            source = pa.memory_map(os.path.join(self.directory, entry['file']), 'r')
+            dataframe = pyarrow.ipc.open_file(source).read_all().to_pandas()
+            issues = self.issues.iloc[:0]
+            if entry.get('issues'):
+                with pa.memory_map(os.path.join(self.directory, entry['issues']), 'r') as issues_source:
+                    issues = pyarrow.ipc.open_file(issues_source).read_all().to_pandas()
+        except (OSError, ValueError) as e:
+            self.failed = entry['version']
+            raise RuntimeError(f"Versão {entry['version']} do serviço ilegível: {e}") from e
+        self.version, self.entry, self.issues, self.failed = entry['version'], entry, issues, None
+        return dataframe
+
+
+def _signature(file_paths):
+    """Caminho, tamanho e data de modificação de cada planilha, para detectar mudanças."""
+    signature = []
+    for path in file_paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_size, stat.st_mtime))
+    return signature
+
+
+def serve(file_paths=None, directory=SERVICE_DIR, interval=CHECK_INTERVAL, snapshot=False, once=False):
+    """Publica as planilhas e volta a publicar sempre que alguma muda (até ser interrompido)."""
+    published = None
+    while True:
+        paths = list(file_paths or default_workbook_paths())
+        signature = _signature(paths)
+        if signature and signature != published:
+            start = time.perf_counter()
+            try:
+                dataframe, issues = validation.validate(load_workbooks(paths))
+                entry = publish(dataframe, paths, directory, issues=issues)
+            except (OSError, ValueError, RuntimeError) as e:
+                # Ex.: planilha sendo sincronizada; tenta de novo na próxima verificação
+                print(f"Erro ao publicar os dados: {e}", file=sys.stderr)
+            else:
+                published = signature
+                print(f"Versão {entry['version']} publicada ({entry['rows']} linhas, "
+                      f"{time.perf_counter() - start:.1f} s)", file=sys.stderr)
+                if snapshot:
+                    import snapshots
+                    snapshots.save_snapshot(dataframe, paths)
+        elif not signature:
+            print("Nenhuma planilha encontrada.", file=sys.stderr)
+        if once:
+            return published is not None
+        time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publica os dados da planilha para as instâncias do programa nesta máquina.")
+    parser.add_argument('--input', nargs='+', help="planilha(s) RELATORIO GERAL MEDIÇÃO (padrão: pasta sincronizada)")
+    parser.add_argument('--dir', default=SERVICE_DIR, help="pasta dos dados publicados")
+    parser.add_argument('--interval', type=float, default=CHECK_INTERVAL, help="segundos entre as verificações")
+    parser.add_argument('--snapshot', action='store_true', help="grava cada versão no histórico local (snapshots.py)")
+    parser.add_argument('--once', action='store_true', help="publica uma vez e termina")
+    args = parser.parse_args(argv)
+
+    try:
+        _require_pyarrow()
+        ok = serve(args.input, args.dir, args.interval, args.snapshot, args.once)
+    except RuntimeError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support()
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Serviço de exportação das tabelas do programa (xlsx, csv em blocos e parquet)."""
+import os
+
+import pandas as pd
+
+from schema import DATE_FORMAT, EXCEL_DATE_FORMAT
+
+# Formatos suportados e suas extensões
+EXPORT_FORMATS = {
+    'xlsx': '.xlsx',
+    'csv': '.csv',
+    'parquet': '.parquet',
+}
+
+# Quantidade de linhas gravadas por bloco na exportação CSV
+CSV_CHUNK_ROWS = 50000
+
+
+def default_export_dir():
+    """Retorna a pasta padrão das exportações (Área de Trabalho do usuário)."""
+    return f"C:/Users/{os.getlogin()}/Desktop"
+
+
+def build_export_path(base_name, fmt, directory=None):
+    """Monta o caminho completo do arquivo exportado a partir do nome base e do formato."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+    directory = directory or default_export_dir()
+    return os.path.join(directory, f"{base_name}{EXPORT_FORMATS[fmt]}").replace('\\', '/')
+
+
+def export_dataframe(dataframe, file_path, fmt='xlsx', chunk_rows=CSV_CHUNK_ROWS):
+    """Exporta o dataframe no formato escolhido e retorna o caminho gravado (datas em dd/mm/aaaa
+    no xlsx e no csv; no parquet ficam como data)."""
+    if fmt == 'xlsx':
+        with excel_writer(file_path) as writer:
+            write_excel_sheet(dataframe, writer)
+    elif fmt == 'csv':
+        write_csv_chunked(dataframe, file_path, chunk_rows)
+    elif fmt == 'parquet':
+        write_parquet(dataframe, file_path)
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+    return file_path
+
+
+def excel_writer(file_path, **kwargs):
+    """pd.ExcelWriter com as células de data no formato dd/mm/aaaa."""
+    return pd.ExcelWriter(file_path, date_format=EXCEL_DATE_FORMAT, datetime_format=EXCEL_DATE_FORMAT, **kwargs)
+
+
+def write_excel_sheet(dataframe, writer, sheet_name='Sheet1'):
+    """Grava o dataframe numa planilha de excel_writer, com as colunas de data em dd/mm/aaaa."""
+    dataframe.to_excel(writer, sheet_name=sheet_name, index=False)
+    if writer.engine != 'openpyxl':
+        return
+    # O openpyxl ignora date_format/datetime_format do ExcelWriter: o formato vai célula a célula
+    sheet = writer.sheets[sheet_name]
+    for position, col in enumerate(dataframe.columns, start=1):
+        if pd.api.types.is_datetime64_any_dtype(dataframe[col]):
+            for (cell,) in sheet.iter_rows(min_row=2, min_col=position, max_col=position):
+                cell.number_format = EXCEL_DATE_FORMAT
+
+
+def write_csv_chunked(dataframe, file_path, chunk_rows=CSV_CHUNK_ROWS):
+    """Grava o CSV em blocos de linhas, sem montar o texto do arquivo inteiro em memória."""
+    # utf-8-sig para que o Excel reconheça os acentos ao abrir o arquivo
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as handle:
+        dataframe.iloc[:0].to_csv(handle, index=False)
+        for start in range(0, len(dataframe), chunk_rows):
+            dataframe.iloc[start:start + chunk_rows].to_csv(handle, index=False, header=False, date_format=DATE_FORMAT)
+
+
+def write_parquet(dataframe, file_path):
+    """Grava o dataframe em Parquet (requer pyarrow)."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError("A exportação em Parquet requer o pacote 'pyarrow'.")
+
+    parquet_ready(dataframe).to_parquet(file_path, index=False, engine='pyarrow', compression='zstd')
+
+
+def parquet_ready(dataframe):
+    """Converte para texto as colunas com tipos misturados, que o Parquet não aceita."""
+    converted = {}
+    for col in dataframe.columns:
+        series = dataframe[col]
+        if series.dtype != object:
+            continue
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+        if inferred not in ('string', 'empty', 'floating', 'integer', 'boolean', 'datetime', 'date'):
+            converted[col] = series.astype(str).mask(series.isna(), None)
+
+    if not converted:
+        return dataframe
+    result = dataframe.copy()
+    for col, series in converted.items():
+        result[col] = series
+    result.columns = [str(col) for col in result.columns]
+    return result
@@ -0,0 +1,69 @@
+"""Leitura de uma ou várias planilhas RELATORIO GERAL MEDIÇÃO (anos ou equipes) em paralelo."""
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+import readers
+
+WORKBOOK_NAME = 'RELATORIO GERAL MEDIÇÃO'
+
+# Backend de leitura (readers.BACKENDS); 'auto' usa o mais rápido instalado
+READER_BACKEND = os.environ.get('PROGMEDICAO_READER', 'auto')
+
+# Coluna adicionada quando mais de uma planilha é carregada
+SOURCE_COLUMN = 'ORIGEM'
+
+
+def candidate_folders():
+    """Pastas onde a planilha de fechamento costuma estar sincronizada."""
+    username = os.getlogin()
+    return [
+        f'C:\\Users\\{username}\\EBEC\\NC - Medicao - Documentos\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento',
+        'C:\\Users\\joana.conceicao.EBEC-SA.000\\EBEC\\NC - Medicao - Documentos\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento',
+        f'C:\\Users\\{username}\\EBEC\\NC - Medicao - Documentos.000\\003 - POWER BI MEDIÇÃO\\001 - RELATORIOS BI\\001 - Fechamento'
+    ]
+
+
+def find_workbooks(folder):
+    """Lista as planilhas da pasta (RELATORIO GERAL MEDIÇÃO.xlsx e variações por ano/equipe)."""
+    pattern = os.path.join(glob.escape(folder), f'{WORKBOOK_NAME}*.xlsx')
+    return sorted(path for path in glob.glob(pattern) if not os.path.basename(path).startswith('~$'))
+
+
+def default_workbook_paths():
+    """Planilhas da primeira pasta conhecida que contém a planilha principal."""
+    for folder in candidate_folders():
+        if os.path.exists(os.path.join(folder, f'{WORKBOOK_NAME}.xlsx')):
+            return find_workbooks(folder)
+    return []
+
+
+def read_workbook(file_path, columns=None, backend=READER_BACKEND):
+    """Lê uma planilha (executado nos processos de trabalho)."""
+    return readers.read_workbook(file_path, columns=columns, backend=backend)
+
+
+def load_workbooks(file_paths, columns=None, backend=READER_BACKEND, max_workers=None):
+    """Lê as planilhas em processos paralelos e concatena em um único dataframe com ABA em AAMM.
+
+    columns=None lê todas as colunas (a tabela principal exibe todas); readers.USED_COLUMNS
+    restringe a leitura às colunas usadas nos cálculos.
+    """
+    file_paths = list(file_paths)
+    if not file_paths:
+        raise ValueError("Nenhuma planilha informada para leitura.")
+
+    reader = partial(read_workbook, columns=columns, backend=backend)
+    if len(file_paths) == 1:
+        return reader(file_paths[0])
+
+    workers = max_workers or min(len(file_paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(reader, file_paths))
+    for file_path, frame in zip(file_paths, frames):
+        frame[SOURCE_COLUMN] = os.path.splitext(os.path.basename(file_path))[0]
+
+    return pd.concat(frames, ignore_index=True, sort=False)
@@ -0,0 +1,143 @@
+"""Medição de tempo, linhas e memória das fases e ações do programa, com log rotativo local."""
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+
+LOG_DIR = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), 'ProgMedicao')
+LOG_FILE = 'diagnostico.log'
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+# Registros mantidos em memória para a aba "Diagnóstico"
+MAX_RECORDS = 1000
+
+_records = deque(maxlen=MAX_RECORDS)
+_listeners = []
+_logger = logging.getLogger('progmedicao.diagnostico')
+_logger.propagate = False
+
+
+def configure_log(log_dir=LOG_DIR):
+    """Ativa a gravação dos registros em log rotativo (JSON por linha); retorna o caminho do arquivo."""
+    if _logger.handlers:
+        return _logger.handlers[0].baseFilename
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        handler = RotatingFileHandler(os.path.join(log_dir, LOG_FILE), maxBytes=LOG_MAX_BYTES,
+                                      backupCount=LOG_BACKUPS, encoding='utf-8')
+    except OSError:
+        return None  # Sem permissão de escrita: os registros continuam só em memória
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _logger.addHandler(handler)
+    _logger.setLevel(logging.INFO)
+    return handler.baseFilename
+
+
+def memory_bytes():
+    """Memória residente do processo em bytes (None quando não há como medir)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if sys.platform == 'win32':
+        return _windows_working_set()
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _windows_working_set():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+def record(phase, seconds, rows=None, memory_delta=None, **details):
+    """Registra uma medição já feita (ex.: tempos de inicialização)."""
+    entry = {
+        'time': datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        'phase': phase,
+        'seconds': round(seconds, 4),
+        'rows': rows,
+        'memory_mb': None if memory_delta is None else round(memory_delta / 2 ** 20, 2),
+    }
+    entry.update(details)
+    _records.append(entry)
+    if _logger.handlers:
+        _logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+    for listener in list(_listeners):
+        listener(entry)
+    return entry
+
+
+@contextmanager
+def measure(phase, rows=None, **details):
+    """Mede o bloco; o dicionário entregue aceita 'rows' definido durante a execução."""
+    info = {'rows': rows}
+    memory_before = memory_bytes()
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        elapsed = time.perf_counter() - start
+        memory_after = memory_bytes()
+        delta = None if memory_before is None or memory_after is None else memory_after - memory_before
+        record(phase, elapsed, info['rows'], delta, **details)
+
+
+def timed(phase):
+    """Decorador que mede a função; a quantidade de linhas vem do resultado quando ele tem tamanho."""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with measure(phase) as info:
+                result = function(*args, **kwargs)
+                if hasattr(result, '__len__'):
+                    info['rows'] = len(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def records():
+    """Registros em memória, do mais antigo ao mais recente."""
+    return list(_records)
+
+
+def clear():
+    _records.clear()
+
+
+def add_listener(listener):
+    """Chama listener(registro) a cada nova medição."""
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
@@ -0,0 +1,180 @@
+"""Ciclo de vida dos clientes ao longo dos meses (ABA): entrada, saída, finalização e retenção.
+
+Todos os cálculos partem de uma matriz cliente × mês montada numa única passada sobre os dados;
+a matriz de status da aba "Acompanhamento de Status" e o gráfico de clientes (gráfico 4) saem dela.
+"""
+import numpy as np
+import pandas as pd
+
+from analytics import OPEN_STATUSES
+
+# Códigos da matriz de status: meses com medição (A, F, O) e meses sem medição (P, X ou vazio)
+EMPTY, OPEN, FINALIZED, OTHER, PENDING, INACTIVE = range(6)
+STATUS_LETTERS = np.array(['', 'A', 'F', 'O', 'P', 'X'], dtype=object)
+
+# Mês base do acompanhamento: clientes que já aparecem até ele não contam como novos.
+# None usa o primeiro mês do eixo.
+BASELINE_PERIOD = None
+
+# Colunas lidas pela matriz (recorte enviado aos processos de cálculo)
+LIFECYCLE_COLUMNS = ['CLIENTE', 'ABA', 'STATUS', 'Nº MEDIÇÃO', 'RESP MEDIÇÃO']
+
+
+def _first_true(matrix):
+    """Coluna do primeiro True de cada linha (-1 quando a linha não tem nenhum)."""
+    if matrix.shape[1] == 0:
+        return np.full(matrix.shape[0], -1)
+    return np.where(matrix.any(axis=1), matrix.argmax(axis=1), -1)
+
+
+class ClientLifecycle:
+    """Matriz cliente × mês com o status de cada mês, na ordem em que os clientes aparecem na planilha.
+
+    Consideram-se só as linhas com CLIENTE, ABA, STATUS e Nº MEDIÇÃO preenchidos; quando o cliente
+    tem mais de uma linha no mesmo mês, vale a última para a letra da matriz de status e a primeira
+    para o RESP MEDIÇÃO. Finalizações (gráfico 4 e summary) contam qualquer linha FINALIZADO do mês.
+    """
+
+    def __init__(self, df, periods):
+        self.periods = list(periods)
+        data = df.dropna(subset=['CLIENTE', 'ABA', 'STATUS', 'Nº MEDIÇÃO'])
+        client_ids, self.clients = pd.factorize(data['CLIENTE'])
+        n_clients, n_periods = len(self.clients), len(self.periods)
+
+        # Primeira linha de cada cliente: fornece os 4 primeiros dígitos do Nº MEDIÇÃO
+        first_rows = np.unique(client_ids, return_index=True)[1]
+        self.measurement_prefix = (data['Nº MEDIÇÃO'].iloc[first_rows].astype(str)
+                                   .str.split('-').str[0].str[:4].to_numpy())
+
+        positions = pd.Index(self.periods).get_indexer(data['ABA'].astype(str))
+        in_axis = positions >= 0
+        client_ids, positions = client_ids[in_axis], positions[in_axis]
+        statuses = data['STATUS'].to_numpy()[in_axis]
+        resps = data['RESP MEDIÇÃO'].to_numpy()[in_axis] if 'RESP MEDIÇÃO' in data else np.full(len(statuses), '')
+
+        normalized = pd.Series(statuses, dtype=str).str.strip().str.upper()
+        codes = np.select([normalized.isin(OPEN_STATUSES), normalized == 'FINALIZADO'], [OPEN, FINALIZED], OTHER)
+
+        cells = client_ids * n_periods + positions
+        last = len(cells) - 1 - np.unique(cells[::-1], return_index=True)[1]
+        self.present_codes = np.zeros((n_clients, n_periods), dtype=np.int8)
+        self.present_codes.flat[cells[last]] = codes[last]
+
+        # Cliente com alguma linha FINALIZADO no mês, mesmo que não seja a última
+        self.finalized = np.zeros((n_clients, n_periods), dtype=bool)
+        self.finalized.flat[cells[codes == FINALIZED]] = True
+
+        first = np.unique(cells, return_index=True)[1]
+        self.first_resp = pd.Series(resps[first], index=cells[first])
+
+    @property
+    def present(self):
+        return self.present_codes != EMPTY
+
+    def status_codes(self):
+        """Códigos de todos os meses, incluindo os meses sem medição.
+
+        Mês sem medição logo após um mês aberto vira P (pendente), só na primeira vez para cada cliente;
+        meses sem medição depois de um mês finalizado viram X (inativo); os demais ficam vazios.
+        """
+        codes = self.present_codes.copy()
+        present = self.present
+        n_periods = codes.shape[1]
+        if n_periods == 0:
+            return codes
+
+        # Código do último mês com medição até cada coluna (EMPTY quando ainda não houve nenhum)
+        last_seen = np.maximum.accumulate(np.where(present, np.arange(n_periods), -1), axis=1)
+        last_code = np.where(last_seen >= 0, np.take_along_axis(codes, np.maximum(last_seen, 0), axis=1), EMPTY)
+
+        after_open = np.zeros_like(present)
+        after_open[:, 1:] = ~present[:, 1:] & (codes[:, :-1] == OPEN)
+        pending = after_open & (np.cumsum(after_open, axis=1) == 1)
+        codes[pending] = PENDING
+        codes[~present & ~pending & (last_code == FINALIZED)] = INACTIVE
+        return codes
+
+    def status_matrix(self, include_resp=True):
+        """Linhas [Nº Medição, Cliente, (RESP MEDIÇÃO), status de cada mês], como em analytics.status_matrix_columns."""
+        letters = STATUS_LETTERS[self.status_codes()]
+        columns = [self.measurement_prefix, np.asarray(self.clients, dtype=object)]
+        if include_resp:
+            columns.append(self.last_resp())
+        return np.column_stack(columns + [letters]).tolist() if len(self.clients) else []
+
+    def last_resp(self):
+        """RESP MEDIÇÃO do último mês em que cada cliente aparece ('' sem meses no eixo)."""
+        n_periods = len(self.periods)
+        last_position = self.last_positions()
+        cells = np.arange(len(self.clients)) * n_periods + np.maximum(last_position, 0)
+        resp = self.first_resp.reindex(cells).to_numpy(dtype=object, copy=True)
+        resp[last_position < 0] = ""
+        return resp
+
+    def first_positions(self):
+        return _first_true(self.present)
+
+    def last_positions(self):
+        reversed_first = _first_true(self.present[:, ::-1])
+        return np.where(reversed_first >= 0, len(self.periods) - 1 - reversed_first, -1)
+
+    def summary(self):
+        """Uma linha por cliente: primeiro e último mês com medição, mês da primeira finalização,
+        meses com medição e meses sem medição entre o primeiro e o último."""
+        axis = np.array(self.periods + [None], dtype=object)  # posição -1 -> None
+        first, last = self.first_positions(), self.last_positions()
+        finalized_at = _first_true(self.finalized)
+        active = self.present.sum(axis=1)
+        return pd.DataFrame({
+            'PRIMEIRO MÊS': axis[first],
+            'ÚLTIMO MÊS': axis[last],
+            'FINALIZADO EM': axis[finalized_at],
+            'MESES ATIVOS': active,
+            'MESES SEM MEDIÇÃO': np.where(first >= 0, last - first + 1 - active, 0),
+        }, index=pd.Index(self.clients, name='CLIENTE'))
+
+    def flow(self, baseline=BASELINE_PERIOD):
+        """Clientes por mês: ATIVOS (com medição), NOVOS (primeiro mês após o mês base),
+        FINALIZADOS (com status FINALIZADO no mês) e EVASÕES (deixaram de aparecer no mês
+        sem terem sido finalizados)."""
+        n_periods = len(self.periods)
+        baseline = self.periods[0] if baseline is None and self.periods else baseline
+        first, last = self.first_positions(), self.last_positions()
+
+        is_new = first >= 0
+        if baseline is not None:
+            is_new &= np.array(self.periods, dtype=object)[np.maximum(first, 0)] > baseline
+        new = np.bincount(first[is_new], minlength=n_periods)
+
+        last_finalized = self.finalized[np.arange(len(last)), np.maximum(last, 0)] if n_periods else last >= 0
+        churned = (last >= 0) & (last < n_periods - 1) & ~last_finalized
+        churn = np.bincount(last[churned] + 1, minlength=n_periods)
+
+        return pd.DataFrame({
+            'ATIVOS': self.present.sum(axis=0),
+            'NOVOS': new,
+            'FINALIZADOS': self.finalized.sum(axis=0),
+            'EVASÕES': churn,
+        }, index=pd.Index(self.periods, name='ABA'))
+
+    def retention(self):
+        """Retenção por coorte: para cada primeiro mês, a fração dos clientes com medição
+        0, 1, 2... meses depois (NaN além do último mês do eixo)."""
+        n_periods = len(self.periods)
+        first = self.first_positions()
+        in_cohort = first >= 0
+        first, present = first[in_cohort], self.present[in_cohort]
+
+        offsets = first[:, None] + np.arange(n_periods)
+        inside = offsets < n_periods
+        active = np.take_along_axis(present, np.minimum(offsets, n_periods - 1), axis=1) & inside
+
+        cohorts = pd.Index(self.periods, name='COORTE')[first]
+        counts = pd.DataFrame(active, index=cohorts).groupby(level=0).sum()
+        sizes = pd.Series(first, index=cohorts).groupby(level=0).size()
+        retention = counts.div(sizes, axis=0)
+        horizon = n_periods - pd.Index(self.periods).get_indexer(retention.index)
+        retention = retention.where(np.arange(n_periods) < horizon[:, None])
+        retention.columns.name = 'MESES DEPOIS'
+        return retention
+
@@ -0,0 +1,73 @@
+"""Eixo de períodos AAMM (coluna ABA) usado por todas as abas do programa."""
+from datetime import datetime
+
+import pandas as pd
+
+# Definição dos meses centralizada
+MESES = {
+    '01': 'Janeiro', '02': 'Fevereiro', '03': 'Março', '04': 'Abril', '05': 'Maio', '06': 'Junho',
+    '07': 'Julho', '08': 'Agosto', '09': 'Setembro', '10': 'Outubro', '11': 'Novembro', '12': 'Dezembro'
+}
+
+
+def normalize_period(values):
+    """Normaliza a coluna ABA para texto AAMM (2401, 2401.0 e ' 2401' viram '2401')."""
+    result = values.astype(str).str.strip()
+    numeric = pd.to_numeric(values, errors='coerce')
+    integral = numeric.notna() & (numeric % 1 == 0)
+    result[integral] = numeric[integral].astype('int64').astype(str).str.zfill(4)
+    return result
+
+
+def is_period(value):
+    """Indica se o valor é um período AAMM válido."""
+    value = str(value)
+    return len(value) == 4 and value.isdigit() and 1 <= int(value[2:]) <= 12
+
+
+def period_axis(values):
+    """Retorna a lista ordenada (cronológica) dos períodos AAMM presentes nos valores."""
+    return sorted(value for value in pd.unique(pd.Series(values).astype(str)) if is_period(value))
+
+
+def current_period(now=None):
+    """Período AAMM do mês corrente."""
+    now = now or datetime.now()
+    return now.strftime("%y%m")
+
+
+def period_year(period):
+    """Ano com quatro dígitos do período AAMM."""
+    return f"20{str(period)[:2]}"
+
+
+def period_label(period, with_year=False):
+    """Nome do mês do período (com o ano quando o eixo cobre mais de um ano)."""
+    period = str(period)
+    month = MESES.get(period[-2:], 'Desconhecido')
+    if with_year and is_period(period):
+        return f"{month}/{period[:2]}"
+    return month
+
+
+def spans_multiple_years(periods):
+    """Indica se o eixo de períodos cobre mais de um ano."""
+    return len({str(period)[:2] for period in periods}) > 1
+
+
+def years_label(periods):
+    """Rótulo dos anos cobertos pelo eixo ('Ano: 2024' ou 'Anos: 2024 a 2025')."""
+    years = sorted({period_year(period) for period in periods})
+    if not years:
+        return "Ano: -"
+    if len(years) == 1:
+        return f"Ano: {years[0]}"
+    return f"Anos: {years[0]} a {years[-1]}"
+
+
+def latest_period_until(periods, reference):
+    """Último período do eixo que não ultrapassa o período de referência."""
+    candidates = [period for period in periods if period <= reference]
+    if candidates:
+        return candidates[-1]
+    return periods[-1] if periods else None
@@ -0,0 +1,178 @@
+"""Camada de leitura das planilhas: backends selecionáveis, leitura só das colunas usadas e colunas numéricas compactas.
+
+As células são entregues como estão na planilha: textos em colunas numéricas (ex.: 'R$ 1.234,56')
+não viram NaN aqui, para que validation.validate os converta ou os aponte no relatório de problemas.
+"""
+import argparse
+import array
+import importlib.util
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from periods import normalize_period
+from schema import NUMERIC_COLUMNS, USED_COLUMNS
+
+BACKENDS = ['calamine', 'openpyxl-stream', 'pandas']
+
+
+def available_backends():
+    """Backends de leitura disponíveis neste ambiente."""
+    backends = []
+    if importlib.util.find_spec('python_calamine') is not None:
+        backends.append('calamine')
+    if importlib.util.find_spec('openpyxl') is not None:
+        backends.extend(['openpyxl-stream', 'pandas'])
+    return backends
+
+
+def resolve_backend(backend='auto'):
+    """Escolhe o backend: o informado, ou o mais rápido instalado quando 'auto'."""
+    available = available_backends()
+    if backend == 'auto':
+        if not available:
+            raise RuntimeError("Nenhum backend de leitura de xlsx instalado (openpyxl ou python-calamine).")
+        return available[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de leitura desconhecido: {backend}")
+    if backend not in available:
+        raise RuntimeError(f"O backend de leitura '{backend}' não está instalado.")
+    return backend
+
+
+def read_workbook(file_path, columns=None, backend='auto'):
+    """Lê a planilha com o backend escolhido; columns=None lê todas as colunas."""
+    backend = resolve_backend(backend)
+    if backend == 'openpyxl-stream':
+        df = read_workbook_stream(file_path, columns)
+    else:
+        engine = 'calamine' if backend == 'calamine' else None
+        usecols = (lambda col: col in columns) if columns is not None else None
+        df = pd.read_excel(file_path, usecols=usecols, engine=engine)
+
+    if 'ABA' in df.columns:
+        df['ABA'] = normalize_period(df['ABA'])
+    return df
+
+
+def _header_names(header):
+    """Nomes das colunas no mesmo padrão do pandas (Unnamed: n e duplicadas com .1, .2...)."""
+    names = []
+    seen = {}
+    for index, value in enumerate(header):
+        name = f"Unnamed: {index}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def read_workbook_stream(file_path, columns=None):
+    """Lê a planilha linha a linha em modo somente leitura, guardando só as colunas pedidas.
+
+    As colunas numéricas ficam em arrays de doubles; células que não são número nelas (texto,
+    booleanos) são guardadas à parte e devolvidas como estão, numa coluna object.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame(columns=columns or [])
+
+        names = _header_names(header)
+        selected = [(index, name) for index, name in enumerate(names) if columns is None or name in columns]
+        numeric = {name for _, name in selected if name in NUMERIC_COLUMNS}
+        # Colunas numéricas em array de doubles (8 bytes por célula em vez de um objeto float)
+        values = {name: array.array('d') if name in numeric else [] for _, name in selected}
+        raw = {name: {} for name in numeric}  # Posição -> célula não numérica, por coluna numérica
+        width = len(names)
+
+        for row in rows:
+            if not any(cell is not None for cell in row):
+                continue  # Linha em branco
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            for index, name in selected:
+                cell = row[index]
+                if name not in numeric:
+                    values[name].append(cell)
+                elif cell is None:
+                    values[name].append(math.nan)
+                elif isinstance(cell, (int, float)) and not isinstance(cell, bool):
+                    values[name].append(float(cell))
+                else:
+                    raw[name][len(values[name])] = cell
+                    values[name].append(math.nan)
+    finally:
+        workbook.close()
+
+    data = {name: np.frombuffer(column, dtype=float) if name in numeric else pd.Series(column, dtype=object)
+            for name, column in values.items()}
+    for name, cells in raw.items():
+        if cells:
+            column = data[name].astype(object)
+            column[list(cells)] = list(cells.values())
+            data[name] = column
+    return pd.DataFrame(data)
+
+
+def benchmark_backends(rows=20000, file_path=None, columns=None, repeat=1):
+    """Compara tempo e pico de memória de cada backend numa planilha sintética (ou na informada)."""
+    temp_dir = None
+    if file_path is None:
+        from synthetic import make_measurement_frame, write_workbook
+
+        temp_dir = tempfile.mkdtemp(prefix='progmedicao_bench_')
+        file_path = write_workbook(make_measurement_frame(rows), os.path.join(temp_dir, 'RELATORIO GERAL MEDIÇÃO.xlsx'))
+
+    results = []
+    try:
+        for backend in available_backends():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                df = read_workbook(file_path, columns=columns, backend=backend)
+                timings.append(time.perf_counter() - start)
+
+            # Pico de memória medido numa leitura à parte (o tracemalloc distorce o tempo)
+            tracemalloc.start()
+            read_workbook(file_path, columns=columns, backend=backend)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results.append({'backend': backend, 'seconds': min(timings), 'peak_mb': peak / 2 ** 20,
+                            'rows': len(df), 'columns': len(df.columns)})
+    finally:
+        if temp_dir is not None:
+            os.remove(file_path)
+            os.rmdir(temp_dir)
+    return sorted(results, key=lambda result: result['seconds'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara os backends de leitura da planilha de medição.")
+    parser.add_argument('--rows', type=int, default=20000, help="linhas da planilha sintética")
+    parser.add_argument('--file', help="planilha real a usar no lugar da sintética")
+    parser.add_argument('--used-columns', action='store_true', help="lê apenas as colunas usadas nos cálculos")
+    parser.add_argument('--repeat', type=int, default=1, help="repetições por backend (vale a melhor)")
+    args = parser.parse_args(argv)
+
+    columns = USED_COLUMNS if args.used_columns else None
+    for result in benchmark_backends(args.rows, args.file, columns, args.repeat):
+        print(f"{result['backend']:<16} {result['seconds']:8.2f} s  pico {result['peak_mb']:8.1f} MB  "
+              f"{result['rows']} linhas x {result['columns']} colunas")
+
+
+if __name__ == '__main__':
+    main()
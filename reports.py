@@ -0,0 +1,138 @@
+"""Relatórios de fechamento de vários meses (ABA) de uma vez, gerados em processos paralelos.
+
+Cada mês gera a planilha do mês, a das medições em aberto e a das diferenças faturamento/medição;
+cada arquivo tem ainda uma planilha "Métricas" com os números dos cards de fechamento. A saída é
+um único arquivo, um arquivo por mês ou um arquivo por RESP MEDIÇÃO.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from analytics import closure_metrics, open_mask
+from export_service import excel_writer, write_excel_sheet
+
+# Divisão dos arquivos: um só, um por mês ou um por RESP MEDIÇÃO
+LAYOUTS = {
+    'unico': "Um arquivo",
+    'mes': "Um arquivo por mês",
+    'resp': "Um arquivo por RESP MEDIÇÃO",
+}
+
+METRICS_SHEET = 'Métricas'
+
+# Arquivo das medições sem RESP MEDIÇÃO na divisão por responsável
+NO_RESP = 'SEM RESP'
+
+
+def select_periods(periods, first=None, last=None):
+    """Meses do eixo entre first e last (inclusive); None deixa o intervalo aberto daquele lado."""
+    return [aba for aba in periods if (first is None or aba >= first) and (last is None or aba <= last)]
+
+
+def month_sheets(aba, rows, differences):
+    """Planilhas de um mês: {nome da planilha: dataframe}."""
+    return {
+        f'{aba} Mensal': rows,
+        f'{aba} Abertos': rows[open_mask(rows)],
+        f'{aba} Diferenças': differences,
+    }
+
+
+def write_closure_workbook(path, months):
+    """Grava um arquivo com as planilhas de cada mês de months [(aba, linhas, diferenças)] e as
+    métricas (GERAL e uma linha por mês) das linhas incluídas. Roda nos processos de trabalho."""
+    abas = [aba for aba, _, _ in months]
+    rows = pd.concat([month_rows for _, month_rows, _ in months])
+    with excel_writer(path) as writer:
+        write_excel_sheet(closure_metrics(rows, abas).reset_index(), writer, METRICS_SHEET)
+        for aba, month_rows, differences in months:
+            for name, sheet in month_sheets(aba, month_rows, differences).items():
+                write_excel_sheet(sheet, writer, name)
+    return path
+
+
+def _resp_keys(rows):
+    """RESP MEDIÇÃO de cada linha como texto, com NO_RESP quando vazio."""
+    resp = rows['RESP MEDIÇÃO'].astype(str).str.strip()
+    return resp.mask(rows['RESP MEDIÇÃO'].isna() | (resp == ''), NO_RESP).to_numpy()
+
+
+def _file_label(value):
+    """Texto usável em nome de arquivo (sem os caracteres proibidos no Windows)."""
+    return re.sub(r'[\\/:*?"<>|]+', '_', str(value)).strip() or NO_RESP
+
+
+def _unique_labels(values):
+    """Rótulos de arquivo de cada valor, com sufixo _2, _3... quando dois valores diferentes caem no
+    mesmo nome (ex.: 'A/B' e 'A_B', ou 'Ana' e 'ANA' no Windows, que não diferencia maiúsculas)."""
+    labels, taken = [], set()
+    for value in values:
+        label = base = _file_label(value)
+        number = 1
+        while label.casefold() in taken:
+            number += 1
+            label = f"{base}_{number}"
+        taken.add(label.casefold())
+        labels.append(label)
+    return labels
+
+
+def plan_closure_reports(df, verification, periods, layout='unico', output_dir='.', base_name='FECHAMENTO', slices=None):
+    """Arquivos a gerar: lista de (caminho, [(aba, linhas, diferenças)]).
+
+    slices(aba) devolve as linhas do mês (ex.: o cache por ABA da interface); sem ele, as linhas
+    saem de um único agrupamento do dataframe.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Divisão de relatório desconhecida: {layout}")
+    if not periods:
+        return []
+    if slices is None:
+        positions = df.groupby('ABA').indices
+        empty = np.array([], dtype=np.intp)
+        slices = lambda aba: df.iloc[positions.get(aba, empty)]
+    difference_positions = verification.groupby('ABA').indices
+    months = [(aba, slices(aba), verification.iloc[difference_positions.get(aba, [])]) for aba in periods]
+
+    def path(label):
+        return os.path.join(output_dir, f"{base_name}_{label}.xlsx").replace('\\', '/')
+
+    if layout == 'unico':
+        return [(path(f"{periods[0]}-{periods[-1]}"), months)]
+    if layout == 'mes':
+        return [(path(aba), [(aba, rows, differences)]) for aba, rows, differences in months]
+
+    # Por RESP MEDIÇÃO: cada mês é dividido uma vez pelos grupos de RESP; medições sem RESP
+    # (vazio ou só espaços) vão para o arquivo SEM RESP
+    by_resp = {}
+    for aba, rows, differences in months:
+        row_groups = rows.groupby(_resp_keys(rows)).indices
+        difference_groups = differences.groupby(_resp_keys(differences)).indices
+        for resp, positions in row_groups.items():
+            by_resp.setdefault(resp, []).append(
+                (aba, rows.iloc[positions], differences.iloc[difference_groups.get(resp, [])]))
+    groups = sorted(by_resp.items(), key=lambda item: str(item[0]))
+    labels = _unique_labels(resp for resp, _ in groups)
+    return [(path(label), resp_months) for label, (_, resp_months) in zip(labels, groups)]
+
+
+def build_closure_reports(df, verification, periods, layout='unico', output_dir='.', base_name='FECHAMENTO',
+                          slices=None, max_workers=None, progress=None):
+    """Gera os arquivos de fechamento em processos paralelos (um arquivo por processo) e retorna os
+    caminhos gravados. progress(concluídos, total, caminho) é chamado a cada arquivo terminado,
+    na thread que chamou a função."""
+    plan = plan_closure_reports(df, verification, periods, layout, output_dir, base_name, slices)
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    workers = max(1, min(len(plan), max_workers or os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(write_closure_workbook, path, months) for path, months in plan]
+        for future in as_completed(futures):
+            written.append(future.result())
+            if progress is not None:
+                progress(len(written), len(plan), written[-1])
+    order = {path: i for i, (path, _) in enumerate(plan)}
+    return sorted(written, key=order.get)
@@ -0,0 +1,47 @@
+"""Colunas da planilha usadas pelo programa e o texto das datas na interface e nas exportações.
+
+Módulo sem dependências do programa: leitura, validação e cálculos importam as listas daqui.
+"""
+import pandas as pd
+
+# Colunas de ajustes do valor medido (vazias contam como 0)
+VALUE_COLUMNS = [
+    'GLOSA - MANUTENÇÃO', 'DESC COMERCIAL', 'KM EXCEDENTE', 'MULTA CONTRATUAL', 'AJUSTES / ACRÉCIMOS'
+]
+
+# Colunas numéricas (convertidas para float na validação; textos como "R$ 1.234,56" também)
+NUMERIC_COLUMNS = [
+    'VALOR FATURADO', 'PREVISÃO DE MEDIÇÃO', 'GLOSA - MANUTENÇÃO', 'DESC COMERCIAL', 'KM EXCEDENTE',
+    'MULTA CONTRATUAL', 'AJUSTES / ACRÉCIMOS', 'QTDE LOCADOS', 'QTDE RESERVA'
+]
+
+DATE_COLUMNS = ['FECH. CONT.', 'MEDIÇÃO EFETUADA', 'APROV CLIENTE', 'ENVIO FAT', 'FAT MEDIÇÃO']
+DATE_FORMAT = '%d/%m/%Y'  # Datas na planilha (quando digitadas como texto), na tela e nos CSVs
+EXCEL_DATE_FORMAT = 'DD/MM/YYYY'  # Formato das células de data nos xlsx exportados
+
+# Colunas usadas pelos cálculos (verificação, fechamentos, comparação, status e gráficos)
+USED_COLUMNS = [
+    'ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'Nº CR', 'ADM CONTRATO', 'RESP MEDIÇÃO', 'STATUS', 'SITUAÇÃO MED.',
+    'FECH. CONT.', 'MEDIÇÃO EFETUADA', 'APROV CLIENTE', 'ENVIO FAT', 'FAT MEDIÇÃO'
+] + NUMERIC_COLUMNS
+
+# Sem estas a planilha não é carregada; as demais de USED_COLUMNS, se ausentes, entram vazias
+REQUIRED_COLUMNS = [
+    'ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'STATUS', 'MEDIÇÃO EFETUADA', 'ENVIO FAT', 'FAT MEDIÇÃO',
+    'VALOR FATURADO', 'PREVISÃO DE MEDIÇÃO'
+]
+
+
+def display_text(series):
+    """Valores como texto, como aparecem na tabela (datas em dd/mm/aaaa; vazias continuam vazias)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime(DATE_FORMAT)
+    return series.astype(str)
+
+
+def display_frame(dataframe):
+    """Cópia com as colunas de data em texto dd/mm/aaaa, para preencher tabelas da interface."""
+    dates = [col for col in dataframe.columns if pd.api.types.is_datetime64_any_dtype(dataframe[col])]
+    if not dates:
+        return dataframe
+    return dataframe.assign(**{col: display_text(dataframe[col]) for col in dates})
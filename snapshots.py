@@ -0,0 +1,320 @@
+"""Histórico local das cargas da planilha (snapshots), para consultar e comparar estados anteriores.
+
+Cada snapshot é gravado por ABA: cada mês vira um bloco Parquet (zstd) identificado pelo hash do
+conteúdo, e meses que não mudaram entre cargas reaproveitam o bloco já gravado. O manifesto JSON
+lista os snapshots e os blocos de cada um; a política de retenção remove snapshots antigos e os
+blocos que deixam de ser usados. Gravação e retenção seguram uma trava do histórico (arquivo
+manifest.lock), para que duas cargas ao mesmo tempo (threads ou instâncias do programa) não
+percam entradas do manifesto nem apaguem blocos uma da outra.
+
+Uso:
+    python snapshots.py list
+    python snapshots.py diff 20240610-080000 20240614-080000 --output diferencas.xlsx
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from export_service import parquet_ready
+
+STORE_DIR = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), 'ProgMedicao', 'snapshots')
+MANIFEST = 'manifest.json'
+BLOCKS_DIR = 'blocos'
+LOCK_FILE = 'manifest.lock'
+
+# Espera máxima pela trava do histórico e idade a partir da qual ela é considerada abandonada
+# (processo encerrado no meio da gravação)
+LOCK_TIMEOUT = 60
+STALE_LOCK_SECONDS = 600
+
+# Retenção: todos os snapshots dos últimos KEEP_ALL_DAYS dias, o último de cada dia até
+# KEEP_DAILY_DAYS dias e o último de cada mês até KEEP_MONTHLY_MONTHS meses
+KEEP_ALL_DAYS = 7
+KEEP_DAILY_DAYS = 90
+KEEP_MONTHLY_MONTHS = 24
+
+# Chave das linhas na comparação entre snapshots
+DIFF_KEY = ['ABA', 'Nº MEDIÇÃO']
+
+
+def _read_manifest(store):
+    path = os.path.join(store, MANIFEST)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _tmp_path(path):
+    """Nome temporário próprio de cada processo e thread, para gravações simultâneas não se misturarem."""
+    return f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+
+
+def _write_manifest(store, snapshots):
+    # Grava num arquivo temporário e substitui, para não deixar o manifesto pela metade
+    path = os.path.join(store, MANIFEST)
+    tmp = _tmp_path(path)
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(snapshots, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _store_lock(store, timeout=LOCK_TIMEOUT):
+    """Trava exclusiva do histórico, entre threads e processos: o arquivo de trava é criado com O_EXCL."""
+    os.makedirs(store, exist_ok=True)
+    path = os.path.join(store, LOCK_FILE)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > STALE_LOCK_SECONDS:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue  # Liberada entre as duas chamadas
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Histórico de snapshots em uso por outra gravação ({path}).")
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode('ascii'))
+    finally:
+        os.close(fd)
+    try:
+        yield
+    finally:
+        os.remove(path)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("O histórico de snapshots requer o pacote 'pyarrow'.")
+    return pyarrow
+
+
+def _block_hash(block):
+    """Hash do conteúdo do bloco (nomes das colunas e valores, sem o índice)."""
+    digest = hashlib.sha256('\x1f'.join(map(str, block.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(block, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:32]
+
+
+def save_snapshot(dataframe, sources=(), store=STORE_DIR, created=None):
+    """Grava o dataframe (limpo, com ABA em AAMM) como novo snapshot; retorna a entrada do manifesto."""
+    pa = _require_pyarrow()
+    created = created or datetime.now()
+    data = parquet_ready(dataframe.reset_index(drop=True))
+    with _store_lock(store):
+        entry = _add_snapshot(pa, data, sources, store, created)
+        _retain(store, now=created)
+    return entry
+
+
+def _add_snapshot(pa, data, sources, store, created):
+    """Grava os blocos novos e acrescenta o snapshot ao manifesto (com a trava do histórico)."""
+    blocks_dir = os.path.join(store, BLOCKS_DIR)
+    os.makedirs(blocks_dir, exist_ok=True)
+    blocks = {}
+    for aba, block in data.groupby('ABA', sort=True, dropna=False):
+        block_id = _block_hash(block)
+        path = os.path.join(blocks_dir, f'{block_id}.parquet')
+        if not os.path.exists(path):  # Mês igual ao de uma carga anterior: o bloco já existe
+            tmp = _tmp_path(path)
+            pa.parquet.write_table(pa.Table.from_pandas(block, preserve_index=False), tmp, compression='zstd')
+            os.replace(tmp, path)
+        blocks[str(aba)] = block_id
+
+    snapshots = _read_manifest(store)
+    snapshot_id = created.strftime('%Y%m%d-%H%M%S')
+    if any(entry['id'] == snapshot_id for entry in snapshots):
+        snapshot_id = f"{snapshot_id}-{len(snapshots)}"
+    entry = {
+        'id': snapshot_id,
+        'created': created.isoformat(timespec='seconds'),
+        'rows': len(data),
+        'columns': [str(col) for col in data.columns],
+        'sources': [os.path.basename(source) for source in sources],
+        'blocks': blocks,
+    }
+    snapshots.append(entry)
+    _write_manifest(store, snapshots)
+    return entry
+
+
+def save_snapshot_in_background(dataframe, sources=(), store=STORE_DIR):
+    """Grava o snapshot numa thread separada; falhas (ex.: sem pyarrow, sem espaço) só são informadas no console."""
+    def save():
+        try:
+            save_snapshot(dataframe, sources, store)
+        except (RuntimeError, OSError, ValueError) as e:
+            print(f"Histórico de snapshots não gravado: {e}", file=sys.stderr)
+
+    thread = threading.Thread(target=save, name='snapshot', daemon=True)
+    thread.start()
+    return thread
+
+
+def list_snapshots(store=STORE_DIR):
+    """Snapshots gravados, do mais antigo ao mais recente."""
+    return _read_manifest(store)
+
+
+def get_snapshot(snapshot_id, store=STORE_DIR):
+    for entry in _read_manifest(store):
+        if entry['id'] == snapshot_id:
+            return entry
+    raise ValueError(f"Snapshot não encontrado: {snapshot_id}")
+
+
+def load_snapshot(snapshot_id, columns=None, periods=None, store=STORE_DIR):
+    """Lê um snapshot; columns e periods limitam a leitura às colunas e meses (ABA) pedidos."""
+    entry = get_snapshot(snapshot_id, store)
+    if columns is not None:
+        columns = [col for col in entry['columns'] if col in set(columns) | {'ABA'}]
+    blocks = [block_id for aba, block_id in entry['blocks'].items() if periods is None or aba in periods]
+    frames = [pd.read_parquet(os.path.join(store, BLOCKS_DIR, f'{block_id}.parquet'), columns=columns)
+              for block_id in blocks]
+    if not frames:
+        return pd.DataFrame(columns=columns or entry['columns'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def diff_snapshots(old, new, key=DIFF_KEY, columns=None, store=STORE_DIR):
+    """Diferenças linha a linha entre dois snapshots (ids ou dataframes), pela chave ABA + Nº MEDIÇÃO.
+
+    Retorna uma linha por chave com ALTERAÇÃO ('INCLUÍDA', 'REMOVIDA' ou 'ALTERADA'), as colunas
+    alteradas e os valores antes/depois de cada coluna comparada.
+    """
+    wanted = None if columns is None else list(key) + list(columns)
+    if isinstance(old, str):
+        old = load_snapshot(old, columns=wanted, store=store)
+    if isinstance(new, str):
+        new = load_snapshot(new, columns=wanted, store=store)
+    columns = [col for col in (columns or old.columns) if col in new.columns and col not in key]
+
+    # Chaves repetidas no mesmo snapshot são pareadas pela ordem de aparição
+    def keyed(frame):
+        frame = frame[list(key) + columns].astype({col: str for col in key})
+        return frame.assign(_ocorrencia=frame.groupby(list(key)).cumcount())
+
+    merged = keyed(old).merge(keyed(new), on=list(key) + ['_ocorrencia'], how='outer',
+                              suffixes=(' (ANTES)', ' (DEPOIS)'), indicator=True)
+
+    changed = pd.DataFrame(False, index=merged.index, columns=columns)
+    for col in columns:
+        before, after = merged[f'{col} (ANTES)'], merged[f'{col} (DEPOIS)']
+        same = (before == after) | (before.isna() & after.isna())
+        changed[col] = ~same.astype(bool)
+
+    both = merged['_merge'] == 'both'
+    status = pd.Series('ALTERADA', index=merged.index)
+    status[merged['_merge'] == 'left_only'] = 'REMOVIDA'
+    status[merged['_merge'] == 'right_only'] = 'INCLUÍDA'
+    keep = ~both | changed.any(axis=1)
+
+    # Nomes das colunas alteradas, separados por vírgula (vazio para incluídas/removidas)
+    changed_names = changed.where(both, False).dot(pd.Index(columns) + ', ').str.rstrip(', ')
+
+    result = merged[list(key)].assign(**{'ALTERAÇÃO': status, 'COLUNAS ALTERADAS': changed_names})
+    value_columns = [f'{col} {side}' for col in columns for side in ('(ANTES)', '(DEPOIS)')]
+    result = pd.concat([result, merged[value_columns]], axis=1)[keep]
+    return result.sort_values(list(key), kind='stable').reset_index(drop=True)
+
+
+def apply_retention(store=STORE_DIR, now=None, keep_all_days=KEEP_ALL_DAYS, keep_daily_days=KEEP_DAILY_DAYS,
+                    keep_monthly_months=KEEP_MONTHLY_MONTHS):
+    """Remove os snapshots fora da política de retenção e os blocos sem uso; retorna os ids removidos."""
+    with _store_lock(store):
+        return _retain(store, now, keep_all_days, keep_daily_days, keep_monthly_months)
+
+
+def _retain(store, now=None, keep_all_days=KEEP_ALL_DAYS, keep_daily_days=KEEP_DAILY_DAYS,
+            keep_monthly_months=KEEP_MONTHLY_MONTHS):
+    now = now or datetime.now()
+    snapshots = _read_manifest(store)
+    kept, last_of_day, last_of_month = [], {}, {}
+    for entry in snapshots:
+        created = datetime.fromisoformat(entry['created'])
+        last_of_day[created.date()] = entry['id']
+        last_of_month[(created.year, created.month)] = entry['id']
+
+    for entry in snapshots:
+        created = datetime.fromisoformat(entry['created'])
+        age = now - created
+        months = (now.year - created.year) * 12 + now.month - created.month
+        if (age <= timedelta(days=keep_all_days)
+                or (age <= timedelta(days=keep_daily_days) and last_of_day[created.date()] == entry['id'])
+                or (months <= keep_monthly_months and last_of_month[(created.year, created.month)] == entry['id'])):
+            kept.append(entry)
+
+    removed = [entry['id'] for entry in snapshots if entry not in kept]
+    if removed:
+        _write_manifest(store, kept)
+
+    # Blocos mais novos que o manifesto podem ser de uma gravação que ainda não entrou nele
+    used = {block_id for entry in kept for block_id in entry['blocks'].values()}
+    manifest = os.path.join(store, MANIFEST)
+    manifest_time = os.path.getmtime(manifest) if os.path.exists(manifest) else 0
+    blocks_dir = os.path.join(store, BLOCKS_DIR)
+    if os.path.isdir(blocks_dir):
+        for entry in os.scandir(blocks_dir):
+            if (entry.name.endswith('.parquet') and entry.name[:-len('.parquet')] not in used
+                    and entry.stat().st_mtime <= manifest_time):
+                os.remove(entry.path)
+    return removed
+
+
+def store_size(store=STORE_DIR):
+    """Espaço ocupado pelos blocos do histórico, em bytes."""
+    blocks_dir = os.path.join(store, BLOCKS_DIR)
+    if not os.path.isdir(blocks_dir):
+        return 0
+    return sum(entry.stat().st_size for entry in os.scandir(blocks_dir))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consulta o histórico de cargas da planilha.")
+    parser.add_argument('--store', default=STORE_DIR, help="pasta do histórico")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="lista os snapshots")
+    diff_parser = commands.add_parser('diff', help="compara dois snapshots")
+    diff_parser.add_argument('old')
+    diff_parser.add_argument('new')
+    diff_parser.add_argument('--columns', nargs='+', help="colunas comparadas (padrão: todas)")
+    diff_parser.add_argument('--output', help="grava as diferenças (xlsx, csv ou parquet pela extensão)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for entry in list_snapshots(args.store):
+            print(f"{entry['id']}  {entry['rows']:>8} linhas  {len(entry['blocks']):>3} meses  {', '.join(entry['sources'])}")
+        print(f"Espaço em disco: {store_size(args.store) / 2 ** 20:.1f} MB")
+        return 0
+
+    try:
+        differences = diff_snapshots(args.old, args.new, columns=args.columns, store=args.store)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(differences['ALTERAÇÃO'].value_counts().to_string())
+    if args.output:
+        from export_service import export_dataframe
+        export_dataframe(differences, args.output, os.path.splitext(args.output)[1].lstrip('.'))
+        print(f"Diferenças gravadas em {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
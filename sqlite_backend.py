@@ -0,0 +1,95 @@
+"""Armazenamento opcional dos dados limpos em SQLite local, com índices para os filtros da tabela principal.
+
+Ativado com PROGMEDICAO_BACKEND=sqlite: a tabela principal passa a ser filtrada por consultas
+indexadas e paginadas, em vez de varrer o dataframe inteiro a cada ação.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from export_service import parquet_ready
+from schema import display_frame
+
+DB_PATH = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), 'ProgMedicao', 'dados.sqlite')
+TABLE = 'medicoes'
+
+# Colunas com índice (filtro rápido por mês, buscas por cliente/medição/CR e consultas de status)
+INDEXED_COLUMNS = ['ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'Nº CR', 'RESP MEDIÇÃO', 'STATUS']
+
+# Linhas gravadas por lote na carga e linhas por página nas consultas da tabela principal
+INSERT_CHUNK_ROWS = 50000
+PAGE_ROWS = 5000
+
+
+def _casefold(value):
+    return None if value is None else str(value).casefold()
+
+
+def _quote(name):
+    """Nome de coluna entre aspas duplas (as colunas da planilha têm espaços, acentos e barras)."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SqliteStore:
+    """Tabela única com os dados limpos da última carga, mais uma tabela de metadados."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A carga pode rodar numa thread separada; as consultas só começam depois que ela termina
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # lower() do SQLite só converte letras ASCII ('MEDIÇÃO' -> 'mediÇÃo'); os filtros de texto usam
+        # o casefold do Python, que trata os acentos como o filtro do dataframe
+        self.connection.create_function('casefold', 1, _casefold, deterministic=True)
+
+    def close(self):
+        self.connection.close()
+
+    def load(self, dataframe, chunk_rows=INSERT_CHUNK_ROWS):
+        """Substitui os dados gravados pelo dataframe e recria os índices (datas gravadas como o
+        texto dd/mm/aaaa da tabela, para os filtros de texto acharem o mesmo que no dataframe)."""
+        data = parquet_ready(display_frame(dataframe.reset_index(drop=True)))
+        with self.connection:
+            data.to_sql(TABLE, self.connection, index=False, if_exists='replace', chunksize=chunk_rows)
+            for col in INDEXED_COLUMNS:
+                if col in data.columns:
+                    self.connection.execute(f"CREATE INDEX {_quote('ix_' + col)} ON {TABLE} ({_quote(col)})")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('carregado_em', ?)",
+                                    (datetime.now().isoformat(timespec='seconds'),))
+        self.connection.execute("ANALYZE")
+        return len(data)
+
+    def columns(self):
+        return [row[1] for row in self.connection.execute(f"PRAGMA table_info({TABLE})")]
+
+    def _where(self, contains=(), equals=None):
+        """Cláusula WHERE: (coluna, texto) de contains buscam o trecho sem diferenciar maiúsculas;
+        equals {coluna: valor} usa igualdade (e os índices)."""
+        clauses, params = [], []
+        for column, value in equals.items() if equals else ():
+            clauses.append(f"{_quote(column)} = ?")
+            params.append(value)
+        for column, text in contains:
+            if column and text:
+                clauses.append(f"instr(casefold(CAST({_quote(column)} AS TEXT)), ?) > 0")
+                params.append(_casefold(text))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, contains=(), equals=None, limit=PAGE_ROWS, offset=0):
+        """Linhas que atendem aos filtros, na ordem da planilha; limit=None traz todas."""
+        where, params = self._where(contains, equals)
+        sql = f"SELECT * FROM {TABLE}{where} ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def count(self, contains=(), equals=None):
+        where, params = self._where(contains, equals)
+        return self.connection.execute(f"SELECT COUNT(*) FROM {TABLE}{where}", params).fetchone()[0]
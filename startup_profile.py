@@ -0,0 +1,56 @@
+"""Tempo de importação dos módulos do programa, para acompanhar o tempo até a primeira janela.
+
+Uso:
+    python startup_profile.py            # importações feitas na abertura do programa
+    python startup_profile.py --charts   # inclui o matplotlib/TkAgg (importado ao abrir "Gráficos")
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__main__.py')
+
+# Carrega o módulo do programa sem executar o bloco principal (não abre a janela)
+LOAD_APP = (
+    "import importlib.util, sys; sys.path.insert(0, {folder!r}); "
+    "spec = importlib.util.spec_from_file_location('progmedicao', {path!r}); "
+    "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module)"
+)
+
+
+def import_times(charts=False):
+    """Executa a importação num processo novo com -X importtime e retorna [(módulo, próprio_ms, acumulado_ms)]."""
+    code = LOAD_APP.format(folder=os.path.dirname(APP_PATH), path=APP_PATH)
+    if charts:
+        code += "; module.load_chart_backend()"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, check=True)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Só os módulos de primeiro nível (sem recuo), que somam o custo de seus submódulos
+        if name.startswith(' ') and not name.startswith('  '):
+            entries.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mostra o tempo de importação dos módulos do programa.")
+    parser.add_argument('--charts', action='store_true', help="inclui o backend de gráficos (matplotlib/TkAgg)")
+    parser.add_argument('--top', type=int, default=15, help="quantidade de módulos exibidos")
+    args = parser.parse_args(argv)
+
+    entries = import_times(args.charts)
+    total = sum(cumulative for _, _, cumulative in entries)
+    print(f"{'módulo':<40} {'acumulado (ms)':>15} {'%':>6}")
+    for name, _, cumulative in sorted(entries, key=lambda entry: entry[2], reverse=True)[:args.top]:
+        print(f"{name:<40} {cumulative:>15.1f} {cumulative / total * 100:>6.1f}")
+    print(f"{'total':<40} {total:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
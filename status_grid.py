@@ -0,0 +1,230 @@
+"""Grade da matriz de status (aba "Acompanhamento de Status") desenhada num Canvas.
+
+Só as células visíveis são desenhadas: a grade guarda as linhas em memória e, a cada rolagem ou
+redimensionamento, reposiciona um conjunto fixo de retângulos e textos (reaproveitados) sobre a
+janela visível. Cada célula de mês recebe a cor do seu status, e as colunas de identificação do
+cliente ficam fixas à esquerda ao rolar pelos meses.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+ROW_HEIGHT = 22
+HEADER_HEIGHT = 24
+CHAR_PX = 7  # Largura aproximada de um caractere, para cortar textos maiores que a coluna
+
+# Cores das células de mês por status (ver lifecycle.STATUS_LETTERS)
+STATUS_COLORS = {
+    'A': '#CCE5FF',  # Aberto
+    'F': '#C8E6C9',  # Finalizado
+    'O': '#FFE0B2',  # Outros status
+    'P': '#FFCCCC',  # Pendente
+    'X': '#D3D3D3',  # Inativo (encerrado)
+}
+STATUS_NAMES = {'A': 'Aberto', 'F': 'Finalizado', 'O': 'Outro', 'P': 'Pendente', 'X': 'Encerrado'}
+ROW_COLORS = ('#f2f2f2', 'white')
+HEADER_COLOR = '#e1e1e1'
+GRID_COLOR = '#c8c8c8'
+
+# Linhas roladas por passo da roda do mouse
+WHEEL_ROWS = 3
+
+
+class _CellPool:
+    """Retângulos e textos de uma área da grade, criados sob demanda e reaproveitados."""
+
+    def __init__(self, canvas, tag, anchor='w'):
+        self.canvas = canvas
+        self.tag = tag
+        self.anchor = anchor
+        self.items = []
+        self.used = 0
+
+    def start(self):
+        self.used = 0
+
+    def cell(self, x, y, width, height, text, fill, font=None):
+        canvas = self.canvas
+        if self.used == len(self.items):
+            rect = canvas.create_rectangle(0, 0, 0, 0, outline=GRID_COLOR, tags=(self.tag,))
+            label = canvas.create_text(0, 0, anchor=self.anchor, tags=(self.tag,))
+            self.items.append((rect, label))
+        rect, label = self.items[self.used]
+        self.used += 1
+        max_chars = max(int((width - 8) // CHAR_PX), 1)
+        if len(text) > max_chars:
+            text = text[:max_chars - 1] + '…'
+        canvas.coords(rect, x, y, x + width, y + height)
+        canvas.itemconfigure(rect, fill=fill, state='normal')
+        canvas.coords(label, x + width / 2 if self.anchor == 'center' else x + 4, y + height / 2)
+        canvas.itemconfigure(label, text=text, state='normal', font=font or '')
+
+    def finish(self):
+        """Esconde os itens não usados nesta passada."""
+        for rect, label in self.items[self.used:]:
+            self.canvas.itemconfigure(rect, state='hidden')
+            self.canvas.itemconfigure(label, state='hidden')
+
+
+class StatusGrid(ttk.Frame):
+    """Tabela somente leitura com cores por célula de status; as `frozen` primeiras colunas ficam fixas.
+
+    Clicar num cabeçalho ordena as linhas pela coluna (clicar de novo inverte a ordem).
+    """
+
+    def __init__(self, master, columns, widths, frozen=0, header_font=None):
+        super().__init__(master)
+        self.rows = []
+        self.sort_state = None  # (coluna, decrescente)
+        self.y = 0  # Deslocamento vertical e horizontal (pixels) da área rolável
+        self.x = 0
+        self.header_font = header_font
+
+        self.canvas = tk.Canvas(self, background='white', highlightthickness=0)
+        self.scroll_y = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scroll_x = ttk.Scrollbar(self, orient="horizontal", command=self.xview)
+        self.scroll_y.pack(side="right", fill="y")
+        self.scroll_x.pack(side="bottom", fill="x")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        # Ordem de criação das áreas = ordem de empilhamento inicial; redraw() reforça com tag_raise
+        self.body = _CellPool(self.canvas, 'body', anchor='center')
+        self.frozen_body = _CellPool(self.canvas, 'frozen_body')
+        self.header = _CellPool(self.canvas, 'header', anchor='center')
+        self.frozen_header = _CellPool(self.canvas, 'frozen_header')
+        self.set_columns(columns, widths, frozen)
+
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Shift-MouseWheel>", lambda event: self.on_wheel(event, horizontal=True))
+        self.canvas.bind("<Button-4>", lambda event: self.yview('scroll', -WHEEL_ROWS, 'units'))
+        self.canvas.bind("<Button-5>", lambda event: self.yview('scroll', WHEEL_ROWS, 'units'))
+
+    def set_columns(self, columns, widths, frozen=0):
+        self.columns = list(columns)
+        self.widths = list(widths)
+        self.frozen = frozen
+        self.frozen_width = sum(self.widths[:frozen])
+        # Início de cada coluna rolável, medido a partir do fim das colunas fixas
+        self.offsets = []
+        position = 0
+        for width in self.widths[frozen:]:
+            self.offsets.append(position)
+            position += width
+        self.scroll_width = position
+        self.sort_state = None
+
+    def set_rows(self, rows):
+        """Substitui as linhas exibidas (listas na ordem das colunas) e volta ao topo."""
+        self.rows = list(rows)
+        self.y = 0
+        if self.sort_state is not None:
+            column, descending = self.sort_state
+            self.rows.sort(key=lambda row: str(row[column]), reverse=descending)
+        self.redraw()
+
+    def sort_by(self, column):
+        descending = self.sort_state == (column, False)
+        self.sort_state = (column, descending)
+        self.rows.sort(key=lambda row: str(row[column]), reverse=descending)
+        self.redraw()
+
+    def _view_size(self):
+        return max(self.canvas.winfo_width() - self.frozen_width, 1), max(self.canvas.winfo_height() - HEADER_HEIGHT, 1)
+
+    def _clamp(self):
+        view_width, view_height = self._view_size()
+        self.y = min(max(self.y, 0), max(len(self.rows) * ROW_HEIGHT - view_height, 0))
+        self.x = min(max(self.x, 0), max(self.scroll_width - view_width, 0))
+
+    def yview(self, action, amount, unit=None):
+        _, view_height = self._view_size()
+        total = len(self.rows) * ROW_HEIGHT
+        if action == 'moveto':
+            self.y = float(amount) * total
+        else:
+            self.y += int(amount) * (ROW_HEIGHT if unit == 'units' else view_height)
+        self.redraw()
+
+    def xview(self, action, amount, unit=None):
+        view_width, _ = self._view_size()
+        if action == 'moveto':
+            self.x = float(amount) * self.scroll_width
+        else:
+            self.x += int(amount) * (min(self.widths[self.frozen:] or [ROW_HEIGHT]) if unit == 'units' else view_width)
+        self.redraw()
+
+    def on_wheel(self, event, horizontal=False):
+        steps = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        if horizontal:
+            self.xview('scroll', steps, 'units')
+        else:
+            self.yview('scroll', steps * WHEEL_ROWS, 'units')
+
+    def column_at(self, x):
+        """Coluna sob a coordenada x do canvas (None fora das colunas)."""
+        if x < self.frozen_width:
+            position = 0
+            for column, width in enumerate(self.widths[:self.frozen]):
+                position += width
+                if x < position:
+                    return column
+        x = x - self.frozen_width + self.x
+        for i, offset in enumerate(self.offsets):
+            if offset <= x < offset + self.widths[self.frozen + i]:
+                return self.frozen + i
+        return None
+
+    def on_click(self, event):
+        if event.y < HEADER_HEIGHT:
+            column = self.column_at(event.x)
+            if column is not None:
+                self.sort_by(column)
+
+    def _header_text(self, column):
+        text = str(self.columns[column])
+        if self.sort_state is not None and self.sort_state[0] == column:
+            text += ' ▼' if self.sort_state[1] else ' ▲'
+        return text
+
+    def redraw(self):
+        """Reposiciona as células para a janela visível (só linhas e colunas à vista)."""
+        self._clamp()
+        view_width, view_height = self._view_size()
+        for pool in (self.body, self.frozen_body, self.header, self.frozen_header):
+            pool.start()
+
+        # Colunas roláveis com alguma parte na janela visível
+        visible = [(self.frozen + i, self.frozen_width + offset - self.x)
+                   for i, offset in enumerate(self.offsets)
+                   if offset + self.widths[self.frozen + i] > self.x and offset < self.x + view_width]
+        frozen = []
+        position = 0
+        for column in range(self.frozen):
+            frozen.append((column, position))
+            position += self.widths[column]
+
+        first = int(self.y // ROW_HEIGHT)
+        last = min(len(self.rows), int((self.y + view_height) // ROW_HEIGHT) + 1)
+        for index in range(first, last):
+            row = self.rows[index]
+            top = HEADER_HEIGHT + index * ROW_HEIGHT - self.y
+            stripe = ROW_COLORS[index % 2]
+            for column, left in frozen:
+                self.frozen_body.cell(left, top, self.widths[column], ROW_HEIGHT, str(row[column]), stripe)
+            for column, left in visible:
+                value = row[column]
+                self.body.cell(left, top, self.widths[column], ROW_HEIGHT, str(value), STATUS_COLORS.get(value, stripe))
+
+        for column, left in visible:
+            self.header.cell(left, 0, self.widths[column], HEADER_HEIGHT, self._header_text(column), HEADER_COLOR, self.header_font)
+        for column, left in frozen:
+            self.frozen_header.cell(left, 0, self.widths[column], HEADER_HEIGHT, self._header_text(column), HEADER_COLOR, self.header_font)
+
+        for pool in (self.body, self.frozen_body, self.header, self.frozen_header):
+            pool.finish()
+            self.canvas.tag_raise(pool.tag)
+
+        total_height = len(self.rows) * ROW_HEIGHT
+        self.scroll_y.set(*((self.y / total_height, min((self.y + view_height) / total_height, 1.0)) if total_height else (0, 1)))
+        self.scroll_x.set(*((self.x / self.scroll_width, min((self.x + view_width) / self.scroll_width, 1.0)) if self.scroll_width else (0, 1)))
@@ -0,0 +1,112 @@
+"""Gerador de planilhas sintéticas no formato da RELATORIO GERAL MEDIÇÃO (para medições de desempenho)."""
+import numpy as np
+import pandas as pd
+
+RESPONSAVEIS = ['ANA', 'BRUNO', 'CARLA', 'DIEGO', 'ELISA', 'FABIO']
+STATUS_VALUES = ['ATIVO', 'FINALIZADO', 'AG. FAT.', 'PARCIAL', 'CANCELADO']
+
+# Proporção de cada status em STATUS_VALUES: mês típico, início de mês (muitos abertos) e mês fechado
+STATUS_MIXES = {
+    'padrao': [0.35, 0.45, 0.08, 0.07, 0.05],
+    'abertos': [0.55, 0.15, 0.15, 0.12, 0.03],
+    'fechado': [0.05, 0.85, 0.03, 0.02, 0.05],
+}
+
+# Formato das colunas de data: texto dd/mm/aaaa, datas do Excel (datetime) ou os dois misturados
+DATE_FORMATS = ['texto', 'datetime', 'misto']
+
+# Tamanhos usados nas medições de desempenho
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SITUACOES = [
+    'PARCIAL', 'AG. CLIENTE', 'AG. APROV.', 'AG. MANUT.', 'AG. COMERCIAL', 'AG. FAT.', '1° TENTATIVA',
+    '2° TENTATIVA', 'ENVIO S/ APROV.', 'CNPJ', "LET'S", 'AG. CANCEL FAT.', 'AG. DOC', 'FINALIZADA'
+]
+
+
+def default_periods(years=('24',)):
+    """Períodos AAMM de janeiro a dezembro dos anos informados."""
+    return [f"{year}{month:02d}" for year in years for month in range(1, 13)]
+
+
+def _dates(rng, periods, fill_rate, day_offset, date_format='texto'):
+    """Datas dentro do mês de cada linha (vazias conforme a taxa de preenchimento)."""
+    rows = len(periods)
+    days = np.clip(rng.integers(1, 28, rows) + day_offset, 1, 28)
+    empty = rng.random(rows) > fill_rate
+
+    if date_format == 'texto':
+        as_text = np.ones(rows, dtype=bool)
+    elif date_format == 'datetime':
+        as_text = np.zeros(rows, dtype=bool)
+    elif date_format == 'misto':
+        as_text = rng.random(rows) < 0.5
+    else:
+        raise ValueError(f"Formato de data desconhecido: {date_format} (use {', '.join(DATE_FORMATS)}).")
+
+    result = pd.Series(None, index=periods.index, dtype=object)
+    text = ~empty & as_text
+    if text.any():
+        day_text = pd.Series(days[text]).astype(str).str.zfill(2).to_numpy()
+        result[text] = day_text + '/' + periods[text].str[2:].to_numpy() + '/20' + periods[text].str[:2].to_numpy()
+    timestamps = ~empty & ~as_text
+    if timestamps.any():
+        result[timestamps] = list(pd.to_datetime(pd.DataFrame({
+            'year': 2000 + periods[timestamps].str[:2].astype(int).to_numpy(),
+            'month': periods[timestamps].str[2:].astype(int).to_numpy(),
+            'day': days[timestamps],
+        })))
+    return result
+
+
+def make_measurement_frame(rows, periods=None, clients=None, seed=0, status_mix='padrao', date_format='texto'):
+    """Gera um dataframe com as colunas, ABAs, status e formatos de data da planilha real.
+
+    status_mix escolhe a proporção de STATUS_MIXES e date_format um de DATE_FORMATS; uma pequena
+    parte das linhas vem com RESP MEDIÇÃO vazio e SITUAÇÃO MED. em branco, como na planilha.
+    """
+    rng = np.random.default_rng(seed)
+    periods = periods or default_periods()
+    clients = clients or max(10, rows // 20)
+    if status_mix not in STATUS_MIXES:
+        raise ValueError(f"Proporção de status desconhecida: {status_mix} (use {', '.join(STATUS_MIXES)}).")
+
+    client_ids = rng.integers(0, clients, rows)
+    aba = pd.Series(rng.choice(periods, rows))
+    sequence = rng.integers(1, 40, rows)
+    valor_previsto = np.round(rng.gamma(2.0, 25000.0, rows), 2)
+    faturado = rng.random(rows) < 0.7
+
+    df = pd.DataFrame({
+        'ABA': aba.astype(int),
+        'CLIENTE': np.char.add('CLIENTE ', client_ids.astype(str)),
+        'Nº MEDIÇÃO': np.char.add(np.char.add((1000 + client_ids).astype(str), '-'), np.char.zfill(sequence.astype(str), 2)),
+        'Nº CR': np.char.add('CR ', (client_ids % 97 + 100).astype(str)),
+        'ADM CONTRATO': rng.choice(['ADM 1', 'ADM 2', 'ADM 3'], rows),
+        'RESP MEDIÇÃO': rng.choice(RESPONSAVEIS, rows),
+        'STATUS': rng.choice(STATUS_VALUES, rows, p=STATUS_MIXES[status_mix]),
+        'SITUAÇÃO MED.': rng.choice(SITUACOES, rows),
+        'FECH. CONT.': _dates(rng, aba, 0.95, 0, date_format),
+        'MEDIÇÃO EFETUADA': _dates(rng, aba, 0.85, 2, date_format),
+        'APROV CLIENTE': _dates(rng, aba, 0.6, 4, date_format),
+        'ENVIO FAT': _dates(rng, aba, 0.75, 6, date_format),
+        'FAT MEDIÇÃO': _dates(rng, aba, 0.7, 8, date_format),
+        'QTDE LOCADOS': rng.integers(1, 60, rows),
+        'QTDE RESERVA': rng.integers(0, 5, rows),
+        'PREVISÃO DE MEDIÇÃO': valor_previsto,
+        'GLOSA - MANUTENÇÃO': np.where(rng.random(rows) < 0.15, np.round(valor_previsto * 0.02, 2), 0.0),
+        'DESC COMERCIAL': np.where(rng.random(rows) < 0.1, np.round(valor_previsto * 0.01, 2), 0.0),
+        'KM EXCEDENTE': np.where(rng.random(rows) < 0.1, np.round(rng.gamma(2.0, 500.0, rows), 2), 0.0),
+        'MULTA CONTRATUAL': np.where(rng.random(rows) < 0.02, np.round(rng.gamma(2.0, 300.0, rows), 2), 0.0),
+        'AJUSTES / ACRÉCIMOS': np.where(rng.random(rows) < 0.05, np.round(rng.gamma(2.0, 200.0, rows), 2), 0.0),
+        'VALOR FATURADO': np.where(faturado, valor_previsto, np.nan),
+        'OBSERVAÇÃO': rng.choice(['', 'VER COM CLIENTE', 'REENVIAR', 'OK'], rows),
+    })
+    df.loc[rng.random(rows) < 0.01, 'RESP MEDIÇÃO'] = None
+    df.loc[rng.random(rows) < 0.01, 'SITUAÇÃO MED.'] = ' '
+    return df
+
+
+def write_workbook(dataframe, file_path):
+    """Grava o dataframe sintético em xlsx, como a planilha de fechamento."""
+    dataframe.to_excel(file_path, index=False)
+    return file_path
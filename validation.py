@@ -0,0 +1,194 @@
+"""Validação da planilha logo após a leitura: esquema, tipos e qualidade dos dados.
+
+Uma única passada vetorizada (coluna a coluna, sem laços por linha) produz o dataframe tipado
+usado por todo o programa e um relatório com uma linha por problema encontrado. Os cálculos
+partem do dataframe tipado: ABA em AAMM, colunas de valores numéricas, datas em datetime64
+(exibidas como dd/mm/aaaa, ver schema.display_text) e Nº MEDIÇÃO como texto. STATUS e
+SITUAÇÃO MED. ficam como digitados; só a conferência com os valores conhecidos ignora espaços
+nas pontas e maiúsculas.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from periods import normalize_period
+from schema import DATE_COLUMNS, DATE_FORMAT, NUMERIC_COLUMNS, REQUIRED_COLUMNS, USED_COLUMNS, VALUE_COLUMNS
+
+# Data zero das datas seriais do Excel (células de data lidas como número)
+EXCEL_EPOCH = '1899-12-30'
+
+NUMBER_TYPES = [int, float, np.int64, np.float64]
+
+# Número no formato brasileiro: milhares com ponto (opcional) e decimais com vírgula (ex.: 1.234,56)
+BRAZILIAN_NUMBER = r'-?(\d{1,3}(\.\d{3})+|\d+)(,\d+)?'
+
+# Nº MEDIÇÃO: quatro dígitos do cliente, hífen e a sequência da medição (ex.: 1850-37)
+MEASUREMENT_PATTERN = r'\d{4}-\d+'
+PERIOD_PATTERN = r'\d{2}(0[1-9]|1[0-2])'
+
+KNOWN_STATUSES = ['ATIVO', 'AG. FAT.', 'PARCIAL', 'FINALIZADO', 'CANCELADO']
+KNOWN_SITUATIONS = [
+    'PARCIAL', 'AG. CLIENTE', 'AG. APROV.', 'AG. MANUT.', 'AG. COMERCIAL', 'AG. FAT.', '1° TENTATIVA',
+    '2° TENTATIVA', '3° TENTATIVA', 'ENVIO S/ APROV.', 'CNPJ', "LET'S", 'AG. CANCEL FAT.', 'AG. DOC', 'FINALIZADA'
+]
+
+KEY_COLUMNS = ['ABA', 'Nº MEDIÇÃO']
+ISSUE_COLUMNS = ['LINHA', 'ABA', 'Nº MEDIÇÃO', 'COLUNA', 'VALOR', 'PROBLEMA']
+
+Validation = namedtuple('Validation', ['frame', 'issues'])
+
+
+def _is_text(series):
+    """Células com texto (as demais são números, datas ou vazias)."""
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return np.zeros(len(series), dtype=bool)
+    return series.map(type).isin([str]).to_numpy()
+
+
+def _blank(series, text=None):
+    """Células vazias ou só com espaços (text: resultado de _is_text, quando já calculado)."""
+    blank = series.isna().to_numpy(copy=True)
+    text = _is_text(series) if text is None else text
+    if text.any():
+        blank[text] = (series[text].astype(str).str.strip() == '').to_numpy()
+    return blank
+
+
+def parse_numbers(series, blank=None):
+    """Números da coluna; textos com R$ e no formato brasileiro (1.234,56) também são aceitos.
+
+    O ponto só é lido como separador de milhares quando o texto segue BRAZILIAN_NUMBER; nos
+    demais ('1234.56') vale como separador decimal. Textos ambíguos ('1,234.56') ficam vazios.
+    """
+    parsed = pd.to_numeric(series, errors='coerce')
+    blank = _blank(series) if blank is None else blank
+    # Textos são relidos mesmo quando to_numeric os aceitou: '1.234' é mil duzentos e trinta e quatro
+    retry = (parsed.isna().to_numpy() | _is_text(series)) & ~blank
+    if retry.any():
+        text = series[retry].astype(str).str.replace('R$', '', regex=False).str.strip()
+        brazilian = text.str.fullmatch(BRAZILIAN_NUMBER)
+        text = text.mask(brazilian, text.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+        parsed[retry] = pd.to_numeric(text, errors='coerce')
+    return parsed.astype(float)
+
+
+def parse_dates(series, text=None, blank=None):
+    """Datas da coluna: valores já em data (células de data do Excel), datas seriais do Excel
+    (números) e textos dd/mm/aaaa."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    text = _is_text(series) if text is None else text
+    filled = ~(_blank(series, text) if blank is None else blank)
+    result = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+
+    native = filled & ~text
+    if native.any():
+        values = series[native]
+        if pd.api.types.is_numeric_dtype(values):
+            is_serial = np.ones(len(values), dtype=bool)
+        else:
+            is_serial = values.map(type).isin(NUMBER_TYPES).to_numpy()
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        if is_serial.any():
+            serial = values[is_serial].astype(float)
+            parsed[is_serial] = pd.to_datetime(serial, unit='D', origin=EXCEL_EPOCH, errors='coerce')
+        if not is_serial.all():
+            parsed[~is_serial] = pd.to_datetime(values[~is_serial], errors='coerce', cache=False)
+        result[native] = parsed
+    if (filled & text).any():
+        values = series[filled & text].astype(str).str.strip()
+        parsed = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+        retry = parsed.isna()
+        if retry.any():
+            parsed[retry] = pd.to_datetime(values[retry], format='mixed', dayfirst=True, errors='coerce')
+        result[filled & text] = parsed
+    return result
+
+
+def _normalized_text(series):
+    """Texto sem espaços nas pontas e em maiúsculas (células vazias continuam vazias)."""
+    return series.where(series.isna(), series.astype(str).str.strip().str.upper())
+
+
+def validate(df):
+    """Valida o dataframe lido e retorna Validation(frame tipado, relatório de problemas).
+
+    Colunas obrigatórias (schema.REQUIRED_COLUMNS) ausentes interrompem a carga (ValueError);
+    as demais colunas usadas que faltarem entram vazias, com um aviso no relatório. Os outros
+    problemas também ficam no relatório: a célula inválida vira vazia (0 nas colunas de ajustes)
+    e a linha é mantida.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes na planilha: {', '.join(missing)}")
+
+    absent = [col for col in USED_COLUMNS if col not in df.columns]
+    if absent:
+        df = df.assign(**{col: np.nan for col in absent})
+    frame = df.copy()
+    issues = []
+
+    def report(mask, column, problem, values=None):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            issues.append(pd.DataFrame({
+                'LINHA': frame.index[mask],
+                'COLUNA': column,
+                'VALOR': (df[column] if values is None else values)[mask].astype(str).to_numpy(),
+                'PROBLEMA': problem,
+                '_position': np.flatnonzero(mask),
+            }))
+
+    frame['ABA'] = normalize_period(df['ABA'])
+    report(~frame['ABA'].str.fullmatch(PERIOD_PATTERN).fillna(False).to_numpy(), 'ABA', "mês (ABA) fora do padrão AAMM")
+
+    for col in NUMERIC_COLUMNS:
+        blank = _blank(df[col])
+        parsed = parse_numbers(df[col], blank)
+        report(parsed.isna().to_numpy() & ~blank, col, "valor não numérico")
+        frame[col] = parsed.fillna(0) if col in VALUE_COLUMNS else parsed
+
+    for col in DATE_COLUMNS:
+        text = _is_text(df[col])
+        blank = _blank(df[col], text)
+        parsed = parse_dates(df[col], text, blank)
+        report(parsed.isna().to_numpy() & ~blank, col, "data inválida")
+        frame[col] = parsed
+
+    # Nº MEDIÇÃO sempre como texto (números inteiros lidos do Excel perdem o '.0')
+    numeric = pd.to_numeric(df['Nº MEDIÇÃO'], errors='coerce')
+    integral = numeric.notna() & (numeric % 1 == 0)
+    measurement = df['Nº MEDIÇÃO'].astype(str).str.strip()
+    measurement[integral] = numeric[integral].astype('int64').astype(str)
+    frame['Nº MEDIÇÃO'] = measurement.where(df['Nº MEDIÇÃO'].notna())
+    blank = _blank(df['Nº MEDIÇÃO'])
+    report(blank, 'Nº MEDIÇÃO', "Nº MEDIÇÃO vazio")
+    report(~blank & ~frame['Nº MEDIÇÃO'].str.fullmatch(MEASUREMENT_PATTERN).fillna(False).to_numpy(),
+           'Nº MEDIÇÃO', "Nº MEDIÇÃO fora do padrão 0000-00")
+
+    keys = frame[KEY_COLUMNS]
+    report(keys.notna().all(axis=1) & keys.duplicated(keep=False), 'Nº MEDIÇÃO', "Nº MEDIÇÃO repetido no mesmo mês")
+
+    for col, known in (('STATUS', KNOWN_STATUSES), ('SITUAÇÃO MED.', KNOWN_SITUATIONS)):
+        report(~_blank(df[col]) & ~_normalized_text(df[col]).isin(known).to_numpy(), col, f"{col} desconhecido")
+
+    if issues:
+        report_frame = pd.concat(issues, ignore_index=True)
+        positions = report_frame.pop('_position').to_numpy()
+        report_frame.insert(1, 'ABA', frame['ABA'].to_numpy()[positions])
+        report_frame.insert(2, 'Nº MEDIÇÃO', frame['Nº MEDIÇÃO'].to_numpy()[positions])
+        report_frame = report_frame.iloc[np.argsort(positions, kind='stable')].reset_index(drop=True)
+    else:
+        report_frame = pd.DataFrame(columns=ISSUE_COLUMNS)
+    if absent:
+        # Avisos da planilha inteira, sem linha: LINHA passa a object para manter os números das demais
+        warnings = pd.DataFrame({'COLUNA': absent, 'PROBLEMA': "coluna ausente na planilha (carregada vazia)"})
+        warnings = warnings.reindex(columns=ISSUE_COLUMNS).astype(object)
+        report_frame = pd.concat([warnings, report_frame.astype(object)], ignore_index=True) if len(report_frame) else warnings
+    return Validation(frame, report_frame[ISSUE_COLUMNS])
+
+
+def issue_summary(issues):
+    """Quantidade de problemas por coluna e tipo, do mais frequente ao menos."""
+    return issues.groupby(['COLUNA', 'PROBLEMA']).size().sort_values(ascending=False)
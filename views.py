@@ -0,0 +1,148 @@
+"""Visões salvas da tabela principal: colunas visíveis (e sua ordem), filtros e ordenação.
+
+Cada visão é um dicionário gravado em JSON:
+    {"name": "Pendências", "columns": ["ABA", "CLIENTE", ...] ou null (todas),
+     "filters": [["RESP MEDIÇÃO", "equals", "ANA"], ...], "open_only": true,
+     "sort": [["ABA", true], ["CLIENTE", true]]}
+
+Operações dos filtros: 'contains' (trecho, sem diferenciar maiúsculas, como o filtro da tabela),
+'equals' (valor exato como texto), 'empty' e 'filled'. open_only mantém só as medições não
+finalizadas (analytics.open_mask). Em sort, cada coluna vem com True para ordem crescente.
+"""
+import json
+import os
+
+import numpy as np
+
+from analytics import open_mask
+from schema import display_text
+
+VIEWS_PATH = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), 'ProgMedicao', 'visoes.json')
+
+FILTER_OPERATIONS = ['contains', 'equals', 'empty', 'filled']
+
+ALL_COLUMNS = "Todas as colunas"
+
+DEFAULT_VIEWS = [
+    {'name': ALL_COLUMNS, 'columns': None, 'filters': [], 'open_only': False, 'sort': []},
+    {'name': "Faturamento",
+     'columns': ['ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'Nº CR', 'RESP MEDIÇÃO', 'ENVIO FAT', 'FAT MEDIÇÃO',
+                 'PREVISÃO DE MEDIÇÃO', 'GLOSA - MANUTENÇÃO', 'DESC COMERCIAL', 'KM EXCEDENTE',
+                 'MULTA CONTRATUAL', 'AJUSTES / ACRÉCIMOS', 'VALOR FATURADO'],
+     'filters': [], 'open_only': False, 'sort': [['ABA', True], ['CLIENTE', True]]},
+    {'name': "Operação",
+     'columns': ['ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'ADM CONTRATO', 'RESP MEDIÇÃO', 'STATUS', 'SITUAÇÃO MED.',
+                 'FECH. CONT.', 'MEDIÇÃO EFETUADA', 'APROV CLIENTE', 'QTDE LOCADOS', 'QTDE RESERVA', 'OBSERVAÇÃO'],
+     'filters': [], 'open_only': False, 'sort': [['ABA', True], ['RESP MEDIÇÃO', True]]},
+    {'name': "Pendências",
+     'columns': ['ABA', 'CLIENTE', 'Nº MEDIÇÃO', 'RESP MEDIÇÃO', 'SITUAÇÃO MED.', 'FECH. CONT.',
+                 'MEDIÇÃO EFETUADA', 'APROV CLIENTE', 'ENVIO FAT', 'FAT MEDIÇÃO', 'PREVISÃO DE MEDIÇÃO'],
+     'filters': [], 'open_only': True, 'sort': [['ABA', True], ['RESP MEDIÇÃO', True], ['CLIENTE', True]]},
+]
+
+
+def load_views(path=VIEWS_PATH):
+    """Visões padrão seguidas das gravadas pelo usuário (uma gravada com o mesmo nome substitui a padrão)."""
+    saved = []
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = []
+    views = {view['name']: view for view in DEFAULT_VIEWS}
+    views.update({view['name']: view for view in saved if 'name' in view})
+    return list(views.values())
+
+
+def save_view(view, path=VIEWS_PATH):
+    """Grava (ou substitui, pelo nome) uma visão do usuário."""
+    saved = []
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            saved = json.load(f)
+    saved = [entry for entry in saved if entry.get('name') != view['name']] + [view]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(saved, f, ensure_ascii=False, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def view_key(view):
+    """Texto que identifica a definição da visão (chave de cache: mudou a visão, muda a chave)."""
+    return json.dumps(view, sort_keys=True, ensure_ascii=False)
+
+
+def view_columns(view, columns):
+    """Colunas exibidas pela visão, na ordem dela, entre as existentes nos dados."""
+    if not view.get('columns'):
+        return list(columns)
+    available = set(columns)
+    return [col for col in view['columns'] if col in available]
+
+
+def view_mask(df, view):
+    """Máscara booleana das linhas que atendem aos filtros da visão."""
+    mask = np.ones(len(df), dtype=bool)
+    if view.get('open_only'):
+        mask &= open_mask(df).to_numpy()
+    for column, operation, *value in view.get('filters', []):
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if operation == 'contains':
+            mask &= display_text(series).str.contains(value[0], case=False, na=False, regex=False).to_numpy()
+        elif operation == 'equals':
+            mask &= (display_text(series) == str(value[0])).to_numpy() & series.notna().to_numpy()
+        elif operation == 'empty':
+            mask &= series.isna().to_numpy()
+        elif operation == 'filled':
+            mask &= series.notna().to_numpy()
+        else:
+            raise ValueError(f"Operação de filtro desconhecida: {operation}")
+    return mask
+
+
+def view_positions(df, view):
+    """Posições (iloc) das linhas da visão, já na ordem da visão."""
+    positions = np.flatnonzero(view_mask(df, view))
+    sort = [(column, ascending) for column, ascending in view.get('sort', []) if column in df.columns]
+    if not sort or not len(positions):
+        return positions
+    keys = df.iloc[positions][[column for column, _ in sort]].reset_index(drop=True)
+    order = keys.sort_values([column for column, _ in sort], ascending=[ascending for _, ascending in sort],
+                             kind='stable', na_position='last').index.to_numpy()
+    return positions[order]
+
+
+def store_filters(view):
+    """Filtros da visão como (contains, equals) do SqliteStore, ou None quando a visão usa
+    filtros ou ordenação que a consulta paginada não reproduz."""
+    if view.get('open_only') or view.get('sort'):
+        return None
+    contains, equals = [], {}
+    for column, operation, *value in view.get('filters', []):
+        if operation == 'contains':
+            contains.append((column, value[0]))
+        elif operation == 'equals' and column not in equals:
+            equals[column] = value[0]
+        else:
+            return None
+    return contains, equals
+
+
+def apply_view(df, view):
+    """Linhas e colunas da visão (sem cache; a interface guarda as posições por carga)."""
+    return df.iloc[view_positions(df, view)][view_columns(view, df.columns)]
+
+
+def describe(view):
+    """Resumo de uma linha dos filtros e da ordenação, para a interface."""
+    parts = [f"{len(view['columns'])} colunas" if view.get('columns') else "todas as colunas"]
+    if view.get('open_only'):
+        parts.append("só abertas")
+    parts += [f"{column} {operation} {value[0] if value else ''}".strip() for column, operation, *value in view.get('filters', [])]
+    if view.get('sort'):
+        parts.append("ordem: " + ", ".join(column + ('' if ascending else ' (desc.)') for column, ascending in view['sort']))
+    return "; ".join(parts)
+